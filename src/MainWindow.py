@@ -3,14 +3,19 @@ The main class of the application.
 
 """
 import math
-from typing import Callable
+from typing import Any, Callable, Dict, Optional
 
 from PyQt5 import uic
-from PyQt5.QtGui import QResizeEvent
+from PyQt5.QtGui import QCloseEvent, QResizeEvent
 from PyQt5.QtWidgets import QMainWindow
 from matplotlib.axes import Axes, np
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.collections import LineCollection
 
 from src.fem.FEM import FEM
+from src.fem.ResultProbe import ResultProbe
+from src.ui.ProgressiveSolver import ProgressiveSolver
+from src.ui.widgets.LevelOfDetailImage import LevelOfDetailImage
 from src.ui.widgets.MatplotlibWidget import MatplotlibWidget
 from src.ui.UiMainWindow import Ui_MainWindow
 
@@ -58,7 +63,11 @@ class MainWindow(QMainWindow):
         self.__demo_plot: bool = True
 
         self.__plot_widget: MatplotlibWidget
+        self.__deformation_image: Optional[LevelOfDetailImage] = None
         self.__fem: FEM
+        # Reads the values under the cursor while the calculated deformation is shown
+        self.__probe: Optional[ResultProbe] = None
+        self.__progressive_solver = ProgressiveSolver(self)
 
         self.__create_plot_widget()
         self.__set_signals_and_slots()
@@ -70,19 +79,28 @@ class MainWindow(QMainWindow):
     def __create_plot_widget(self) -> None:
         self.__plot_widget = MatplotlibWidget(self.plotWidgetLayout)
         self.__plot_widget.hide()
+        self.__plot_widget.ax.figure.canvas.mpl_connect("motion_notify_event", self.__show_probe)
 
     def __set_signals_and_slots(self) -> None:
         self.createMeshPushButton.clicked.connect(self.__create_and_show_mesh)
         self.makeCalculationPushButton.clicked.connect(self.__make_calculation)
+        self.__progressive_solver.solved.connect(self.__show_preview)
         if not self.__demo:
-            self.widthSpinBox.valueChanged.connect(self.__disable_calculation_button)
-            self.heightSpinBox.valueChanged.connect(self.__disable_calculation_button)
-            self.thicknessSpinBox.valueChanged.connect(self.__disable_calculation_button)
-            self.pressureSpinBox.valueChanged.connect(self.__disable_calculation_button)
-            self.youngSpinBox.valueChanged.connect(self.__disable_calculation_button)
-            self.poissonSpinBox.valueChanged.connect(self.__disable_calculation_button)
-            self.horizontalCountSpinBox.valueChanged.connect(self.__disable_calculation_button)
-            self.verticalCountSpinBox.valueChanged.connect(self.__disable_calculation_button)
+            self.livePreviewCheckBox.toggled.connect(self.__toggle_live_preview)
+            for spin_box in (
+                self.widthSpinBox,
+                self.heightSpinBox,
+                self.thicknessSpinBox,
+                self.pressureSpinBox,
+                self.youngSpinBox,
+                self.poissonSpinBox,
+                self.horizontalCountSpinBox,
+                self.verticalCountSpinBox,
+            ):
+                spin_box.valueChanged.connect(self.__disable_calculation_button)
+                spin_box.valueChanged.connect(self.__request_preview)
+        else:
+            self.livePreviewCheckBox.setEnabled(False)
 
     def __disable_parameters_frame(self) -> None:
         self.parametersFrame.setEnabled(False)
@@ -106,35 +124,53 @@ class MainWindow(QMainWindow):
         """
         self.__resize_plot()
 
+    def closeEvent(self, event: QCloseEvent) -> None:
+        """
+        Called when the window is closed.
+
+        Parameters
+        ----------
+        event : QCloseEvent
+            Event when the window is closed.
+
+        """
+        self.__progressive_solver.shutdown()
+        super().closeEvent(event)
+
     def __resize_plot(self) -> None:
         self.__plot_widget.update_widget(
             self.plotWidgetLayout.width(), self.plotWidgetLayout.height()
         )
 
-    def __create_fem(self) -> None:
+    def __get_parameters(self) -> Dict[str, Any]:
         if self.__demo:
-            self.__fem = FEM(800, 800, 3, 200, 11, 0.34, 15, 15)
-        else:
-            width: int = self.widthSpinBox.value()
-            height: int = self.heightSpinBox.value()
-            thickness: int = self.thicknessSpinBox.value()
-            pressure: float = self.pressureSpinBox.value()
-            young: int = self.youngSpinBox.value()
-            poisson: float = self.poissonSpinBox.value()
-            h_element_count: int = self.horizontalCountSpinBox.value()
-            v_element_count: int = self.verticalCountSpinBox.value()
-            self.__fem = FEM(
-                width,
-                height,
-                thickness,
-                pressure,
-                young,
-                poisson,
-                h_element_count,
-                v_element_count,
+            return dict(
+                width=800,
+                height=800,
+                thickness=3,
+                pressure=200,
+                young=11,
+                poisson=0.34,
+                h_element_count=15,
+                v_element_count=15,
             )
+        return dict(
+            width=self.widthSpinBox.value(),
+            height=self.heightSpinBox.value(),
+            thickness=self.thicknessSpinBox.value(),
+            pressure=self.pressureSpinBox.value(),
+            young=self.youngSpinBox.value(),
+            poisson=self.poissonSpinBox.value(),
+            h_element_count=self.horizontalCountSpinBox.value(),
+            v_element_count=self.verticalCountSpinBox.value(),
+        )
+
+    def __create_fem(self) -> None:
+        self.__fem = FEM(**self.__get_parameters())
 
     def __plot(self, plot_func: Callable) -> None:
+        self.__probe = None
+        self.statusBar().clearMessage()
         self.__plot_widget.clear()
         plot_func(self.__plot_widget.ax)
         self.__plot_widget.show()
@@ -142,27 +178,27 @@ class MainWindow(QMainWindow):
         self.__plot_widget.draw()
 
     def __show_mesh(self, ax: Axes) -> None:
-        for elem in self.__fem.elements:
-            ax.plot(
-                [node.x for node in elem.nodes] + [elem.nodes[0].x],
-                [node.y for node in elem.nodes] + [elem.nodes[0].y],
-                zorder=0,
-                c="#FFF",
-            )
+        coordinates = self.__fem.node_coordinates
+        fixed_nodes = self.__fem.fixed_nodes
 
-        not_fixes_nodes = [node for node in self.__fem.nodes if not node.fixed]
-        fixed_nodes = [node for node in self.__fem.nodes if node.fixed]
+        mesh = self.__plot_widget.artist(
+            "mesh", lambda ax: ax.add_collection(LineCollection([], zorder=0, colors="#FFF"))
+        )
+        # Each element is drawn as a closed polyline through its four nodes
+        mesh.set_segments(coordinates[self.__fem.element_connectivity[:, [0, 1, 2, 3, 0]]])
 
         handles = [None, None]
-        handles[0] = ax.scatter(
-            [node.x for node in not_fixes_nodes],
-            [node.y for node in not_fixes_nodes],
-            s=30,
-            c="#008B8B",
+        handles[0] = self.__plot_widget.artist(
+            "nodes", lambda ax: ax.scatter([], [], s=30, c="#008B8B")
         )
-        handles[1] = ax.scatter(
-            [node.x for node in fixed_nodes], [node.y for node in fixed_nodes], s=30, c="#FF0000",
+        handles[0].set_offsets(coordinates[~fixed_nodes])
+        handles[1] = self.__plot_widget.artist(
+            "fixed_nodes", lambda ax: ax.scatter([], [], s=30, c="#FF0000")
         )
+        handles[1].set_offsets(coordinates[fixed_nodes])
+
+        ax.update_datalim(coordinates)
+        ax.autoscale_view()
 
         ax.legend(handles, ("Узлы", "Закреплённые узлы"))
         set_title_and_labels(ax, "Сетка", "мм", "мм")
@@ -218,49 +254,72 @@ class MainWindow(QMainWindow):
             elif (a * b <= 961):
                 z = z - (0.00021 * d)
 
-            temp_ax = ax.imshow(
-                z,
-                cmap="viridis",
-                interpolation="quadric",
-                # interpolation="none",
-                extent=(0, self.__fem.width, 0, self.__fem.height),
-            )
+            self.__show_field(ax, z, np.amax(z))
+        else:
+            self.__show_solution(ax)
 
-            colorbar = ax.figure.colorbar(temp_ax)
-            colorbar.set_label("мм")
+    def __show_solution(self, ax: Axes) -> None:
+        self.__show_field(
+            ax,
+            self.__fem.get_nodes_deformation_for_plot(),
+            self.__fem.get_max_node_deformation(),
+        )
+        self.__probe = ResultProbe(self.__fem)
 
-            max_deformation: float = np.amax(z)
+    def __show_field(self, ax: Axes, field: np.ndarray, max_deformation: float) -> None:
+        image = self.__plot_widget.artist(
+            "deformation",
+            # The first row of the field is the bottom edge of the plate (y = 0), as on the mesh
+            lambda ax: ax.imshow(np.zeros((1, 1)), cmap="viridis", interpolation="quadric", origin="lower"),
+        )
+        if self.__deformation_image is None:
+            self.__deformation_image = LevelOfDetailImage(image)
+        self.__deformation_image.set_field(field, (0, self.__fem.width, 0, self.__fem.height))
+
+        colorbar = ax.figure.colorbar(image)
+        colorbar.set_label("мм")
+
+        set_title_and_labels(
+            ax,
+            "Пластина\nМаксимальный изгиб: {:.3f} мм".format(
+                max_deformation
+            ),
+            "мм",
+            "мм",
+        )
 
-            set_title_and_labels(
-                ax,
-                "Пластина\nМаксимальный изгиб: {:.3f} мм".format(
-                    max_deformation
-                ),
-                "мм",
-                "мм",
+    def __show_probe(self, event: MouseEvent) -> None:
+        if self.__probe is None or event.inaxes is not self.__plot_widget.ax or event.xdata is None:
+            self.statusBar().clearMessage()
+            return
+        deformation, rotation_x, rotation_y = self.__probe.probe(event.xdata, event.ydata)
+        if np.isnan(deformation):
+            self.statusBar().clearMessage()
+            return
+        self.statusBar().showMessage(
+            "x: {:.1f} мм, y: {:.1f} мм, изгиб: {:.4f} мм, поворот: {:.2e} / {:.2e} рад".format(
+                event.xdata, event.ydata, deformation, rotation_x, rotation_y
             )
+        )
+
+    def __toggle_live_preview(self, checked: bool) -> None:
+        if checked:
+            self.__request_preview()
         else:
-            temp_ax = ax.imshow(
-                self.__fem.get_nodes_deformation_for_plot(),
-                cmap="viridis",
-                interpolation="quadric",
-                # interpolation="none",
-                extent=(0, self.__fem.width, 0, self.__fem.height),
-            )
+            self.__progressive_solver.cancel()
 
-            colorbar = ax.figure.colorbar(temp_ax)
-            colorbar.set_label("мм")
+    def __request_preview(self) -> None:
+        if self.livePreviewCheckBox.isChecked():
+            self.__progressive_solver.request(self.__get_parameters())
 
-            max_deformation: float = self.__fem.get_max_node_deformation()
+    def __show_coarse_solution(self, ax: Axes) -> None:
+        self.__show_solution(ax)
+        ax.set_title(ax.get_title() + " (уточняется)")
 
-            set_title_and_labels(
-                ax,
-                "Пластина\nМаксимальный изгиб: {:.3f} мм".format(
-                    max_deformation
-                ),
-                "мм",
-                "мм",
-            )
+    def __show_preview(self, fem: FEM, final: bool) -> None:
+        # The preview shows the solved field of the plate regardless of the demo plot
+        self.__fem = fem
+        self.__plot(self.__show_solution if final else self.__show_coarse_solution)
 
     def __make_calculation(self) -> None:
         self.__fem.calculate()
@@ -0,0 +1,287 @@
+"""
+Class that measures the accuracy and the cost of the calculations
+of plates with exact solutions.
+
+"""
+
+import csv
+import inspect
+import time
+import tracemalloc
+from typing import Any, Dict, Final, Iterable, List, NamedTuple, Optional, Sequence
+
+from src.fem.AnalyticalSolution import AnalyticalSolution
+from src.fem.FEM import FEM
+from src.fem.SolverPlanner import SolverPlanner
+
+
+class BenchmarkRecord(NamedTuple):
+    """
+    Accuracy and cost of one calculation of a benchmark.
+
+    Attributes
+    ----------
+    support : str
+        Support of the plate (see AnalyticalSolution.SUPPORTS).
+    element : str
+        Finite element (see FEM.ELEMENTS).
+    solver : str
+        Method of solving the system of equations (see FEM.SOLVERS).
+    element_count : positive int
+        Number of elements along each side of the plate.
+    dof_count : positive int
+        Number of degrees of freedom of the mesh.
+    error : float
+        Relative error of the max deformation.
+    time : float
+        Time of the mesh creation and the calculation in seconds.
+    memory : int
+        Peak memory of the arrays allocated by the calculation in bytes.
+    estimated_memory : int
+        Peak memory estimated by SolverPlanner in bytes.
+
+    """
+
+    support: str
+    element: str
+    solver: str
+    element_count: int
+    dof_count: int
+    error: float
+    time: float
+    memory: int
+    estimated_memory: int
+
+
+class AccuracyBenchmark:
+    """
+    Calculates plates with exact solutions (see AnalyticalSolution) on
+    refined meshes with each finite element and solver and records the
+    error of the max deformation, the time and the memory, so that the
+    cheapest configuration that meets a tolerance can be chosen.
+
+    Every configuration is calculated twice: the first calculation is traced
+    by tracemalloc for the peak memory of the Python and NumPy allocations
+    (the workspaces of the native libraries, e.g. SuperLU, are not seen by
+    it; the estimate of SolverPlanner covers them), the second one is timed
+    with the mesh topology already cached, like the repeated calculations of
+    production jobs. The configurations whose estimated time or memory
+    exceeds the limits and the solvers that do not support the element
+    are skipped.
+
+    Parameters
+    ----------
+    parameters : dict
+        Keyword arguments for the FEM class without the element counts,
+        the element, the solver and the support.
+    supports : iterable of str
+        Supports of the plate (some of AnalyticalSolution.SUPPORTS).
+    elements : iterable of str
+        Finite elements (some of FEM.ELEMENTS).
+    solvers : iterable of str
+        Methods of solving the system of equations (some of SolverPlanner.SOLVERS).
+    element_counts : sequence of int
+        Numbers of elements along each side of the plate.
+    max_time : positive float
+        Maximum estimated time of a configuration in seconds.
+    memory_budget : positive int or None
+        Maximum estimated memory of a configuration in bytes;
+        the available physical memory by default.
+
+    Attributes
+    ----------
+    records : list of BenchmarkRecord
+        Results of the calculated configurations.
+
+    Class Attributes
+    ----------------
+    ELEMENT_COUNTS : tuple
+        Default numbers of elements along each side.
+
+    """
+
+    ELEMENT_COUNTS: Final = (4, 8, 16, 32, 64)
+    # Relative reduction of the error that a slower configuration must give to be on the frontier:
+    # smaller differences are the rounding of the solvers rather than the mesh
+    __MIN_IMPROVEMENT: Final = 0.1
+
+    def __init__(
+        self,
+        parameters: Dict[str, Any],
+        supports: Iterable[str] = AnalyticalSolution.SUPPORTS,
+        elements: Iterable[str] = FEM.ELEMENTS,
+        solvers: Iterable[str] = SolverPlanner.SOLVERS,
+        element_counts: Sequence[int] = ELEMENT_COUNTS,
+        max_time: float = 10.0,
+        memory_budget: Optional[int] = None,
+    ) -> None:
+        planner = SolverPlanner(memory_budget)
+        solvers = list(solvers)
+        # The exact solution takes only the dimensions, the material and the load of the FEM parameters
+        names = set(inspect.signature(AnalyticalSolution).parameters)
+        exact_parameters = {name: value for name, value in parameters.items() if name in names}
+        self.records: Final[List[BenchmarkRecord]] = []
+        for support in supports:
+            reference = AnalyticalSolution(support=support, **exact_parameters).get_max_deflection()
+            for element in elements:
+                for solver in solvers:
+                    if element != "acm" and solver not in FEM.GENERAL_SOLVERS:
+                        continue
+                    for element_count in element_counts:
+                        estimate = AccuracyBenchmark.__create_fem(
+                            parameters, support, element, solver, element_count
+                        ).estimate_cost()
+                        if estimate.time > max_time or not planner.fits(estimate):
+                            continue
+                        self.records.append(
+                            AccuracyBenchmark.measure(
+                                parameters, support, element, solver, element_count, reference
+                            )
+                        )
+
+    @staticmethod
+    def __create_fem(
+        parameters: Dict[str, Any], support: str, element: str, solver: str, element_count: int
+    ) -> FEM:
+        return FEM(
+            **parameters,
+            h_element_count=element_count,
+            v_element_count=element_count,
+            solver=solver,
+            element=element,
+            support=support,
+        )
+
+    @staticmethod
+    def measure(
+        parameters: Dict[str, Any],
+        support: str,
+        element: str,
+        solver: str,
+        element_count: int,
+        reference: float,
+    ) -> BenchmarkRecord:
+        """
+        Calculates one configuration.
+
+        Parameters
+        ----------
+        parameters : dict
+            Keyword arguments for the FEM class without the element counts,
+            the element, the solver and the support.
+        support : str
+            Support of the plate (one of FEM.SUPPORTS).
+        element : str
+            Finite element (one of FEM.ELEMENTS).
+        solver : str
+            Method of solving the system of equations (one of FEM.SOLVERS).
+        element_count : positive int
+            Number of elements along each side of the plate.
+        reference : float
+            Exact max deformation.
+
+        Returns
+        -------
+        BenchmarkRecord
+            Accuracy and cost of the configuration.
+
+        """
+
+        def calculate() -> FEM:
+            fem = AccuracyBenchmark.__create_fem(parameters, support, element, solver, element_count)
+            fem.create_mesh()
+            fem.calculate()
+            return fem
+
+        tracemalloc.start()
+        try:
+            calculate()
+            memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        start = time.perf_counter()
+        fem = calculate()
+        elapsed = time.perf_counter() - start
+
+        return BenchmarkRecord(
+            support,
+            element,
+            solver,
+            element_count,
+            fem.dof_count * len(fem.node_coordinates),
+            abs(float(fem.get_max_node_deformation()) - reference) / abs(reference),
+            elapsed,
+            memory,
+            fem.estimate_cost().memory,
+        )
+
+    def get_frontier(self, support: str) -> List[BenchmarkRecord]:
+        """
+        Returns the configurations that no other one beats in both time and error
+        (a slower configuration must reduce the error by a tenth).
+
+        Parameters
+        ----------
+        support : str
+            Support of the plate.
+
+        Returns
+        -------
+        list of BenchmarkRecord
+            Cost/accuracy frontier in ascending order of time
+            (and descending order of error).
+
+        """
+        frontier: List[BenchmarkRecord] = []
+        records = sorted(
+            (record for record in self.records if record.support == support),
+            key=lambda record: (record.time, record.error),
+        )
+        for record in records:
+            if not frontier or record.error < frontier[-1].error * (1 - AccuracyBenchmark.__MIN_IMPROVEMENT):
+                frontier.append(record)
+        return frontier
+
+    def get_cheapest(self, support: str, tolerance: float) -> Optional[BenchmarkRecord]:
+        """
+        Returns the fastest configuration that meets a tolerance.
+
+        Parameters
+        ----------
+        support : str
+            Support of the plate.
+        tolerance : float
+            Relative error of the max deformation.
+
+        Returns
+        -------
+        BenchmarkRecord or None
+            Fastest configuration whose error does not exceed the tolerance
+            or None if no configuration does.
+
+        """
+        for record in self.get_frontier(support):
+            if record.error <= tolerance:
+                return record
+        return None
+
+    def write_csv(self, path: str) -> None:
+        """
+        Writes the records to a CSV file with the "frontier" column that
+        determines whether each record is on the frontier of its support.
+
+        Parameters
+        ----------
+        path : str
+            Path to the CSV file.
+
+        """
+        frontier = {
+            record for support in dict.fromkeys(r.support for r in self.records)
+            for record in self.get_frontier(support)
+        }
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(list(BenchmarkRecord._fields) + ["frontier"])
+            for record in self.records:
+                writer.writerow(list(record) + [int(record in frontier)])
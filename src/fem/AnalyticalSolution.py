@@ -0,0 +1,137 @@
+"""
+Class that calculates the exact deflections of uniformly loaded
+rectangular plates by series solutions.
+
+"""
+
+from typing import Final
+
+import numpy as np
+
+
+class AnalyticalSolution:
+    """
+    Exact deflection of a uniformly loaded rectangular Kirchhoff plate
+    with the coordinates of FEM (the origin is at a corner).
+
+    The simply supported plate is solved by the Navier double sine series,
+    the plate with simply supported vertical edges and clamped horizontal
+    ones by the Levy single series (see FEM.SUPPORTS). A fully clamped plate
+    has no solution of this kind. The hyperbolic functions of the Levy
+    series are evaluated in a scaled form, so any number of terms can be
+    used without overflow.
+
+    Parameters
+    ----------
+    width : positive float
+        Plate width.
+    height : positive float
+        Plate height.
+    thickness : positive float
+        Plate thickness.
+    pressure : float
+        Pressure on the plate from above.
+    young : positive float
+        Young's modulus (elasticity) of material of plate.
+    poisson : non-negative float
+        Poisson ratio of material of plate.
+    support : str
+        Support of the plate (one of SUPPORTS).
+    term_count : positive int
+        Number of odd terms of each series.
+
+    Class Attributes
+    ----------------
+    SUPPORTS : tuple
+        Supports that have an exact solution.
+
+    Raises
+    ------
+    ValueError
+        If the support has no exact solution.
+
+    """
+
+    SUPPORTS: Final = ("simply-supported", "simply-supported-clamped")
+
+    def __init__(
+        self,
+        width: float,
+        height: float,
+        thickness: float,
+        pressure: float,
+        young: float,
+        poisson: float,
+        support: str = "simply-supported",
+        term_count: int = 200,
+    ) -> None:
+        if support not in AnalyticalSolution.SUPPORTS:
+            raise ValueError("The {} support has no exact solution".format(support))
+        self.__width: Final = width
+        self.__height: Final = height
+        self.__pressure: Final = pressure
+        self.__rigidity: Final = young * thickness ** 3 / (12 * (1 - poisson ** 2))
+        self.__support: Final = support
+        self.__orders: Final = np.arange(1, 2 * term_count, 2)
+
+    def __get_navier_deflection(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        a, b, m = self.__width, self.__height, self.__orders
+        coefficients = 1 / (m[:, np.newaxis] * m * (m[:, np.newaxis] ** 2 / a ** 2 + m ** 2 / b ** 2) ** 2)
+        sines_x = np.sin(np.multiply.outer(x, m) * np.pi / a)
+        sines_y = np.sin(np.multiply.outer(y, m) * np.pi / b)
+        series = np.einsum("...m,mn,...n->...", sines_x, coefficients, sines_y)
+        return 16 * self.__pressure / (np.pi ** 6 * self.__rigidity) * series
+
+    def __get_levy_deflection(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        a, m = self.__width, self.__orders
+        alpha = m * np.pi / a
+        beta = alpha * self.__height / 2
+        # Deflection of the strip simply supported at x = 0 and x = a and the clamping terms
+        strip = 4 * self.__pressure * a ** 4 / (np.pi ** 5 * m ** 5 * self.__rigidity)
+        tanh_beta = np.tanh(beta)
+        damping = np.exp(-2 * beta)
+        denominator = beta * 4 * damping / (1 + damping) ** 2 + tanh_beta
+        first = -strip * (tanh_beta + beta) / denominator
+        second = strip * tanh_beta / denominator
+
+        # cosh(alpha y) / cosh(beta) and sinh(alpha y) / cosh(beta) for |y| <= height / 2
+        t = alpha * np.abs(np.subtract.outer(y, self.__height / 2))[..., np.newaxis]
+        scale = np.exp(t - beta) / (1 + damping)
+        cosh_ratio = scale * (1 + np.exp(-2 * t))
+        sinh_ratio = scale * (1 - np.exp(-2 * t))
+        shapes = strip + first * cosh_ratio + second * t * sinh_ratio
+        return np.sum(np.sin(alpha * np.asarray(x)[..., np.newaxis]) * shapes, axis=-1)
+
+    def get_deflection(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Calculates the deflection at points of the plate.
+
+        Parameters
+        ----------
+        x : ndarray
+            X-axis coordinates of the points.
+        y : ndarray
+            Y-axis coordinates of the points.
+
+        Returns
+        -------
+        ndarray
+            Deflections at the points.
+
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        if self.__support == "simply-supported":
+            return self.__get_navier_deflection(x, y)
+        return self.__get_levy_deflection(x, y)
+
+    def get_max_deflection(self) -> float:
+        """
+        Calculates the max deflection, which is at the center of the plate.
+
+        Returns
+        -------
+        float
+            Max deflection.
+
+        """
+        return float(self.get_deflection(self.__width / 2, self.__height / 2))
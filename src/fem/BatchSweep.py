@@ -0,0 +1,178 @@
+"""
+Calculation of many small plates of the same mesh with stacked
+linear algebra calls.
+
+"""
+
+import itertools
+from typing import Any, Dict, Final, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from src.fem.Cutout import create_cutouts
+from src.fem.FEM import FEM
+from src.fem.Sweep import Sweep, SweepResult
+
+
+class BatchSweep(Sweep):
+    """
+    Iterable over the results of plate bending calculations for
+    a sequence of parameter sets, calculated in batches.
+
+    The parameter sets are consumed in chunks of batch_size. The plates of
+    a chunk with the same mesh (see TOPOLOGY_PARAMETERS) share the mesh
+    and the assembly: the stiffness matrix is D * (A + poisson * B), where
+    D is the flexural rigidity, and the load is proportional to the
+    pressure, so the plates differ only in the Poisson ratio and a scalar
+    factor. The dense matrices of the distinct Poisson ratios are stacked
+    and solved by one broadcast np.linalg.solve call, and the deformations
+    of all plates follow by scaling. The results are the same as those of
+    Sweep and are yielded in the order of the parameter sets.
+
+    Parameters
+    ----------
+    parameter_sets : iterable of dict
+        Keyword arguments for the FEM class, one dict per calculation.
+        The solver and process_count arguments are ignored.
+    keep_deformation : bool
+        Determines whether records contain the deformations of nodes.
+    batch_size : positive int
+        Maximum number of parameter sets calculated together.
+
+    Class Attributes
+    ----------------
+    TOPOLOGY_PARAMETERS : tuple
+        Parameters of the FEM class that determine the mesh
+        (the cut-outs, the element mask, the element and the support are optional).
+    MAX_STACK_SIZE : positive int
+        Maximum number of elements of the stacked matrices solved in one call.
+
+    """
+
+    TOPOLOGY_PARAMETERS: Final = (
+        "width",
+        "height",
+        "h_element_count",
+        "v_element_count",
+        "cutouts",
+        "element_mask",
+        "element",
+        "support",
+    )
+    MAX_STACK_SIZE: Final = 2 ** 25
+
+    def __init__(
+        self, parameter_sets: Iterable[Dict[str, Any]], keep_deformation: bool = False, batch_size: int = 4096
+    ) -> None:
+        super().__init__(parameter_sets, keep_deformation)
+        self.__parameter_sets = parameter_sets
+        self.__keep_deformation = keep_deformation
+        self.__batch_size = batch_size
+
+    @staticmethod
+    def __get_topology(parameters: Dict[str, Any]) -> Tuple:
+        # Hashable key of the mesh: the cut-outs and the mask may be given as lists
+        cutouts, mask = parameters.get("cutouts"), parameters.get("element_mask")
+        return tuple(parameters[name] for name in BatchSweep.TOPOLOGY_PARAMETERS[:4]) + (
+            create_cutouts(cutouts) or None,
+            None if mask is None else np.packbits(np.asarray(mask, dtype=bool)).tobytes(),
+            parameters.get("element", "acm"),
+            parameters.get("support", "corners"),
+        )
+
+    @staticmethod
+    def __create_template(parameters: Dict[str, Any], poisson: float) -> FEM:
+        # Unit thickness, pressure and Young's modulus
+        parameters = {name: parameters[name] for name in BatchSweep.TOPOLOGY_PARAMETERS if name in parameters}
+        fem = FEM(thickness=1, pressure=1.0, young=1, poisson=poisson, **parameters)
+        fem.create_mesh()
+        return fem
+
+    @staticmethod
+    def __get_rigidity(young: float, thickness: float, poisson: float) -> float:
+        return young * thickness ** 3 / (12 * (1 - poisson ** 2))
+
+    @staticmethod
+    def solve_batch(parameter_sets: List[Dict[str, Any]], keep_deformation: bool = False) -> List[SweepResult]:
+        """
+        Performs the calculations of plates with the same mesh.
+
+        Parameters
+        ----------
+        parameter_sets : list of dict
+            Keyword arguments for the FEM class with the same
+            TOPOLOGY_PARAMETERS.
+        keep_deformation : bool
+            Determines whether the records contain the deformations of nodes.
+
+        Returns
+        -------
+        list of SweepResult
+            Results of the calculations in the order of the parameter sets.
+
+        Raises
+        ------
+        ValueError
+            If the parameter sets have different meshes.
+
+        """
+        if not parameter_sets:
+            return []
+        topologies = {BatchSweep.__get_topology(p) for p in parameter_sets}
+        if len(topologies) > 1:
+            raise ValueError("All parameter sets of a batch must have the same mesh")
+
+        # The stiffness matrix is linear in the Poisson ratio after dividing by the rigidity
+        templates = [BatchSweep.__create_template(parameter_sets[0], poisson) for poisson in (0.0, 0.5)]
+        free = ~templates[0].fixed_dofs
+        matrices = [
+            fem.assemble_stiffness_matrix()[free][:, free].toarray()
+            / BatchSweep.__get_rigidity(1, 1, poisson)
+            for fem, poisson in zip(templates, (0.0, 0.5))
+        ]
+        a, b = matrices[0], 2 * (matrices[1] - matrices[0])
+        template = templates[0]
+        load = template.assemble_pressure_load(np.full(len(template.element_connectivity), 1.0))[free]
+
+        values = np.array(
+            [[p["pressure"], p["young"], p["thickness"], p["poisson"]] for p in parameter_sets], dtype=float
+        )
+        poissons, indices = np.unique(values[:, 3], return_inverse=True)
+        size = len(load)
+        unit_solutions = np.empty((len(poissons), size))
+        step = max(BatchSweep.MAX_STACK_SIZE // (size * size), 1)
+        for first in range(0, len(poissons), step):
+            stack = a + poissons[first : first + step, np.newaxis, np.newaxis] * b
+            rhs = np.broadcast_to(load[:, np.newaxis], stack.shape[:-1] + (1,))
+            unit_solutions[first : first + step] = np.linalg.solve(stack, rhs)[..., 0]
+
+        factors = values[:, 0] / BatchSweep.__get_rigidity(values[:, 1], values[:, 2], values[:, 3])
+        deflections = np.zeros((len(parameter_sets), len(free)))
+        deflections[:, free] = factors[:, np.newaxis] * unit_solutions[indices]
+        deflections = deflections[:, :: template.dof_count]
+
+        return [
+            SweepResult(
+                dict(parameters),
+                float(np.max(deflection)),
+                np.array(template.get_field_for_plot(deflection)) if keep_deformation else None,
+            )
+            for parameters, deflection in zip(parameter_sets, deflections)
+        ]
+
+    def __iter__(self) -> Iterator[SweepResult]:
+        iterator = iter(self.__parameter_sets)
+        while True:
+            chunk = list(itertools.islice(iterator, self.__batch_size))
+            if not chunk:
+                return
+            groups: Dict[Tuple, List[int]] = {}
+            for index, parameters in enumerate(chunk):
+                topology = BatchSweep.__get_topology(parameters)
+                groups.setdefault(topology, []).append(index)
+            results: List[SweepResult] = [None] * len(chunk)
+            for indices in groups.values():
+                batch = BatchSweep.solve_batch([chunk[i] for i in indices], self.__keep_deformation)
+                for index, result in zip(indices, batch):
+                    results[index] = result
+            yield from results
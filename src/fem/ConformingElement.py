@@ -0,0 +1,245 @@
+"""
+The class calculates the matrices of the conforming rectangular
+plate element with sixteen degrees of freedom.
+
+"""
+
+from typing import Final, Optional
+
+import numpy as np
+
+from src.fem.Element import Element
+
+
+class ConformingElement:
+    """
+    The class calculates the matrices of the Bogner-Fox-Schmit element:
+    a rectangle with four nodes whose deformation is the product of cubic
+    Hermite polynomials along the sides. The deformation and its slopes are
+    continuous between elements, so the element converges from below at
+    the fourth order in the element size instead of the second order of
+    Element and reaches the same accuracy with far fewer nodes.
+
+    Every node has the degrees of freedom of Node (w, dw/dy, -dw/dx) and
+    the twist d2w/dxdy. The parameters of the element are those of Element
+    (see Element.set_parameters) and the nodes are in the same order.
+
+    Class Attributes
+    ----------------
+    DOF_COUNT : positive int
+        Number of degrees of freedom of a node.
+
+    """
+
+    DOF_COUNT: Final = 4
+
+    @staticmethod
+    def __get_hermite_functions(t: np.ndarray, length: float) -> np.ndarray:
+        # Cubic Hermite functions of a side and their first and second derivatives with respect
+        # to the coordinate: the value and the slope at the start, the value and the slope at the end
+        t = np.asarray(t, dtype=float)
+        values = [1 - 3 * t ** 2 + 2 * t ** 3, length * (t - 2 * t ** 2 + t ** 3)]
+        values += [3 * t ** 2 - 2 * t ** 3, length * (t ** 3 - t ** 2)]
+        slopes = [(6 * t ** 2 - 6 * t) / length, 1 - 4 * t + 3 * t ** 2]
+        slopes += [(6 * t - 6 * t ** 2) / length, 3 * t ** 2 - 2 * t]
+        curvatures = [(12 * t - 6) / length ** 2, (6 * t - 4) / length]
+        curvatures += [(6 - 12 * t) / length ** 2, (6 * t - 2) / length]
+        return np.array([values, slopes, curvatures])
+
+    @staticmethod
+    def __get_functions(
+        x: np.ndarray, y: np.ndarray, width: float, height: float, dx: int, dy: int
+    ) -> np.ndarray:
+        # Derivative of the shape functions of the order dx with respect to x and dy with respect to y
+        hx = ConformingElement.__get_hermite_functions(np.divide(x, width), width)[dx]
+        hy = ConformingElement.__get_hermite_functions(np.divide(y, height), height)[dy]
+        functions = []
+        # Nodes in the order of Element: (0, 0), (0, 1), (1, 1), (1, 0)
+        for i, j in ((0, 0), (0, 1), (1, 1), (1, 0)):
+            value_x, slope_x = hx[2 * i], hx[2 * i + 1]
+            value_y, slope_y = hy[2 * j], hy[2 * j + 1]
+            functions += [value_x * value_y, value_x * slope_y, -slope_x * value_y, slope_x * slope_y]
+        return np.moveaxis(np.array(functions), 0, -1)
+
+    @staticmethod
+    def get_shape_functions(x: np.ndarray, y: np.ndarray, width: float, height: float) -> np.ndarray:
+        """
+        Calculates the shape functions of an element.
+
+        Parameters
+        ----------
+        x : ndarray
+            X-axis coordinates of the points relative to the first node.
+        y : ndarray
+            Y-axis coordinates of the points relative to the first node.
+        width : non-negative float
+            Width of element.
+        height : non-negative float
+            Height of element.
+
+        Returns
+        -------
+        ndarray
+            Array of shape x.shape + (16,): the deformation at the points
+            is its product with the element degrees of freedom.
+
+        """
+        return ConformingElement.__get_functions(x, y, width, height, 0, 0)
+
+    @staticmethod
+    def get_shape_function_gradients(x: np.ndarray, y: np.ndarray, width: float, height: float) -> np.ndarray:
+        """
+        Calculates the derivatives of the shape functions of an element.
+
+        Parameters
+        ----------
+        x : ndarray
+            X-axis coordinates of the points relative to the first node.
+        y : ndarray
+            Y-axis coordinates of the points relative to the first node.
+        width : non-negative float
+            Width of element.
+        height : non-negative float
+            Height of element.
+
+        Returns
+        -------
+        ndarray
+            Array of shape x.shape + (2, 16) with the x and y derivatives.
+
+        """
+        return np.stack(
+            (
+                ConformingElement.__get_functions(x, y, width, height, 1, 0),
+                ConformingElement.__get_functions(x, y, width, height, 0, 1),
+            ),
+            axis=-2,
+        )
+
+    @staticmethod
+    def get_curvature_matrix(x: np.ndarray, y: np.ndarray, width: float, height: float) -> np.ndarray:
+        """
+        Calculates the matrix that relates the element degrees of freedom
+        to the curvatures (-d2w/dx2, -d2w/dy2, -2 d2w/dxdy).
+
+        Parameters
+        ----------
+        x : ndarray
+            X-axis coordinates of the points relative to the first node.
+        y : ndarray
+            Y-axis coordinates of the points relative to the first node.
+        width : non-negative float
+            Width of element.
+        height : non-negative float
+            Height of element.
+
+        Returns
+        -------
+        ndarray
+            Array of shape x.shape + (3, 16).
+
+        """
+        return -np.stack(
+            (
+                ConformingElement.__get_functions(x, y, width, height, 2, 0),
+                ConformingElement.__get_functions(x, y, width, height, 0, 2),
+                2 * ConformingElement.__get_functions(x, y, width, height, 1, 1),
+            ),
+            axis=-2,
+        )
+
+    @staticmethod
+    def get_local_stiffness_matrix() -> np.ndarray:
+        """
+        Calculates the local stiffness matrix.
+
+        Returns
+        -------
+        ndarray
+            Local stiffness matrix.
+
+        """
+        # The curvatures are cubic along one side, so the 4-point quadrature is exact
+        x, y, weights = Element.get_quadrature(4, Element.width, Element.height)
+        b = ConformingElement.get_curvature_matrix(x, y, Element.width, Element.height)
+        d = Element.get_elasticity_matrix()
+        return np.einsum("q,qki,kl,qlj->ij", weights, b, d, b)
+
+    @staticmethod
+    def get_local_geometric_stiffness_matrix(
+        sigma_x: float, sigma_y: float, tau_xy: float = 0.0
+    ) -> np.ndarray:
+        """
+        Calculates the local geometric stiffness matrix of prescribed
+        in-plane stresses (tension is positive).
+
+        Parameters
+        ----------
+        sigma_x : float
+            Normal stress along the x-axis.
+        sigma_y : float
+            Normal stress along the y-axis.
+        tau_xy : float
+            Shear stress.
+
+        Returns
+        -------
+        ndarray
+            Local geometric stiffness matrix.
+
+        """
+        # The gradients are cubic along each side, so the 4-point quadrature is exact
+        x, y, weights = Element.get_quadrature(4, Element.width, Element.height)
+        g = ConformingElement.get_shape_function_gradients(x, y, Element.width, Element.height)
+        stresses = np.array([[sigma_x, tau_xy], [tau_xy, sigma_y]])
+        return Element.thickness * np.einsum("q,qki,kl,qlj->ij", weights, g, stresses, g)
+
+    @staticmethod
+    def get_local_mass_matrix(lumped: bool = False) -> np.ndarray:
+        """
+        Calculates the local mass matrix of the translational inertia.
+
+        Parameters
+        ----------
+        lumped : bool
+            Determines whether the matrix is diagonal: the diagonal of the
+            consistent matrix scaled so that the translational entries
+            sum to the mass of the element.
+
+        Returns
+        -------
+        ndarray
+            Local mass matrix.
+
+        """
+        # The shape functions are cubic along each side, so the 4-point quadrature is exact
+        x, y, weights = Element.get_quadrature(4, Element.width, Element.height)
+        n = ConformingElement.get_shape_functions(x, y, Element.width, Element.height)
+        matrix = Element.density * Element.thickness * np.einsum("q,qi,qj->ij", weights, n, n)
+        if not lumped:
+            return matrix
+
+        diagonal = np.diag(matrix)
+        mass = Element.density * Element.thickness * Element.width * Element.height
+        return np.diag(diagonal * mass / diagonal[:: ConformingElement.DOF_COUNT].sum())
+
+    @staticmethod
+    def get_local_nodal_force_matrix(pressure: Optional[float] = None) -> np.ndarray:
+        """
+        Calculates the consistent local nodal forces of a uniform pressure.
+
+        Parameters
+        ----------
+        pressure : float or None
+            Pressure on the element; the pressure of the element by default.
+
+        Returns
+        -------
+        ndarray
+            Local nodal forces.
+
+        """
+        # The shape functions are cubic along each side, so the 2-point quadrature is exact
+        x, y, weights = Element.get_quadrature(2, Element.width, Element.height)
+        n = ConformingElement.get_shape_functions(x, y, Element.width, Element.height)
+        return (Element.pressure if pressure is None else pressure) * weights @ n
@@ -0,0 +1,101 @@
+"""
+Class that solves symmetric positive definite systems by the
+preconditioned conjugate gradient method.
+
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+
+
+class ConjugateGradient:
+    """
+    Solves symmetric positive definite systems by the preconditioned
+    conjugate gradient method. The operator and the preconditioner are
+    given as functions, so they need not be stored as matrices.
+
+    Parameters
+    ----------
+    tolerance : positive float
+        Relative residual norm at which the iterations stop.
+    max_iterations : positive int
+        Maximum number of iterations.
+
+    Attributes
+    ----------
+    iterations : non-negative int
+        Number of iterations of the last solve.
+    residual : non-negative float
+        Relative residual norm of the last solve.
+
+    """
+
+    def __init__(self, tolerance: float = 1e-8, max_iterations: int = 10000) -> None:
+        self.__tolerance = tolerance
+        self.__max_iterations = max_iterations
+        self.iterations = 0
+        self.residual = 0.0
+
+    def solve(
+        self,
+        operator: Callable[[np.ndarray], np.ndarray],
+        b: np.ndarray,
+        preconditioner: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+        x0: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Solves the system.
+
+        Parameters
+        ----------
+        operator : callable
+            Returns the product of the matrix of the system and a vector.
+        b : ndarray
+            Right-hand side.
+        preconditioner : callable or None
+            Returns the product of the preconditioner and a vector.
+        x0 : ndarray or None
+            Initial approximation; zero by default.
+
+        Returns
+        -------
+        ndarray
+            Solution.
+
+        Raises
+        ------
+        ArithmeticError
+            If the tolerance is not reached in the maximum number of iterations.
+
+        """
+        b_norm = np.linalg.norm(b)
+        if b_norm == 0:
+            self.iterations, self.residual = 0, 0.0
+            return np.zeros_like(b)
+
+        x = np.zeros_like(b) if x0 is None else x0.copy()
+        r = b - operator(x) if x0 is not None else b.copy()
+        z = r if preconditioner is None else preconditioner(r)
+        p = z.copy()
+        rz = r @ z
+
+        for self.iterations in range(1, self.__max_iterations + 1):
+            q = operator(p)
+            alpha = rz / (p @ q)
+            x += alpha * p
+            r -= alpha * q
+            self.residual = np.linalg.norm(r) / b_norm
+            if self.residual <= self.__tolerance:
+                return x
+            z = r if preconditioner is None else preconditioner(r)
+            rz_next = r @ z
+            p *= rz_next / rz
+            p += z
+            rz = rz_next
+
+        raise ArithmeticError(
+            "Conjugate gradient did not converge: relative residual {:.3e} after {} iterations".format(
+                self.residual, self.iterations
+            )
+        )
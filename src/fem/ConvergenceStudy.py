@@ -0,0 +1,197 @@
+"""
+Class that measures the convergence of the finite elements
+under mesh refinement.
+
+"""
+
+import time
+from typing import Any, Dict, Final, Iterable, List, NamedTuple, Optional, Sequence
+
+from src.fem.FEM import FEM
+
+
+class ConvergenceRecord(NamedTuple):
+    """
+    Result of one calculation of a convergence study.
+
+    Attributes
+    ----------
+    element : str
+        Finite element (see FEM.ELEMENTS).
+    element_count : positive int
+        Number of elements along each side of the plate.
+    dof_count : positive int
+        Number of degrees of freedom of the mesh.
+    max_deformation : float
+        Max deformation of nodes.
+    time : float
+        Time of the mesh creation and the calculation in seconds.
+
+    """
+
+    element: str
+    element_count: int
+    dof_count: int
+    max_deformation: float
+    time: float
+
+
+class ConvergenceStudy:
+    """
+    Calculates a plate with each finite element on a sequence of
+    refined meshes and determines how many degrees of freedom every
+    element needs for a given accuracy of the max deformation.
+
+    The error of a calculation is relative to a reference value: the exact
+    one if it is known, otherwise the limit of the element that converges
+    best, extrapolated from its three finest meshes by the Aitken
+    delta-squared process (the meshes should be refined by the same factor).
+
+    Parameters
+    ----------
+    parameters : dict
+        Keyword arguments for the FEM class without the element counts
+        and the element.
+    element_counts : sequence of int
+        Numbers of elements along each side of the plate in ascending order.
+    elements : iterable of str
+        Finite elements to compare (some of FEM.ELEMENTS).
+
+    Attributes
+    ----------
+    records : list of ConvergenceRecord
+        Results of the calculations, by element and then by mesh.
+
+    Class Attributes
+    ----------------
+    ELEMENT_COUNTS : tuple
+        Default numbers of elements along each side.
+
+    """
+
+    ELEMENT_COUNTS: Final = (2, 4, 8, 16, 32)
+
+    def __init__(
+        self,
+        parameters: Dict[str, Any],
+        element_counts: Sequence[int] = ELEMENT_COUNTS,
+        elements: Iterable[str] = FEM.ELEMENTS,
+    ) -> None:
+        self.records: Final = [
+            ConvergenceStudy.solve(parameters, element, element_count)
+            for element in elements
+            for element_count in element_counts
+        ]
+
+    @staticmethod
+    def solve(parameters: Dict[str, Any], element: str, element_count: int) -> ConvergenceRecord:
+        """
+        Performs one calculation of the study.
+
+        Parameters
+        ----------
+        parameters : dict
+            Keyword arguments for the FEM class without the element counts
+            and the element.
+        element : str
+            Finite element (one of FEM.ELEMENTS).
+        element_count : positive int
+            Number of elements along each side of the plate.
+
+        Returns
+        -------
+        ConvergenceRecord
+            Result of the calculation.
+
+        """
+        start = time.perf_counter()
+        fem = FEM(
+            **parameters, h_element_count=element_count, v_element_count=element_count, element=element
+        )
+        fem.create_mesh()
+        fem.calculate()
+        return ConvergenceRecord(
+            element,
+            element_count,
+            fem.dof_count * len(fem.node_coordinates),
+            float(fem.get_max_node_deformation()),
+            time.perf_counter() - start,
+        )
+
+    def get_reference(self) -> float:
+        """
+        Extrapolates the max deformation to an infinitely fine mesh.
+
+        Returns
+        -------
+        float
+            Limit of the element whose last refinement changed the result least.
+
+        Raises
+        ------
+        ValueError
+            If no element was calculated on three meshes.
+
+        """
+        best = None
+        for element in dict.fromkeys(record.element for record in self.records):
+            values = [record.max_deformation for record in self.records if record.element == element]
+            if len(values) < 3:
+                continue
+            first, second, third = values[-3:]
+            denominator = (third - second) - (second - first)
+            limit = third if denominator == 0 else third - (third - second) ** 2 / denominator
+            if best is None or abs(third - second) < best[0]:
+                best = abs(third - second), limit
+        if best is None:
+            raise ValueError("The reference needs the results of three meshes")
+        return best[1]
+
+    def get_errors(self, reference: Optional[float] = None) -> List[float]:
+        """
+        Calculates the relative errors of the records.
+
+        Parameters
+        ----------
+        reference : float or None
+            Exact max deformation; extrapolated by get_reference by default.
+
+        Returns
+        -------
+        list of float
+            Relative error of the max deformation of each record.
+
+        """
+        if reference is None:
+            reference = self.get_reference()
+        return [abs(record.max_deformation - reference) / abs(reference) for record in self.records]
+
+    def get_required_dofs(
+        self, tolerances: Iterable[float], reference: Optional[float] = None
+    ) -> Dict[str, List[Optional[int]]]:
+        """
+        Determines the degrees of freedom every element needs for each accuracy.
+
+        Parameters
+        ----------
+        tolerances : iterable of float
+            Relative errors of the max deformation.
+        reference : float or None
+            Exact max deformation; extrapolated by get_reference by default.
+
+        Returns
+        -------
+        dict
+            Smallest number of degrees of freedom of the meshes of each element
+            whose errors do not exceed each tolerance, or None if no mesh does.
+
+        """
+        tolerances = list(tolerances)
+        errors = self.get_errors(reference)
+        required: Dict[str, List[Optional[int]]] = {}
+        for record, error in zip(self.records, errors):
+            dofs = required.setdefault(record.element, [None] * len(tolerances))
+            for index, tolerance in enumerate(tolerances):
+                if error <= tolerance and (dofs[index] is None or record.dof_count < dofs[index]):
+                    dofs[index] = record.dof_count
+        return required
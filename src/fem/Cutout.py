@@ -0,0 +1,127 @@
+"""
+Classes of the cut-outs (holes and notches) of a plate.
+
+"""
+
+from typing import Iterable, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+class RectangularCutout(NamedTuple):
+    """
+    Rectangular cut-out with the sides parallel to the sides of the plate.
+
+    Attributes
+    ----------
+    left : float
+        X-axis coordinate of the left side.
+    bottom : float
+        Y-axis coordinate of the bottom side.
+    right : float
+        X-axis coordinate of the right side.
+    top : float
+        Y-axis coordinate of the top side.
+
+    """
+
+    left: float
+    bottom: float
+    right: float
+    top: float
+
+    def contains(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Determines whether the points are inside the cut-out.
+
+        Parameters
+        ----------
+        x : ndarray
+            X-axis coordinates of the points.
+        y : ndarray
+            Y-axis coordinates of the points.
+
+        Returns
+        -------
+        ndarray
+            Boolean array that determines whether each point is inside.
+
+        """
+        return (x >= self.left) & (x <= self.right) & (y >= self.bottom) & (y <= self.top)
+
+
+class CircularCutout(NamedTuple):
+    """
+    Circular cut-out.
+
+    Attributes
+    ----------
+    x : float
+        X-axis coordinate of the center.
+    y : float
+        Y-axis coordinate of the center.
+    radius : positive float
+        Radius.
+
+    """
+
+    x: float
+    y: float
+    radius: float
+
+    def contains(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Determines whether the points are inside the cut-out.
+
+        Parameters
+        ----------
+        x : ndarray
+            X-axis coordinates of the points.
+        y : ndarray
+            Y-axis coordinates of the points.
+
+        Returns
+        -------
+        ndarray
+            Boolean array that determines whether each point is inside.
+
+        """
+        return (x - self.x) ** 2 + (y - self.y) ** 2 <= self.radius ** 2
+
+
+Cutout = Union[RectangularCutout, CircularCutout]
+
+
+def create_cutouts(cutouts: Optional[Iterable[Union[Cutout, Sequence[float]]]]) -> Tuple[Cutout, ...]:
+    """
+    Creates the cut-outs from their descriptions.
+
+    Parameters
+    ----------
+    cutouts : iterable or None
+        Cut-outs or sequences of numbers: four are the sides of a rectangular
+        one (see RectangularCutout), three are the center and the radius of
+        a circular one.
+
+    Returns
+    -------
+    tuple
+        Cut-outs.
+
+    Raises
+    ------
+    ValueError
+        If a description has another number of values.
+
+    """
+    result = []
+    for cutout in cutouts or ():
+        if isinstance(cutout, (RectangularCutout, CircularCutout)):
+            result.append(cutout)
+        elif len(cutout) == 4:
+            result.append(RectangularCutout(*(float(value) for value in cutout)))
+        elif len(cutout) == 3:
+            result.append(CircularCutout(*(float(value) for value in cutout)))
+        else:
+            raise ValueError("A cut-out is described by 4 (rectangle) or 3 (circle) numbers")
+    return tuple(result)
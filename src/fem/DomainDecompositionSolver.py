@@ -0,0 +1,282 @@
+"""
+Class that solves the plate system by the conjugate gradient method
+preconditioned with the additive Schwarz method on subdomains solved
+in worker processes.
+
+"""
+
+import multiprocessing
+import os
+from multiprocessing.connection import Connection
+from typing import Final, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from src.fem.ConjugateGradient import ConjugateGradient
+from src.fem.MatrixFreeOperator import MatrixFreeOperator
+from src.fem.MultigridSolver import MultigridSolver
+from src.fem.Node import Node
+from src.fem.SharedArray import SharedArray, SharedArrayHandle
+
+
+def _serve_subdomain(
+    connection: Connection,
+    operator: MatrixFreeOperator,
+    local_rows: Tuple[int, int],
+    global_rows: Tuple[int, int],
+    residual_handle: SharedArrayHandle,
+    correction_handle: SharedArrayHandle,
+    correction_offset: int,
+) -> None:
+    # Runs in a worker process: factorizes the subdomain matrix, then solves it
+    # for the residual in the shared memory on every request
+    with SharedArray.attach(residual_handle) as shared_residual, SharedArray.attach(
+        correction_handle
+    ) as shared_correction:
+        residual = shared_residual.array[global_rows[0] : global_rows[1]]
+        correction = shared_correction.array[
+            correction_offset : correction_offset + global_rows[1] - global_rows[0]
+        ]
+        try:
+            rows = slice(*local_rows)
+            solver = splu(operator.assemble()[rows, rows].tocsc())
+            connection.send(None)
+        except Exception as error:
+            connection.send(error)
+            solver = None
+
+        while solver is not None and connection.recv():
+            correction[:] = solver.solve(residual)
+            connection.send(None)
+        # The views must be released before the shared memory is closed
+        del residual, correction
+
+
+class DomainDecompositionSolver:
+    """
+    Solves the plate system by the conjugate gradient method preconditioned
+    with the two-level additive Schwarz method.
+
+    The mesh is split into overlapping strips of node columns, whose degrees
+    of freedom are contiguous. Every strip is assembled and factorized in its
+    own worker process, which keeps the factorization for the whole solve;
+    the residual and the corrections are exchanged through shared memory,
+    so only short messages are sent between the processes. The coarse
+    correction on a mesh with fewer elements (the element counts halved while
+    they are even and the system is larger than COARSE_SIZE) couples the
+    strips and is solved in the calling process while the workers run.
+
+    Parameters
+    ----------
+    operator : MatrixFreeOperator
+        Global stiffness matrix with the fixation applied.
+    element_width : positive float
+        Width of element.
+    element_height : positive float
+        Height of element.
+    process_count : positive int or None
+        Number of subdomains and worker processes; the number of CPUs by default.
+    overlap : non-negative int
+        Number of node columns by which the strips are extended on each side.
+    tolerance : positive float
+        Relative residual norm at which the iterations stop.
+
+    Attributes
+    ----------
+    iterations : non-negative int
+        Number of conjugate gradient iterations of the last solve.
+
+    Class Attributes
+    ----------------
+    COARSE_SIZE : positive int
+        Size of the coarse system below which the mesh is not coarsened.
+    OVERLAP : non-negative int
+        Default number of overlapping node columns.
+
+    """
+
+    COARSE_SIZE: Final = 5000
+    OVERLAP: Final = 4
+
+    def __init__(
+        self,
+        operator: MatrixFreeOperator,
+        element_width: float,
+        element_height: float,
+        process_count: Optional[int] = None,
+        overlap: int = OVERLAP,
+        tolerance: float = 1e-10,
+    ) -> None:
+        self.__operator = operator
+        self.__cg = ConjugateGradient(tolerance)
+        self.iterations = 0
+
+        size = operator.shape[0]
+        column_size = Node.DOF_COUNT * (operator.v_element_count + 1)
+        column_count = operator.h_element_count + 1
+        process_count = min(process_count or os.cpu_count() or 1, column_count)
+        bounds = np.linspace(0, column_count, process_count + 1).round().astype(int)
+
+        self.__global_rows: List[Tuple[int, int]] = []
+        self.__correction_offsets: List[int] = []
+        self.__connections: List[Connection] = []
+        self.__processes: List[multiprocessing.Process] = []
+        strips = []
+        offset = 0
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            first_node, last_node = max(first - overlap, 0), min(last + overlap, column_count)
+            first_element = max(first_node - 1, 0)
+            last_element = max(min(last_node, operator.h_element_count), first_element + 1)
+            strips.append(
+                (
+                    operator.get_strip(first_element, last_element),
+                    (column_size * (first_node - first_element), column_size * (last_node - first_element)),
+                )
+            )
+            self.__global_rows.append((column_size * first_node, column_size * last_node))
+            self.__correction_offsets.append(offset)
+            offset += column_size * (last_node - first_node)
+
+        self.__residual: Optional[SharedArray] = SharedArray(size)
+        self.__corrections: Optional[SharedArray] = SharedArray(offset)
+
+        try:
+            for (strip, local_rows), global_rows, correction_offset in zip(
+                strips, self.__global_rows, self.__correction_offsets
+            ):
+                connection, worker_connection = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=_serve_subdomain,
+                    args=(
+                        worker_connection,
+                        strip,
+                        local_rows,
+                        global_rows,
+                        self.__residual.handle,
+                        self.__corrections.handle,
+                        correction_offset,
+                    ),
+                    daemon=True,
+                )
+                process.start()
+                worker_connection.close()
+                self.__connections.append(connection)
+                self.__processes.append(process)
+
+            # The coarse problem is prepared while the workers factorize their subdomains
+            self.__prolongation, self.__coarse_solver = DomainDecompositionSolver.__create_coarse_problem(
+                operator, element_width, element_height
+            )
+            for connection in self.__connections:
+                DomainDecompositionSolver.__receive(connection)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> "DomainDecompositionSolver":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def subdomain_count(self) -> int:
+        """
+        Property that returns the number of subdomains.
+
+        Returns
+        -------
+        positive int
+            Number of subdomains and worker processes.
+
+        """
+        return len(self.__global_rows)
+
+    @staticmethod
+    def __create_coarse_problem(
+        operator: MatrixFreeOperator, element_width: float, element_height: float
+    ) -> Tuple[Optional[sparse.csr_matrix], Optional[object]]:
+        prolongation = None
+        coarse = operator
+        while (
+            coarse.h_element_count % 2 == 0
+            and coarse.v_element_count % 2 == 0
+            and coarse.shape[0] > DomainDecompositionSolver.COARSE_SIZE
+        ):
+            element_width, element_height = 2 * element_width, 2 * element_height
+            level_prolongation, _ = MultigridSolver.create_prolongation(
+                coarse.h_element_count // 2,
+                coarse.v_element_count // 2,
+                element_width,
+                element_height,
+                coarse.fixed_dofs,
+            )
+            prolongation = level_prolongation if prolongation is None else prolongation @ level_prolongation
+            coarse = coarse.coarsen()
+        if prolongation is None:
+            return None, None
+        return prolongation.tocsr(), splu(coarse.assemble().tocsc())
+
+    @staticmethod
+    def __receive(connection: Connection) -> None:
+        error = connection.recv()
+        if error is not None:
+            raise error
+
+    def __precondition(self, r: np.ndarray) -> np.ndarray:
+        self.__residual.array[:] = r
+        for connection in self.__connections:
+            connection.send(True)
+
+        if self.__coarse_solver is None:
+            z = np.zeros_like(r)
+        else:
+            z = self.__prolongation @ self.__coarse_solver.solve(self.__prolongation.T @ r)
+
+        for connection, (first, last), offset in zip(
+            self.__connections, self.__global_rows, self.__correction_offsets
+        ):
+            DomainDecompositionSolver.__receive(connection)
+            z[first:last] += self.__corrections.array[offset : offset + last - first]
+        return z
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        Solves the system.
+
+        Parameters
+        ----------
+        b : ndarray
+            Right-hand side.
+
+        Returns
+        -------
+        ndarray
+            Solution.
+
+        """
+        solution = self.__cg.solve(lambda x: self.__operator @ x, b, self.__precondition)
+        self.iterations = self.__cg.iterations
+        return solution
+
+    def close(self) -> None:
+        """
+        Stops the worker processes and releases the shared memory.
+
+        """
+        for connection in self.__connections:
+            try:
+                connection.send(False)
+            except OSError:
+                pass
+            connection.close()
+        for process in self.__processes:
+            process.join()
+        self.__connections, self.__processes = [], []
+
+        if self.__residual is not None:
+            self.__residual.release()
+            self.__corrections.release()
+            self.__residual = self.__corrections = None
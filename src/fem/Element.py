@@ -4,7 +4,7 @@ necessary data based on them to use the finite element method.
 
 """
 
-from typing import Final
+from typing import Final, Optional
 
 import numpy as np
 
@@ -43,6 +43,8 @@ class Element:
         Young's modulus (elasticity) of material of element.
     poisson : non-negative float
         Poisson ratio of material of element.
+    density : non-negative float
+        Density of material of element.
 
     """
 
@@ -54,13 +56,20 @@ class Element:
     pressure: float
     young: int
     poisson: float
+    density: float
 
     def __init__(self, nodes: tuple) -> None:
         self.nodes: Final = nodes
 
     @staticmethod
     def set_parameters(
-        width: float, height: float, thickness: int, pressure: float, young: int, poisson: float
+        width: float,
+        height: float,
+        thickness: int,
+        pressure: float,
+        young: int,
+        poisson: float,
+        density: float = 0.0,
     ) -> None:
         """
         Sets the parameters of the element.
@@ -79,6 +88,8 @@ class Element:
             Young's modulus (elasticity) of material of element.
         poisson : non-negative float
             Poisson ratio of material of element.
+        density : non-negative float
+            Density of material of element.
 
         """
         Element.width = width
@@ -87,6 +98,161 @@ class Element:
         Element.pressure = pressure
         Element.young = young
         Element.poisson = poisson
+        Element.density = density
+
+    @staticmethod
+    def __get_polynomial_terms(xi: np.ndarray, eta: np.ndarray) -> np.ndarray:
+        # Terms of the displacement polynomial and their derivatives with respect
+        # to the normalized coordinates: p, dp/dxi, dp/deta, d2p/dxi2, d2p/deta2, d2p/dxideta
+        xi = np.asarray(xi, dtype=float)
+        eta = np.asarray(eta, dtype=float)
+        one = np.ones_like(xi)
+        zero = np.zeros_like(xi)
+        terms = [
+            [one, xi, eta, xi ** 2, xi * eta, eta ** 2, xi ** 3, xi ** 2 * eta, xi * eta ** 2, eta ** 3, xi ** 3 * eta, xi * eta ** 3],
+            [zero, one, zero, 2 * xi, eta, zero, 3 * xi ** 2, 2 * xi * eta, eta ** 2, zero, 3 * xi ** 2 * eta, eta ** 3],
+            [zero, zero, one, zero, xi, 2 * eta, zero, xi ** 2, 2 * xi * eta, 3 * eta ** 2, xi ** 3, 3 * xi * eta ** 2],
+            [zero, zero, zero, 2 * one, zero, zero, 6 * xi, 2 * eta, zero, zero, 6 * xi * eta, zero],
+            [zero, zero, zero, zero, zero, 2 * one, zero, zero, 2 * xi, 6 * eta, zero, 6 * xi * eta],
+            [zero, zero, zero, zero, one, zero, zero, 2 * xi, 2 * eta, zero, 3 * xi ** 2, 3 * eta ** 2],
+        ]
+        return np.moveaxis(np.array(terms), (0, 1), (-2, -1))
+
+    @staticmethod
+    def __get_inverse_nodal_matrix(width: float, height: float) -> np.ndarray:
+        # Maps the nodal degrees of freedom (w, dw/dy, -dw/dx) to the polynomial coefficients
+        xi = np.array([0, 0, 1, 1])
+        eta = np.array([0, 1, 1, 0])
+        terms = Element.__get_polynomial_terms(xi, eta)
+        nodal_matrix = np.stack((terms[:, 0], terms[:, 2] / height, -terms[:, 1] / width), axis=1)
+        return np.linalg.inv(nodal_matrix.reshape(Element.NODE_COUNT * Node.DOF_COUNT, -1))
+
+    @staticmethod
+    def get_shape_functions(x: np.ndarray, y: np.ndarray, width: float, height: float) -> np.ndarray:
+        """
+        Calculates the shape functions of an element.
+
+        Parameters
+        ----------
+        x : ndarray
+            X-axis coordinates of the points relative to the first node.
+        y : ndarray
+            Y-axis coordinates of the points relative to the first node.
+        width : non-negative float
+            Width of element.
+        height : non-negative float
+            Height of element.
+
+        Returns
+        -------
+        ndarray
+            Array of shape x.shape + (12,): the deformation at the points
+            is its product with the element degrees of freedom.
+
+        """
+        terms = Element.__get_polynomial_terms(np.divide(x, width), np.divide(y, height))
+        return terms[..., 0, :] @ Element.__get_inverse_nodal_matrix(width, height)
+
+    @staticmethod
+    def get_shape_function_gradients(x: np.ndarray, y: np.ndarray, width: float, height: float) -> np.ndarray:
+        """
+        Calculates the derivatives of the shape functions of an element.
+
+        Parameters
+        ----------
+        x : ndarray
+            X-axis coordinates of the points relative to the first node.
+        y : ndarray
+            Y-axis coordinates of the points relative to the first node.
+        width : non-negative float
+            Width of element.
+        height : non-negative float
+            Height of element.
+
+        Returns
+        -------
+        ndarray
+            Array of shape x.shape + (2, 12) with the x and y derivatives.
+
+        """
+        terms = Element.__get_polynomial_terms(np.divide(x, width), np.divide(y, height))
+        gradients = np.stack((terms[..., 1, :] / width, terms[..., 2, :] / height), axis=-2)
+        return gradients @ Element.__get_inverse_nodal_matrix(width, height)
+
+    @staticmethod
+    def get_curvature_matrix(x: np.ndarray, y: np.ndarray, width: float, height: float) -> np.ndarray:
+        """
+        Calculates the matrix that relates the element degrees of freedom
+        to the curvatures (-d2w/dx2, -d2w/dy2, -2 d2w/dxdy).
+
+        Parameters
+        ----------
+        x : ndarray
+            X-axis coordinates of the points relative to the first node.
+        y : ndarray
+            Y-axis coordinates of the points relative to the first node.
+        width : non-negative float
+            Width of element.
+        height : non-negative float
+            Height of element.
+
+        Returns
+        -------
+        ndarray
+            Array of shape x.shape + (3, 12).
+
+        """
+        terms = Element.__get_polynomial_terms(np.divide(x, width), np.divide(y, height))
+        curvatures = -np.stack(
+            (
+                terms[..., 3, :] / width ** 2,
+                terms[..., 4, :] / height ** 2,
+                2 * terms[..., 5, :] / (width * height),
+            ),
+            axis=-2,
+        )
+        return curvatures @ Element.__get_inverse_nodal_matrix(width, height)
+
+    @staticmethod
+    def get_quadrature(order: int, width: float, height: float):
+        """
+        Returns the Gauss quadrature over the element.
+
+        Parameters
+        ----------
+        order : positive int
+            Number of points along each side.
+        width : non-negative float
+            Width of element.
+        height : non-negative float
+            Height of element.
+
+        Returns
+        -------
+        tuple of ndarray
+            X-axis and y-axis coordinates of the points relative to
+            the first node and their weights (the area is included).
+
+        """
+        points, weights = np.polynomial.legendre.leggauss(order)
+        points = (points + 1) / 2
+        x, y = np.meshgrid(points * width, points * height, indexing="ij")
+        return x.ravel(), y.ravel(), np.outer(weights, weights).ravel() * width * height / 4
+
+    @staticmethod
+    def get_elasticity_matrix() -> np.ndarray:
+        """
+        Calculates the matrix that relates the curvatures to the bending moments.
+
+        Returns
+        -------
+        ndarray
+            Flexural rigidity matrix of shape (3, 3).
+
+        """
+        u = Element.poisson
+        rigidity = Element.young * Element.thickness ** 3 / (12 * (1 - u ** 2))
+        return rigidity * np.array([[1, u, 0], [u, 1, 0], [0, 0, (1 - u) / 2]])
 
     @staticmethod
     def get_local_stiffness_matrix() -> np.ndarray:
@@ -99,141 +265,86 @@ class Element:
             Local stiffness matrix.
 
         """
-        a = Element.width
-        b = Element.height
-        alpha = a / b
-        beta = b / a
+        # The curvatures are quadratic, so the 3-point quadrature is exact
+        x, y, weights = Element.get_quadrature(3, Element.width, Element.height)
+        b = Element.get_curvature_matrix(x, y, Element.width, Element.height)
+        d = Element.get_elasticity_matrix()
+        return np.einsum("q,qki,kl,qlj->ij", weights, b, d, b)
 
-        e = Element.young
-        u = Element.poisson
+    @staticmethod
+    def get_local_geometric_stiffness_matrix(
+        sigma_x: float, sigma_y: float, tau_xy: float = 0.0
+    ) -> np.ndarray:
+        """
+        Calculates the local geometric stiffness matrix of prescribed
+        in-plane stresses (tension is positive).
 
-        coef = e * Element.thickness ** 3 / (48 * (1 - u ** 2) * a * b)
-
-        i1 = np.array([[-1, 0, 0], [0, 1, 0], [0, 0, 1]])
-        i2 = np.array([[1, 0, 0], [0, -1, 0], [0, 0, 1]])
-        i3 = np.array([[1, 0, 0], [0, 1, 0], [0, 0, -1]])
-
-        k11 = np.array(
-            [
-                [
-                    4 * (beta ** 2 + alpha ** 2) + (2 / 5) * (7 - 2 * u),
-                    b * (2 * alpha ** 2 + (1 / 5) * (1 + 4 * u)),
-                    a * (-2 * beta ** 2 - (1 / 5) * (1 + 4 * u)),
-                ],
-                [
-                    b * (2 * alpha ** 2 + (1 / 5) * (1 + 4 * u)),
-                    b ** 2 * ((4 / 3) * alpha ** 2 + (4 / 15) * (1 - u)),
-                    -(u * a * b),
-                ],
-                [
-                    a * (-2 * beta ** 2 - (1 / 5) * (1 + 4 * u)),
-                    -(u * a * b),
-                    a ** 2 * ((4 / 3) * beta ** 2 + (4 / 15) * (1 - u)),
-                ],
-            ]
-        )
+        Parameters
+        ----------
+        sigma_x : float
+            Normal stress along the x-axis.
+        sigma_y : float
+            Normal stress along the y-axis.
+        tau_xy : float
+            Shear stress.
 
-        k12 = np.array(
-            [
-                [
-                    -(2 * (2 * beta ** 2 - alpha ** 2) + (2 / 5) * (7 - 2 * u)),
-                    b * (alpha ** 2 - (1 / 5) * (1 + 4 * u)),
-                    -(a * (2 * beta ** 2 + (1 / 5) * (1 - u))),
-                ],
-                [
-                    b * (alpha ** 2 - (1 / 5) * (1 + 4 * u)),
-                    b ** 2 * ((2 / 3) * alpha ** 2 - (4 / 15) * (1 - u)),
-                    0,
-                ],
-                [
-                    a * (2 * beta ** 2 + (1 / 5) * (1 - u)),
-                    0,
-                    a ** 2 * ((2 / 3) * beta ** 2 - (1 / 15) * (1 - u)),
-                ],
-            ]
-        )
+        Returns
+        -------
+        ndarray
+            Local geometric stiffness matrix.
 
-        k13 = np.array(
-            [
-                [
-                    -(2 * (beta ** 2 + alpha ** 2) + (2 / 5) * (7 - 2 * u)),
-                    b * (alpha ** 2 - (1 / 5) * (1 - u)),
-                    a * (-(beta ** 2) + (1 / 5) * (1 - u)),
-                ],
-                [
-                    b * (-(alpha ** 2) + (1 / 5) * (1 - u)),
-                    b ** 2 * ((1 / 3) * alpha ** 2 + (1 / 15) * (1 - u)),
-                    0,
-                ],
-                [
-                    a * (beta ** 2 - (1 / 5) * (1 - u)),
-                    0,
-                    a ** 2 * ((1 / 3) * beta ** 2 + (1 / 15) * (1 - u)),
-                ],
-            ]
-        )
+        """
+        # The gradients are cubic along each side, so the 4-point quadrature is exact
+        x, y, weights = Element.get_quadrature(4, Element.width, Element.height)
+        g = Element.get_shape_function_gradients(x, y, Element.width, Element.height)
+        stresses = np.array([[sigma_x, tau_xy], [tau_xy, sigma_y]])
+        return Element.thickness * np.einsum("q,qki,kl,qlj->ij", weights, g, stresses, g)
 
-        k14 = np.array(
-            [
-                [
-                    2 * (beta ** 2 - 2 * alpha ** 2) - (2 / 5) * (7 - 2 * u),
-                    b * (2 * alpha ** 2 + (1 / 5) * (1 - u)),
-                    a * (-(beta ** 2) + (1 / 5) * (1 + 4 * u)),
-                ],
-                [
-                    b * (-2 * (alpha ** 2) - (1 / 5) * (1 - u)),
-                    b ** 2 * ((2 / 3) * alpha ** 2 - (1 / 15) * (1 - u)),
-                    0,
-                ],
-                [
-                    a * (-(beta ** 2) + (1 / 5) * (1 + 4 * u)),
-                    0,
-                    a ** 2 * ((2 / 3) * beta ** 2 - (4 / 15) * (1 - u)),
-                ],
-            ]
-        )
+    @staticmethod
+    def get_local_mass_matrix(lumped: bool = False) -> np.ndarray:
+        """
+        Calculates the local mass matrix of the translational inertia.
 
-        k22 = i3.T @ k11 @ i3
-        k23 = i3.T @ k14 @ i3
-        k24 = i3.T @ k23 @ i3
-        k33 = i1.T @ k11 @ i1
-        k34 = i1.T @ k12 @ i1
-        k44 = i2.T @ k11 @ i2
-
-        k = np.array(
-            [
-                [k11, k12, k13, k14],
-                [k12.T, k22, k23, k24],
-                [k13.T, k23.T, k33, k34],
-                [k14.T, k24.T, k34.T, k44],
-            ]
-        )
+        Parameters
+        ----------
+        lumped : bool
+            Determines whether the matrix is diagonal: the diagonal of the
+            consistent matrix scaled so that the translational entries
+            sum to the mass of the element.
 
-        k0 = k[0].reshape(12, 3).transpose()
-        k1 = k[1].reshape(12, 3).transpose()
-        k2 = k[2].reshape(12, 3).transpose()
-        k3 = k[3].reshape(12, 3).transpose()
+        Returns
+        -------
+        ndarray
+            Local mass matrix.
 
-        k = np.array([k0, k1, k2, k3])
+        """
+        # The shape functions are cubic along each side, so the 4-point quadrature is exact
+        x, y, weights = Element.get_quadrature(4, Element.width, Element.height)
+        n = Element.get_shape_functions(x, y, Element.width, Element.height)
+        matrix = Element.density * Element.thickness * np.einsum("q,qi,qj->ij", weights, n, n)
+        if not lumped:
+            return matrix
 
-        return coef * k.reshape(
-            Element.NODE_COUNT * Node.DOF_COUNT, Element.NODE_COUNT * Node.DOF_COUNT
-        )
+        diagonal = np.diag(matrix)
+        mass = Element.density * Element.thickness * Element.width * Element.height
+        return np.diag(diagonal * mass / diagonal[:: Node.DOF_COUNT].sum())
 
     @staticmethod
-    def get_local_nodal_force_matrix() -> np.ndarray:
+    def get_local_nodal_force_matrix(pressure: Optional[float] = None) -> np.ndarray:
         """
         Calculates the local nodal forces.
 
+        Parameters
+        ----------
+        pressure : float or None
+            Pressure on the element; the pressure of the element by default.
+
         Returns
         -------
         ndarray
             Local nodal forces.
 
         """
-        a = Element.width
-        b = Element.height
-        coef = Element.pressure * a * b / 3
-        matrix = np.array([3, b, -a, 3, b, a, 3, -b, -a, 3, -b, -a])
-        matrix *= np.array([1, 0, 0, 1, 0, 0, 1, 0, 0, 1, 0, 0])
-        return coef * matrix
+        # A quarter of the load of the element at each node
+        force = (Element.pressure if pressure is None else pressure) * Element.width * Element.height / 4
+        return force * np.tile([1.0, 0.0, 0.0], Element.NODE_COUNT)
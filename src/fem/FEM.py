@@ -4,12 +4,29 @@ by the finite element method.
 
 """ 
 
-from typing import Final, List
+import threading
+from typing import Final, Iterable, List, Optional, Sequence, Union
 
 import numpy as np
+from scipy import sparse
+from scipy.linalg import solveh_banded
+from scipy.sparse.linalg import LinearOperator, eigsh, splu
 
 from src.fem.Node import Node
+from src.fem.ConformingElement import ConformingElement
+from src.fem.Cutout import Cutout, create_cutouts
+from src.fem.DomainDecompositionSolver import DomainDecompositionSolver
 from src.fem.Element import Element
+from src.fem.MeshTopology import MeshTopology
+from src.fem.MatrixFreeOperator import MatrixFreeOperator
+from src.fem.MultigridSolver import MultigridSolver
+from src.fem.SolverPlanner import SolverEstimate, SolverPlanner
+from src.fem.SparsePattern import SparsePattern
+
+
+# Element parameters are class attributes, so they are set and used under the lock
+# to allow creating meshes of different FEM instances in several threads
+_element_parameters_lock: Final = threading.Lock()
 
 
 class FEM:
@@ -35,8 +52,84 @@ class FEM:
         The number of finite elements horizontally.
     v_element_count : non-negative int
         The number of finite elements vertically.
+    density : non-negative float
+        Density of material of element (used by the modal analysis); steel
+        in tonnes per cubic millimetre by default, which is consistent with
+        the dimensions in millimetres and the Young's modulus in megapascals.
+    solver : str
+        Method of solving the system of equations (one of SOLVERS):
+        "dense" assembles the dense matrix and solves it by LU decomposition,
+        "banded" solves the band of the sparse matrix by Cholesky decomposition,
+        "direct" solves the sparse matrix by sparse LU decomposition,
+        "multigrid" assembles the sparse matrix and solves it by the conjugate
+        gradient method with the multigrid preconditioner (see MultigridSolver),
+        "matrix-free" does the same without assembling the matrix
+        (see MatrixFreeOperator), "domain-decomposition" solves it by the conjugate
+        gradient method with subdomains solved in worker processes
+        (see DomainDecompositionSolver), "auto" chooses the fastest one
+        that fits the memory budget (see SolverPlanner).
+    process_count : positive int or None
+        Number of worker processes of the "domain-decomposition" solver;
+        the number of CPUs by default.
+    memory_budget : positive int or None
+        Memory in bytes available for the calculation. If it is given,
+        the estimated memory of the solver is checked before any work
+        is done; the "auto" solver uses the available memory by default.
+    cutouts : iterable or None
+        Cut-outs of the plate (see create_cutouts); the elements whose
+        centers are inside any of them are removed.
+    element_mask : array_like or None
+        Boolean array that determines whether each element of the full mesh
+        (in the order of element_connectivity without cut-outs) is kept.
+    element : str
+        Finite element (one of ELEMENTS): "acm" is the rectangular element
+        with 12 degrees of freedom (see Element), "bfs" is the conforming
+        Bogner-Fox-Schmit element with 16 (see ConformingElement), which
+        needs far fewer degrees of freedom for the same accuracy.
+    support : str
+        Support of the plate (one of SUPPORTS): "corners" fixes all degrees
+        of freedom of three corners, "simply-supported" fixes the deformation
+        and the slope along the edge at every edge node, "clamped" fixes all
+        degrees of freedom of the edge nodes, "simply-supported-clamped"
+        simply supports the vertical edges (x = 0 and x = width) and clamps
+        the horizontal ones.
+
+    The removed elements and the nodes that belong only to them are not
+    assembled and get no degrees of freedom, so the nodes, elements and
+    degrees of freedom are numbered over the kept ones. The plates with
+    removed elements or with the "bfs" element are solved only by the
+    GENERAL_SOLVERS.
+
+    Raises
+    ------
+    ValueError
+        If the solver, the element or the support is unknown, if the solver
+        does not support the mesh, if the element mask does not match the
+        mesh or if a fixed corner is removed.
+    MemoryError
+        If the solver (or, for "auto", every solver) does not fit
+        the memory budget.
+
+    Class Attributes
+    ----------------
+    SOLVERS : tuple
+        Available methods of solving the system of equations.
+    GENERAL_SOLVERS : tuple
+        Methods that solve the plates with removed elements or with the
+        "bfs" element (the others rely on the full structured mesh of the
+        "acm" element).
+    ELEMENTS : tuple
+        Available finite elements.
+    SUPPORTS : tuple
+        Available supports of the plate.
+
     """
 
+    SOLVERS: Final = ("dense", "banded", "direct", "multigrid", "matrix-free", "domain-decomposition")
+    GENERAL_SOLVERS: Final = ("dense", "banded", "direct")
+    ELEMENTS: Final = ("acm", "bfs")
+    SUPPORTS: Final = ("corners", "simply-supported", "clamped", "simply-supported-clamped")
+
     def __init__(
         self,
         width: int,
@@ -47,7 +140,32 @@ class FEM:
         poisson: float,
         h_element_count: int,
         v_element_count: int,
+        density: float = 7.85e-9,
+        solver: str = "dense",
+        process_count: Optional[int] = None,
+        memory_budget: Optional[int] = None,
+        cutouts: Optional[Iterable[Union[Cutout, Sequence[float]]]] = None,
+        element_mask: Optional[Sequence[bool]] = None,
+        element: str = "acm",
+        support: str = "corners",
     ) -> None:
+        if element not in FEM.ELEMENTS:
+            raise ValueError("Unknown element: {}".format(element))
+        if support not in FEM.SUPPORTS:
+            raise ValueError("Unknown support: {}".format(support))
+        cutouts = create_cutouts(cutouts)
+        if element_mask is not None:
+            element_mask = np.asarray(element_mask, dtype=bool)
+            if element_mask.shape != (h_element_count * v_element_count,):
+                raise ValueError("The element mask must have a value for each element of the mesh")
+        general = bool(cutouts) or element_mask is not None or element != "acm"
+        if solver not in FEM.SOLVERS and solver != "auto":
+            raise ValueError("Unknown solver: {}".format(solver))
+        if general and solver not in FEM.GENERAL_SOLVERS and solver != "auto":
+            raise ValueError(
+                "The {} solver does not support removed elements or the {} element".format(solver, element)
+            )
+
         self.__width: Final = width
         self.__height: Final = height
         self.__thickness: Final = thickness
@@ -56,6 +174,30 @@ class FEM:
         self.__poisson: Final = poisson
         self.__h_element_count: Final = h_element_count
         self.__v_element_count: Final = v_element_count
+        self.__density: Final = density
+        self.__process_count: Final = process_count
+        self.__cutouts: Final = cutouts
+        self.__element_mask: Final = element_mask
+        self.__element: Final = element
+        self.__element_type: Final = ConformingElement if element == "bfs" else Element
+        self.__dof_count: Final = ConformingElement.DOF_COUNT if element == "bfs" else Node.DOF_COUNT
+        self.__support: Final = support
+
+        # The planner sizes the system by the nodes of the kept elements and the element
+        self.__kept_node_count: Final = self.__count_kept_nodes()
+        dof_count, node_count = self.__dof_count, self.__kept_node_count
+        if solver == "auto":
+            solvers = FEM.GENERAL_SOLVERS if general else SolverPlanner.SOLVERS
+            solver = (
+                SolverPlanner(memory_budget)
+                .plan(h_element_count, v_element_count, solvers, dof_count, node_count)
+                .solver
+            )
+        elif memory_budget is not None and solver in SolverPlanner.SOLVERS:
+            SolverPlanner(memory_budget).check(
+                h_element_count, v_element_count, solver, dof_count, node_count
+            )
+        self.__solver: Final = solver
 
         self.__h_node_count: int
         self.__v_node_count: int
@@ -63,13 +205,31 @@ class FEM:
         self.__element_height: float
         self.__vector_x: np.ndarray
         self.__vector_y: np.ndarray
-        self.__nodes: List[Node]
-        self.__elements: List[Element]
+        self.__grid_node_coordinates: np.ndarray
+        self.__grid_fixed_dofs: np.ndarray
+        self.__node_coordinates: np.ndarray
+        self.__element_connectivity: np.ndarray
+        self.__fixed_nodes: np.ndarray
+        self.__fixed_dofs: np.ndarray
+        self.__topology: MeshTopology
+        self.__nodes: Optional[List[Node]] = None
+        self.__elements: Optional[List[Element]] = None
+        self.__local_stiffness_matrix: np.ndarray
+        self.__local_nodal_forces: np.ndarray
+        self.__local_unit_nodal_forces: np.ndarray
+        self.__local_mass_matrix: np.ndarray
+        self.__local_lumped_mass_matrix: np.ndarray
+        self.__local_geometric_stiffness_matrices: np.ndarray
+        self.__local_moment_matrices: np.ndarray
         self.__global_stiffness_matrix_size: int
-        self.__global_stiffness_matrix: np.ndarray
+        self.__global_stiffness_matrix: Union[np.ndarray, sparse.csr_matrix]
         self.__global_nodal_forces: np.ndarray
         self.__solution: np.ndarray
         self.__nodes_deformation: np.ndarray
+        self.__natural_frequencies: np.ndarray
+        self.__mode_shapes: np.ndarray
+        self.__buckling_factors: np.ndarray
+        self.__buckling_modes: np.ndarray
 
     def __determine_node_count(self) -> None:
         self.__h_node_count = self.__h_element_count + 1
@@ -87,45 +247,102 @@ class FEM:
             self.__pressure,
             self.__young,
             self.__poisson,
+            self.__density,
         )
 
     def __determine_coordinate_vectors(self) -> None:
         self.__vector_x = np.linspace(0, self.__width, self.__h_node_count)
         self.__vector_y = np.linspace(0, self.__height, self.__v_node_count)
 
+    def __create_node_arrays(self) -> None:
+        self.__grid_node_coordinates = np.column_stack(
+            (
+                np.repeat(self.__vector_x, self.__v_node_count),
+                np.tile(self.__vector_y, self.__h_node_count),
+            )
+        )
+        x = self.__grid_node_coordinates[:, 0]
+        y = self.__grid_node_coordinates[:, 1]
+        fixed_dofs = np.zeros((len(x), self.__dof_count), dtype=bool)
+        if self.__support == "corners":
+            fixed_dofs[
+                (x == 0)
+                & (y == 0)
+                | (x == 0)
+                & (y == self.__height)
+                # | (x == self.__width)
+                # & (y == 0)
+                | (x == self.__width)
+                & (y == self.__height)
+            ] = True
+        else:
+            vertical_edges = (x == 0) | (x == self.__width)
+            horizontal_edges = (y == 0) | (y == self.__height)
+            # The deformation and its derivative along the edge: dw/dy and -dw/dx
+            fixed_dofs[vertical_edges | horizontal_edges, 0] = True
+            fixed_dofs[vertical_edges, 1] = True
+            fixed_dofs[horizontal_edges, 2] = True
+            if self.__support == "clamped":
+                fixed_dofs[vertical_edges | horizontal_edges] = True
+            elif self.__support == "simply-supported-clamped":
+                fixed_dofs[horizontal_edges] = True
+        self.__grid_fixed_dofs = fixed_dofs.ravel()
+
+    def __get_active_elements(self) -> Optional[np.ndarray]:
+        if not self.__cutouts and self.__element_mask is None:
+            return None
+        # Centers of the elements in the order of the connectivity of the full mesh
+        x = np.repeat((np.arange(self.__h_element_count) + 0.5) * self.__element_width, self.__v_element_count)
+        y = np.tile((np.arange(self.__v_element_count) + 0.5) * self.__element_height, self.__h_element_count)
+        active = np.ones(len(x), dtype=bool) if self.__element_mask is None else self.__element_mask.copy()
+        for cutout in self.__cutouts:
+            active &= ~cutout.contains(x, y)
+        return active
+
+    def __count_kept_nodes(self) -> int:
+        self.__determine_element_size()
+        active = self.__get_active_elements()
+        if active is None:
+            return (self.__h_element_count + 1) * (self.__v_element_count + 1)
+        # A node is kept if any of the four elements around it is
+        active = active.reshape(self.__h_element_count, self.__v_element_count)
+        kept = np.zeros((self.__h_element_count + 1, self.__v_element_count + 1), dtype=bool)
+        for i, j in ((0, 0), (0, 1), (1, 0), (1, 1)):
+            kept[i : i + self.__h_element_count, j : j + self.__v_element_count] |= active
+        return int(np.count_nonzero(kept))
+
+    def __create_topology(self) -> None:
+        fixed_dofs = np.flatnonzero(self.__grid_fixed_dofs)
+        active = self.__get_active_elements()
+        self.__topology = MeshTopology.get(
+            self.__h_element_count,
+            self.__v_element_count,
+            tuple(fixed_dofs.tolist()),
+            None if active is None else np.packbits(active).tobytes(),
+            self.__dof_count,
+        )
+        # Without a corner the plate would be a mechanism; the edges stay supported in part
+        if self.__support == "corners" and np.count_nonzero(self.__topology.fixed_dofs) < len(fixed_dofs):
+            raise ValueError("The cut-outs must not remove the fixed corners")
+        self.__node_coordinates = self.__grid_node_coordinates[self.__topology.grid_nodes]
+        self.__element_connectivity = self.__topology.element_connectivity
+        self.__fixed_nodes = self.__topology.fixed_nodes
+        self.__fixed_dofs = self.__topology.fixed_dofs
+
     def __create_node_list(self) -> None:
-        self.__nodes = []
-        for i, x in enumerate(self.__vector_x):
-            for j, y in enumerate(self.__vector_y):
-                if (
-                    x == 0
-                    and y == 0
-                    or x == 0
-                    and y == self.__height
-                    #or x == self.__width
-                    #and y == 0
-                    or x == self.__width
-                    and y == self.__height
-                ):
-                    node = Node(i * self.__v_node_count + j, x, y, True)
-                else:
-                    node = Node(i * self.__v_node_count + j, x, y)
-                self.__nodes.append(node)
+        self.__nodes = [
+            Node(index, x, y, bool(fixed))
+            for index, ((x, y), fixed) in enumerate(
+                zip(self.__node_coordinates.tolist(), self.__fixed_nodes)
+            )
+        ]
 
     def __create_element_list(self) -> None:
-        self.__elements = []
-        for i in range(self.__h_element_count):
-            for j in range(self.__v_element_count):
-                self.__elements.append(
-                    Element(
-                        (
-                            self.__nodes[i * self.__v_node_count + j],
-                            self.__nodes[i * self.__v_node_count + j + 1],
-                            self.__nodes[(i + 1) * self.__v_node_count + j + 1],
-                            self.__nodes[(i + 1) * self.__v_node_count + j],
-                        )
-                    )
-                )
+        nodes = self.nodes
+        self.__elements = [
+            Element(tuple(nodes[index] for index in element))
+            for element in self.__element_connectivity.tolist()
+        ]
 
     def create_mesh(self) -> None:
         """
@@ -134,78 +351,121 @@ class FEM:
         """
         self.__determine_node_count()
         self.__determine_element_size()
-        self.__set_element_parameters()
+        with _element_parameters_lock:
+            self.__set_element_parameters()
+            element_type = self.__element_type
+            self.__local_stiffness_matrix = element_type.get_local_stiffness_matrix()
+            self.__local_nodal_forces = element_type.get_local_nodal_force_matrix()
+            self.__local_unit_nodal_forces = element_type.get_local_nodal_force_matrix(1.0)
+            self.__local_mass_matrix = element_type.get_local_mass_matrix()
+            self.__local_lumped_mass_matrix = element_type.get_local_mass_matrix(lumped=True)
+            # The geometric stiffness is linear in the stresses: matrices of the unit ones
+            self.__local_geometric_stiffness_matrices = np.array(
+                [element_type.get_local_geometric_stiffness_matrix(*unit) for unit in np.eye(3)]
+            )
+            # Bending moments at the nodes of the element in the order of Element.nodes
+            corners_x = np.array([0, 0, 1, 1]) * Element.width
+            corners_y = np.array([0, 1, 1, 0]) * Element.height
+            self.__local_moment_matrices = Element.get_elasticity_matrix() @ element_type.get_curvature_matrix(
+                corners_x, corners_y, Element.width, Element.height
+            )
         self.__determine_coordinate_vectors()
-        self.__create_node_list()
-        self.__create_element_list()
-
-    def __add_local_stiffness_matrix_to_global(
-        self, nodes: tuple, local_stiffness_matrix: np.ndarray
-    ) -> None:
-        for i in range(Element.NODE_COUNT):
-            for j in range(Element.NODE_COUNT):
-                global_h_slice = slice(
-                    Node.DOF_COUNT * nodes[i].index, Node.DOF_COUNT * (nodes[i].index + 1),
-                )
-                global_v_slice = slice(
-                    Node.DOF_COUNT * nodes[j].index, Node.DOF_COUNT * (nodes[j].index + 1),
-                )
-
-                local_h_slice = slice(Node.DOF_COUNT * i, Node.DOF_COUNT * (i + 1))
-                local_v_slice = slice(Node.DOF_COUNT * j, Node.DOF_COUNT * (j + 1))
-
-                self.__global_stiffness_matrix[
-                    global_h_slice, global_v_slice
-                ] += local_stiffness_matrix[local_h_slice, local_v_slice]
+        self.__create_node_arrays()
+        self.__create_topology()
+        self.__global_stiffness_matrix_size = self.__dof_count * self.__topology.node_count
+        # The lists of nodes and elements are created on the first use
+        self.__nodes = None
+        self.__elements = None
 
     def __create_global_stiffness_matrix(self) -> None:
-        self.__global_stiffness_matrix_size = (
-            Node.DOF_COUNT * self.__h_node_count * self.__v_node_count
-        )
-        self.__global_stiffness_matrix = np.zeros(
-            (self.__global_stiffness_matrix_size, self.__global_stiffness_matrix_size)
-        )
-        for elem in self.__elements:
-            self.__add_local_stiffness_matrix_to_global(
-                elem.nodes, Element.get_local_stiffness_matrix()
-            )
-
-    def __add_local_nodal_forces_to_global(
-        self, nodes: tuple, local_nodal_forces: np.ndarray
-    ) -> None:
-        for i, node in enumerate(nodes):
-            if not node.fixed:
-                nodal_forces_slice = slice(
-                    Node.DOF_COUNT * node.index, Node.DOF_COUNT * (node.index + 1)
-                )
-                local_nodal_forces_slice = slice(Node.DOF_COUNT * i, Node.DOF_COUNT * (i + 1))
-                self.__global_nodal_forces[nodal_forces_slice] += local_nodal_forces[
-                    local_nodal_forces_slice
-                ]
+        self.__global_stiffness_matrix = self.__topology.assemble_dense(self.__local_stiffness_matrix)
 
     def __create_nodal_forces(self) -> None:
-        self.__global_nodal_forces = np.zeros(self.__global_stiffness_matrix_size)
-        for elem in self.__elements:
-            self.__add_local_nodal_forces_to_global(
-                elem.nodes, Element.get_local_nodal_force_matrix()
-            )
+        self.__global_nodal_forces = self.assemble_pressure_load(
+            np.full(len(self.__element_connectivity), float(self.__pressure))
+        )
+        self.__global_nodal_forces[self.__fixed_dofs] = 0
 
     def __add_fixation(self) -> None:
-        for node in self.__nodes:
-            if node.fixed:
-                for j in range(Node.DOF_COUNT):
-                    t = Node.DOF_COUNT * node.index + j
-                    self.__global_stiffness_matrix[t] = 0
-                    self.__global_stiffness_matrix[:, t] = 0
-                    self.__global_stiffness_matrix[t, t] = 1
+        fixed = np.flatnonzero(self.__fixed_dofs)
+        self.__global_stiffness_matrix[fixed] = 0
+        self.__global_stiffness_matrix[:, fixed] = 0
+        self.__global_stiffness_matrix[fixed, fixed] = 1
 
     def __solve_equation(self) -> None:
         self.__solution = np.linalg.solve(
             self.__global_stiffness_matrix, self.__global_nodal_forces
         )
 
+    def __get_sparse_pattern(self) -> SparsePattern:
+        return self.__topology.sparse_pattern
+
+    def __create_sparse_global_stiffness_matrix(self) -> None:
+        self.__global_stiffness_matrix = self.__get_sparse_pattern().assemble(
+            self.__local_stiffness_matrix
+        )
+
+    def __add_sparse_fixation(self) -> None:
+        self.__global_stiffness_matrix = SparsePattern.apply_fixation(
+            self.__global_stiffness_matrix, self.__fixed_dofs
+        )
+
+    @staticmethod
+    def __get_lower_band(matrix: sparse.csr_matrix) -> np.ndarray:
+        # Lower form of scipy.linalg.solveh_banded: band[i - j, j] = matrix[i, j] for i >= j
+        matrix = matrix.tocoo()
+        lower = matrix.row >= matrix.col
+        offsets = matrix.row[lower] - matrix.col[lower]
+        band = np.zeros((offsets.max() + 1, matrix.shape[0]))
+        band[offsets, matrix.col[lower]] = matrix.data[lower]
+        return band
+
+    def __solve_sparse_equation(self) -> None:
+        if self.__solver == "banded":
+            self.__solution = solveh_banded(
+                FEM.__get_lower_band(self.__global_stiffness_matrix),
+                self.__global_nodal_forces,
+                lower=True,
+                check_finite=False,
+            )
+        elif self.__solver == "direct":
+            self.__solution = splu(self.__global_stiffness_matrix.tocsc()).solve(
+                self.__global_nodal_forces
+            )
+        elif self.__solver == "multigrid":
+            self.__solution = MultigridSolver(
+                self.__global_stiffness_matrix,
+                self.__fixed_dofs,
+                self.__h_element_count,
+                self.__v_element_count,
+                self.__element_width,
+                self.__element_height,
+            ).solve(self.__global_nodal_forces)
+
+    def __solve_matrix_free_equation(self) -> None:
+        operator = MatrixFreeOperator(
+            self.__h_element_count,
+            self.__v_element_count,
+            self.__local_stiffness_matrix,
+            self.__fixed_dofs,
+        )
+        if self.__solver == "domain-decomposition":
+            with DomainDecompositionSolver(
+                operator, self.__element_width, self.__element_height, self.__process_count
+            ) as solver:
+                self.__solution = solver.solve(self.__global_nodal_forces)
+        else:
+            self.__solution = MultigridSolver(
+                operator,
+                self.__fixed_dofs,
+                self.__h_element_count,
+                self.__v_element_count,
+                self.__element_width,
+                self.__element_height,
+            ).solve(self.__global_nodal_forces)
+
     def __determine_nodal_deformation(self) -> None:
-        self.__nodes_deformation = self.__solution.reshape(-1, Node.DOF_COUNT)[:, 0]
+        self.__nodes_deformation = self.__solution.reshape(-1, self.__dof_count)[:, 0]
 
     def __solution_processing(self) -> None:
         self.__determine_nodal_deformation()
@@ -215,12 +475,366 @@ class FEM:
         Performs a finite element method calculation.
 
         """
-        self.__create_global_stiffness_matrix()
-        self.__create_nodal_forces()
-        self.__add_fixation()
-        self.__solve_equation()
+        if self.__solver == "dense":
+            self.__create_global_stiffness_matrix()
+            self.__create_nodal_forces()
+            self.__add_fixation()
+            self.__solve_equation()
+        elif self.__solver in ("matrix-free", "domain-decomposition"):
+            self.__create_nodal_forces()
+            self.__solve_matrix_free_equation()
+        else:
+            self.__create_sparse_global_stiffness_matrix()
+            self.__create_nodal_forces()
+            self.__add_sparse_fixation()
+            self.__solve_sparse_equation()
         self.__solution_processing()
 
+    def calculate_modes(self, mode_count: int = 6, lumped: bool = False) -> None:
+        """
+        Calculates the lowest natural frequencies and mode shapes of the plate.
+
+        Only the requested modes are computed: the generalized eigenproblem
+        of the sparse stiffness and mass matrices restricted to the free degrees
+        of freedom is solved by the Lanczos method in the shift-invert mode.
+
+        Parameters
+        ----------
+        mode_count : positive int
+            Number of modes.
+        lumped : bool
+            Determines whether the lumped mass matrix is used instead of
+            the consistent one (see Element.get_local_mass_matrix).
+
+        Raises
+        ------
+        ValueError
+            If the mesh does not have as many free degrees of freedom.
+
+        """
+        free_dofs = ~self.__fixed_dofs
+        if not 0 < mode_count < np.count_nonzero(free_dofs):
+            raise ValueError(
+                "The number of modes must be positive and less than the number of free degrees of freedom"
+            )
+
+        stiffness_matrix = self.assemble_stiffness_matrix()[free_dofs][:, free_dofs]
+        mass_matrix = self.assemble_mass_matrix(lumped)[free_dofs][:, free_dofs]
+
+        # The fixation removes the rigid body motions, so the stiffness matrix is
+        # nonsingular and the modes closest to zero are the lowest ones
+        eigenvalues, eigenvectors = eigsh(
+            stiffness_matrix.tocsc(), mode_count, mass_matrix.tocsc(), sigma=0, which="LM"
+        )
+        order = np.argsort(eigenvalues)
+        self.__natural_frequencies = np.sqrt(np.maximum(eigenvalues[order], 0)) / (2 * np.pi)
+        self.__mode_shapes = np.zeros((mode_count, len(free_dofs)))
+        self.__mode_shapes[:, free_dofs] = eigenvectors[:, order].T
+
+    @property
+    def natural_frequencies(self) -> np.ndarray:
+        """
+        Property that returns the natural frequencies calculated by calculate_modes.
+
+        Returns
+        -------
+        ndarray
+            Natural frequencies in ascending order, in hertz
+            if the parameters are in consistent units.
+
+        """
+        return self.__natural_frequencies
+
+    def get_mode_shape_for_plot(self, mode: int) -> np.ndarray:
+        """
+        Returns the deflections of nodes of a mode shape.
+
+        Parameters
+        ----------
+        mode : non-negative int
+            Index of the mode in the order of natural_frequencies.
+
+        Returns
+        -------
+        ndarray
+            Deflections of nodes in the form of a matrix like
+            get_nodes_deformation_for_plot, scaled so that the largest
+            absolute deflection is 1.
+
+        """
+        return self.__get_shape_for_plot(self.__mode_shapes[mode])
+
+    def calculate_buckling(
+        self, sigma_x: float, sigma_y: float, tau_xy: float = 0.0, mode_count: int = 1
+    ) -> None:
+        """
+        Calculates the lowest buckling factors and modes of the plate under
+        prescribed uniform in-plane stresses (tension is positive): the stresses
+        multiplied by a buckling factor are critical.
+
+        The generalized eigenproblem -K_G x = mu K x (mu = 1 / factor) of the sparse
+        stiffness and geometric stiffness matrices restricted to the free degrees
+        of freedom is solved by the Lanczos method for the largest mu, so the
+        stiffness matrix is factorized once, like in a static calculation.
+
+        Parameters
+        ----------
+        sigma_x : float
+            Normal stress along the x-axis.
+        sigma_y : float
+            Normal stress along the y-axis.
+        tau_xy : float
+            Shear stress.
+        mode_count : positive int
+            Number of modes.
+
+        Raises
+        ------
+        ValueError
+            If the mesh does not have as many free degrees of freedom.
+
+        """
+        free_dofs = ~self.__fixed_dofs
+        if not 0 < mode_count < np.count_nonzero(free_dofs):
+            raise ValueError(
+                "The number of modes must be positive and less than the number of free degrees of freedom"
+            )
+
+        local_matrix = np.tensordot(
+            [sigma_x, sigma_y, tau_xy], self.__local_geometric_stiffness_matrices, axes=1
+        )
+        geometric_matrix = self.__get_sparse_pattern().assemble(local_matrix)[free_dofs][:, free_dofs]
+        stiffness_matrix = self.assemble_stiffness_matrix()[free_dofs][:, free_dofs].tocsc()
+
+        solver = splu(stiffness_matrix)
+        inverse = LinearOperator(stiffness_matrix.shape, solver.solve, dtype=float)
+        eigenvalues, eigenvectors = eigsh(
+            -geometric_matrix, mode_count, stiffness_matrix, which="LA", Minv=inverse
+        )
+        order = np.argsort(eigenvalues)[::-1]
+        # Stresses that only stabilize the plate have no positive factor
+        with np.errstate(divide="ignore"):
+            self.__buckling_factors = np.where(eigenvalues[order] > 0, 1 / eigenvalues[order], np.inf)
+        self.__buckling_modes = np.zeros((mode_count, len(free_dofs)))
+        self.__buckling_modes[:, free_dofs] = eigenvectors[:, order].T
+
+    @property
+    def buckling_factors(self) -> np.ndarray:
+        """
+        Property that returns the buckling factors calculated by calculate_buckling.
+
+        Returns
+        -------
+        ndarray
+            Factors of the stresses in ascending order.
+
+        """
+        return self.__buckling_factors
+
+    def get_buckling_mode_for_plot(self, mode: int) -> np.ndarray:
+        """
+        Returns the deflections of nodes of a buckling mode.
+
+        Parameters
+        ----------
+        mode : non-negative int
+            Index of the mode in the order of buckling_factors.
+
+        Returns
+        -------
+        ndarray
+            Deflections of nodes in the form of a matrix like
+            get_nodes_deformation_for_plot, scaled so that the largest
+            absolute deflection is 1.
+
+        """
+        return self.__get_shape_for_plot(self.__buckling_modes[mode])
+
+    def __get_shape_for_plot(self, vector: np.ndarray) -> np.ndarray:
+        deflections = vector.reshape(-1, self.__dof_count)[:, 0]
+        return self.get_field_for_plot(deflections / deflections[np.argmax(np.abs(deflections))])
+
+    def assemble_stiffness_matrix(self, element_scales: Optional[np.ndarray] = None) -> sparse.csr_matrix:
+        """
+        Assembles the sparse global stiffness matrix.
+
+        Parameters
+        ----------
+        element_scales : ndarray or None
+            Factors of the stiffness matrix of each element in the order of
+            element_connectivity, e.g. the cubes of the relative thicknesses.
+
+        Returns
+        -------
+        csr_matrix
+            Global stiffness matrix without the fixation.
+
+        """
+        return self.__get_sparse_pattern().assemble(self.__local_stiffness_matrix, element_scales)
+
+    @property
+    def sparse_pattern(self) -> SparsePattern:
+        """
+        Property that returns the sparsity pattern of the global matrices.
+
+        Returns
+        -------
+        SparsePattern
+            Pattern of the mesh, shared by the meshes with the same topology.
+
+        """
+        return self.__get_sparse_pattern()
+
+    @property
+    def local_stiffness_matrix(self) -> np.ndarray:
+        """
+        Property that returns the local stiffness matrix of the elements.
+
+        Returns
+        -------
+        ndarray
+            Local stiffness matrix shared by all elements.
+
+        """
+        return self.__local_stiffness_matrix
+
+    def assemble_mass_matrix(self, lumped: bool = False) -> sparse.csr_matrix:
+        """
+        Assembles the sparse global mass matrix.
+
+        Parameters
+        ----------
+        lumped : bool
+            Determines whether the lumped mass matrix is assembled instead of
+            the consistent one (see Element.get_local_mass_matrix).
+
+        Returns
+        -------
+        csr_matrix
+            Global mass matrix without the fixation.
+
+        """
+        return self.__get_sparse_pattern().assemble(
+            self.__local_lumped_mass_matrix if lumped else self.__local_mass_matrix
+        )
+
+    def assemble_pressure_load(self, pressures: np.ndarray) -> np.ndarray:
+        """
+        Assembles the global nodal forces of a pressure that is constant on each element.
+
+        Parameters
+        ----------
+        pressures : ndarray
+            Pressure on each element in the order of element_connectivity.
+
+        Returns
+        -------
+        ndarray
+            Global nodal forces without the fixation.
+
+        """
+        return np.bincount(
+            self.__topology.element_dofs.ravel(),
+            np.outer(pressures, self.__local_unit_nodal_forces).ravel(),
+            minlength=self.__global_stiffness_matrix_size,
+        )
+
+    def get_field_for_plot(self, values: np.ndarray) -> np.ndarray:
+        """
+        Arranges values of nodes like get_nodes_deformation_for_plot.
+
+        Parameters
+        ----------
+        values : ndarray
+            Value of each node in the order of their indices.
+
+        Returns
+        -------
+        ndarray
+            Values of nodes in the form of a matrix of the full mesh;
+            the removed nodes are NaN.
+
+        """
+        grid_values = np.full(self.__h_node_count * self.__v_node_count, np.nan)
+        grid_values[self.__topology.grid_nodes] = values
+        return grid_values.reshape(self.__h_node_count, self.__v_node_count).T
+
+    def estimate_cost(self) -> SolverEstimate:
+        """
+        Estimates the cost of the calculation before the mesh is created.
+
+        Returns
+        -------
+        SolverEstimate
+            Estimated memory and time of the solver with the degrees of freedom
+            of the element and the nodes of the kept elements (see SolverPlanner.estimate).
+
+        Raises
+        ------
+        ValueError
+            If the solver is not estimated by SolverPlanner.
+
+        """
+        return SolverPlanner.estimate(
+            self.__h_element_count,
+            self.__v_element_count,
+            self.__solver,
+            self.__dof_count,
+            self.__kept_node_count,
+        )
+
+    @property
+    def solver(self) -> str:
+        """
+        Property that returns the method of solving the system of equations.
+
+        Returns
+        -------
+        str
+            One of SOLVERS; the chosen one if the "auto" solver was requested.
+
+        """
+        return self.__solver
+
+    @property
+    def element(self) -> str:
+        """
+        Property that returns the finite element of the mesh.
+
+        Returns
+        -------
+        str
+            One of ELEMENTS.
+
+        """
+        return self.__element
+
+    @property
+    def dof_count(self) -> int:
+        """
+        Property that returns the number of degrees of freedom of a node.
+
+        Returns
+        -------
+        positive int
+            Number of degrees of freedom of a node of the element.
+
+        """
+        return self.__dof_count
+
+    @property
+    def support(self) -> str:
+        """
+        Property that returns the support of the plate.
+
+        Returns
+        -------
+        str
+            One of SUPPORTS.
+
+        """
+        return self.__support
+
     @property
     def width(self) -> int:
         """
@@ -247,6 +861,32 @@ class FEM:
         """
         return self.__height
 
+    @property
+    def h_element_count(self) -> int:
+        """
+        Property that returns the number of elements horizontally.
+
+        Returns
+        -------
+        positive int
+            The number of finite elements horizontally.
+
+        """
+        return self.__h_element_count
+
+    @property
+    def v_element_count(self) -> int:
+        """
+        Property that returns the number of elements vertically.
+
+        Returns
+        -------
+        positive int
+            The number of finite elements vertically.
+
+        """
+        return self.__v_element_count
+
     @property
     def nodes(self) -> List[Node]:
         """
@@ -258,6 +898,8 @@ class FEM:
             Nodes of the mesh.
 
         """
+        if self.__nodes is None:
+            self.__create_node_list()
         return self.__nodes
 
     @property
@@ -271,8 +913,139 @@ class FEM:
             Elements of the mesh.
 
         """
+        if self.__elements is None:
+            self.__create_element_list()
         return self.__elements
 
+    @property
+    def node_coordinates(self) -> np.ndarray:
+        """
+        Property that returns coordinates of the nodes of the mesh.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (node count, 2) with the x and y coordinates
+            of the nodes in the order of their indices.
+
+        """
+        return self.__node_coordinates
+
+    @property
+    def element_connectivity(self) -> np.ndarray:
+        """
+        Property that returns the connectivity of the elements of the mesh.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (element count, Element.NODE_COUNT) with
+            the indices of the nodes of each element.
+
+        """
+        return self.__element_connectivity
+
+    @property
+    def grid_nodes(self) -> np.ndarray:
+        """
+        Property that returns the indices of the nodes on the full mesh.
+
+        Returns
+        -------
+        ndarray
+            Index of each node on the mesh without removed elements
+            (see get_field_for_plot).
+
+        """
+        return self.__topology.grid_nodes
+
+    @property
+    def grid_elements(self) -> np.ndarray:
+        """
+        Property that returns the indices of the elements of the full mesh.
+
+        Returns
+        -------
+        ndarray
+            Index in element_connectivity of the element of the i-th column
+            and the j-th row of the full mesh (at i * v_element_count + j),
+            -1 for the removed elements.
+
+        """
+        return self.__topology.grid_elements
+
+    @property
+    def fixed_dofs(self) -> np.ndarray:
+        """
+        Property that returns the fixity of the degrees of freedom of the mesh.
+
+        Returns
+        -------
+        ndarray
+            Boolean array that determines whether each degree of freedom is fixed.
+
+        """
+        return self.__fixed_dofs
+
+    @property
+    def fixed_nodes(self) -> np.ndarray:
+        """
+        Property that returns the fixity of the nodes of the mesh.
+
+        Returns
+        -------
+        ndarray
+            Boolean array that determines whether the deformation of each node is fixed.
+
+        """
+        return self.__fixed_nodes
+
+    @property
+    def nodal_solution(self) -> np.ndarray:
+        """
+        Property that returns the calculated degrees of freedom of nodes.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (node count, dof_count) with the deformation,
+            the rotations about the x-axis and the y-axis of each node and,
+            for the "bfs" element, the twist d2w/dxdy.
+
+        """
+        return self.__solution.reshape(-1, self.__dof_count)
+
+    def get_nodal_moments(self, chunk_size: int = 2 ** 18) -> np.ndarray:
+        """
+        Calculates the bending moments per unit length at the nodes
+        as the averages of those of the adjacent elements.
+
+        Parameters
+        ----------
+        chunk_size : positive int
+            Number of elements processed at once.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (node count, 3) with the moments Mx, My and Mxy.
+
+        """
+        node_count = len(self.__node_coordinates)
+        connectivity = self.__element_connectivity
+        element_dofs = self.__topology.element_dofs
+        sums = np.zeros((node_count, 3))
+        for first in range(0, len(connectivity), chunk_size):
+            chunk = slice(first, first + chunk_size)
+            moments = np.einsum(
+                "nkd,ed->enk", self.__local_moment_matrices, self.__solution[element_dofs[chunk]]
+            )
+            nodes = connectivity[chunk].ravel()
+            for k in range(3):
+                sums[:, k] += np.bincount(nodes, moments[:, :, k].ravel(), minlength=node_count)
+        counts = np.bincount(connectivity.ravel(), minlength=node_count)
+        return sums / np.maximum(counts, 1)[:, np.newaxis]
+
     def get_nodes_deformation_for_plot(self) -> np.ndarray:
         """
         Returns deformations of nodes.
@@ -283,7 +1056,7 @@ class FEM:
             Deformations of nodes in the form of a matrix.
 
         """
-        return self.__nodes_deformation.reshape(self.__h_node_count, self.__v_node_count).T
+        return self.get_field_for_plot(self.__nodes_deformation)
 
     def get_max_node_deformation(self) -> float:
         """
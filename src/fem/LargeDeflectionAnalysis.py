@@ -0,0 +1,304 @@
+"""
+Class that calculates the large deflections of a plate by the
+von Karman theory.
+
+"""
+
+import time
+from typing import Any, Dict, Final, List, Mapping
+
+import numpy as np
+from scipy.sparse.linalg import splu
+
+from src.fem.ConformingElement import ConformingElement
+from src.fem.Element import Element
+from src.fem.FEM import FEM
+from src.fem.SparsePattern import SparsePattern
+
+
+class LargeDeflectionAnalysis:
+    """
+    Calculates the deflection of a plate under a pressure that is too high
+    for the linear theory: the deflection stretches the middle surface, and
+    the membrane forces stiffen the plate (the von Karman theory).
+
+    Every node gets the in-plane displacements u and v after the degrees of
+    freedom of the bending element of the FEM instance; they are interpolated
+    bilinearly. The supports are immovable: the displacement across the edge
+    is fixed at the nodes whose deformation is fixed, and the one along the
+    edge is free (so the supported corners are fixed in both directions).
+
+    The pressure is applied in equal load steps and each step is solved by
+    the modified Newton method: the factorization of the tangent stiffness
+    matrix is reused for the following iterations and load steps while every
+    iteration reduces the residual by the factor REFACTORIZATION_RATIO,
+    and renewed otherwise, so most iterations cost a residual evaluation and
+    a pair of triangular solves. The internal forces and the tangent matrices
+    of all elements are evaluated at once.
+
+    Parameters
+    ----------
+    parameters : dict
+        Keyword arguments for the FEM class (a solver is not needed).
+    step_count : positive int
+        Number of load steps.
+    tolerance : positive float
+        Norm of the residual forces relative to that of the applied ones
+        at which a load step is converged.
+    max_iterations : positive int
+        Maximum number of iterations of a load step.
+    full_newton : bool
+        Determines whether the tangent matrix is factorized in every iteration
+        (the Newton method) instead of being reused.
+
+    Attributes
+    ----------
+    iteration_counts : list of int
+        Number of iterations of each load step.
+    factorization_count : non-negative int
+        Number of factorizations of the tangent matrix.
+    timings : dict
+        Time in seconds spent on the "residual" evaluations, the "assembly"
+        and the "factorization" of the tangent matrices, the "solve" of the
+        systems and in "total".
+
+    Raises
+    ------
+    ArithmeticError
+        If a load step does not converge (see run).
+
+    Class Attributes
+    ----------------
+    REFACTORIZATION_RATIO : positive float
+        Maximum ratio of the residual norms of consecutive iterations
+        with a reused factorization.
+
+    """
+
+    REFACTORIZATION_RATIO: Final = 0.25
+    # Number of the in-plane degrees of freedom of a node
+    __IN_PLANE_DOF_COUNT: Final = 2
+
+    def __init__(
+        self,
+        parameters: Mapping[str, Any],
+        step_count: int = 5,
+        tolerance: float = 1e-8,
+        max_iterations: int = 50,
+        full_newton: bool = False,
+    ) -> None:
+        self.__step_count: Final = step_count
+        self.__tolerance: Final = tolerance
+        self.__max_iterations: Final = max_iterations
+        self.__full_newton: Final = full_newton
+        self.iteration_counts: List[int] = []
+        self.factorization_count = 0
+        self.timings: Dict[str, float] = {}
+
+        self.__fem = FEM(**parameters)
+        self.__fem.create_mesh()
+        young, poisson, thickness = parameters["young"], parameters["poisson"], parameters["thickness"]
+        self.__membrane_rigidity: Final = (
+            young * thickness / (1 - poisson ** 2)
+            * np.array([[1, poisson, 0], [poisson, 1, 0], [0, 0, (1 - poisson) / 2]])
+        )
+
+        # Degrees of freedom of a node: those of the bending element, then u and v
+        bending_dof_count = self.__fem.dof_count
+        self.__dof_count: Final = bending_dof_count + LargeDeflectionAnalysis.__IN_PLANE_DOF_COUNT
+        node_count = len(self.__fem.node_coordinates)
+        connectivity = self.__fem.element_connectivity
+        local_nodes = np.arange(Element.NODE_COUNT)[:, np.newaxis] * self.__dof_count
+        self.__bending_indices: Final = (local_nodes + np.arange(bending_dof_count)).ravel()
+        self.__in_plane_indices: Final = (local_nodes + bending_dof_count + np.arange(2)).ravel()
+        self.__element_dofs: Final = (
+            self.__dof_count * connectivity[:, :, np.newaxis] + np.arange(self.__dof_count)
+        ).reshape(len(connectivity), -1)
+
+        fixed_dofs = np.zeros((node_count, self.__dof_count), dtype=bool)
+        fixed_dofs[:, :bending_dof_count] = self.__fem.fixed_dofs.reshape(node_count, -1)
+        # The supported nodes cannot move across the edges; the corners of the plate cannot move at all
+        x, y = self.__fem.node_coordinates.T
+        fixed_nodes = self.__fem.fixed_nodes
+        fixed_dofs[:, bending_dof_count] = fixed_nodes & ((x == 0) | (x == parameters["width"]))
+        fixed_dofs[:, bending_dof_count + 1] = fixed_nodes & ((y == 0) | (y == parameters["height"]))
+        self.__fixed_dofs: Final = fixed_dofs.ravel()
+        self.__forces: Final = np.zeros((node_count, self.__dof_count))
+        self.__forces[:, :bending_dof_count] = self.__fem.assemble_pressure_load(
+            np.full(len(connectivity), float(parameters["pressure"]))
+        ).reshape(node_count, -1)
+        self.__forces[fixed_dofs] = 0
+        self.__solution = np.zeros(node_count * self.__dof_count)
+
+        width = parameters["width"] / parameters["h_element_count"]
+        height = parameters["height"] / parameters["v_element_count"]
+        element_type = ConformingElement if self.__fem.element == "bfs" else Element
+        x, y, self.__weights = Element.get_quadrature(4, width, height)
+        self.__gradients: Final = element_type.get_shape_function_gradients(x, y, width, height)
+        self.__strain_matrix: Final = LargeDeflectionAnalysis.__get_strain_matrix(x, y, width, height)
+        b, d = self.__strain_matrix, self.__membrane_rigidity
+        self.__in_plane_matrix: Final = np.einsum("q,qki,kl,qlj->ij", self.__weights, b, d, b)
+
+    @staticmethod
+    def __get_strain_matrix(x: np.ndarray, y: np.ndarray, width: float, height: float) -> np.ndarray:
+        # Linear membrane strains (du/dx, dv/dy, du/dy + dv/dx) of the bilinear in-plane displacements
+        # (u and v of each node in the order of Element.nodes) at the points
+        xi, eta = x / width, y / height
+        dx = np.stack((-(1 - eta), -eta, eta, 1 - eta), axis=-1) / width
+        dy = np.stack((-(1 - xi), 1 - xi, xi, -xi), axis=-1) / height
+        matrix = np.zeros(x.shape + (3, 2 * Element.NODE_COUNT))
+        matrix[..., 0, 0::2] = dx
+        matrix[..., 1, 1::2] = dy
+        matrix[..., 2, 0::2] = dy
+        matrix[..., 2, 1::2] = dx
+        return matrix
+
+    def __evaluate(self, solution: np.ndarray):
+        # Slopes, the matrices of the nonlinear strains and the membrane forces at the points of the elements
+        element_solution = solution[self.__element_dofs]
+        bending = element_solution[:, self.__bending_indices]
+        in_plane = element_solution[:, self.__in_plane_indices]
+        slopes = np.einsum("qkj,ej->eqk", self.__gradients, bending)
+        dx, dy = slopes[..., 0], slopes[..., 1]
+        zero = np.zeros_like(dx)
+        # The nonlinear strains are (dx^2 / 2, dy^2 / 2, dx dy),
+        # their derivatives are this matrix times the derivatives of the slopes
+        slope_matrix = np.stack(
+            (np.stack((dx, zero), -1), np.stack((zero, dy), -1), np.stack((dy, dx), -1)), -2
+        )
+        strains = np.einsum("qkj,ej->eqk", self.__strain_matrix, in_plane)
+        strains += np.stack((dx ** 2 / 2, dy ** 2 / 2, dx * dy), axis=-1)
+        return bending, slope_matrix, strains @ self.__membrane_rigidity
+
+    def __get_internal_forces(self, solution: np.ndarray) -> np.ndarray:
+        bending, slope_matrix, forces = self.__evaluate(solution)
+        element_forces = np.empty(self.__element_dofs.shape)
+        element_forces[:, self.__bending_indices] = bending @ self.__fem.local_stiffness_matrix
+        element_forces[:, self.__bending_indices] += np.einsum(
+            "q,qlj,eqkl,eqk->ej", self.__weights, self.__gradients, slope_matrix, forces, optimize=True
+        )
+        element_forces[:, self.__in_plane_indices] = np.einsum(
+            "q,qkj,eqk->ej", self.__weights, self.__strain_matrix, forces, optimize=True
+        )
+        return np.bincount(self.__element_dofs.ravel(), element_forces.ravel(), minlength=len(solution))
+
+    def __assemble_tangent_matrix(self, solution: np.ndarray):
+        _, slope_matrix, forces = self.__evaluate(solution)
+        w, g, d = self.__weights, self.__gradients, self.__membrane_rigidity
+        slope_gradients = np.einsum("eqkl,qlj->eqkj", slope_matrix, g, optimize=True)
+        n_x, n_y, n_xy = forces[..., 0], forces[..., 1], forces[..., 2]
+        stresses = np.stack((np.stack((n_x, n_xy), -1), np.stack((n_xy, n_y), -1)), -2)
+        bending = (
+            self.__fem.local_stiffness_matrix
+            + np.einsum("q,eqki,kl,eqlj->eij", w, slope_gradients, d, slope_gradients, optimize=True)
+            + np.einsum("q,qki,eqkl,qlj->eij", w, g, stresses, g, optimize=True)
+        )
+        coupling = np.einsum("q,qki,kl,eqlj->eij", w, self.__strain_matrix, d, slope_gradients, optimize=True)
+
+        size = self.__element_dofs.shape[1]
+        bending_rows = self.__bending_indices[:, np.newaxis]
+        in_plane_rows = self.__in_plane_indices[:, np.newaxis]
+        matrices = np.zeros((len(forces), size, size))
+        matrices[:, bending_rows, self.__bending_indices] = bending
+        matrices[:, in_plane_rows, self.__bending_indices] = coupling
+        matrices[:, bending_rows, self.__in_plane_indices] = np.swapaxes(coupling, 1, 2)
+        matrices[:, in_plane_rows, self.__in_plane_indices] = self.__in_plane_matrix
+        matrix = self.__fem.sparse_pattern.assemble_elements(matrices)
+        return SparsePattern.apply_fixation(matrix, self.__fixed_dofs).tocsc()
+
+    def __add_time(self, name: str, start: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def run(self) -> None:
+        """
+        Calculates the deflection under the full pressure.
+
+        Raises
+        ------
+        ArithmeticError
+            If a load step does not converge in max_iterations iterations.
+
+        """
+        start = time.perf_counter()
+        forces = self.__forces.ravel()
+        free = ~self.__fixed_dofs
+        solution = np.zeros_like(forces)
+        solver = None
+        self.iteration_counts = []
+        self.factorization_count = 0
+        self.timings = {name: 0.0 for name in ("residual", "assembly", "factorization", "solve")}
+
+        for step in range(1, self.__step_count + 1):
+            applied = forces * step / self.__step_count
+            limit = self.__tolerance * np.linalg.norm(applied)
+            previous_norm = None
+            for iteration in range(self.__max_iterations + 1):
+                timer = time.perf_counter()
+                residual = np.where(free, applied - self.__get_internal_forces(solution), 0)
+                norm = np.linalg.norm(residual)
+                self.__add_time("residual", timer)
+                if norm <= limit:
+                    break
+                if iteration == self.__max_iterations:
+                    raise ArithmeticError("The load step {} did not converge".format(step))
+                if (
+                    solver is None
+                    or self.__full_newton
+                    or previous_norm is not None
+                    and norm > LargeDeflectionAnalysis.REFACTORIZATION_RATIO * previous_norm
+                ):
+                    timer = time.perf_counter()
+                    matrix = self.__assemble_tangent_matrix(solution)
+                    self.__add_time("assembly", timer)
+                    timer = time.perf_counter()
+                    solver = splu(matrix)
+                    self.factorization_count += 1
+                    self.__add_time("factorization", timer)
+                timer = time.perf_counter()
+                solution += solver.solve(residual)
+                self.__add_time("solve", timer)
+                previous_norm = norm
+            self.iteration_counts.append(iteration)
+
+        self.__solution = solution
+        self.__add_time("total", start)
+
+    @property
+    def nodal_solution(self) -> np.ndarray:
+        """
+        Property that returns the calculated degrees of freedom of nodes.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (node count, FEM.dof_count + 2) with the degrees of
+            freedom of the bending element and the in-plane displacements
+            u and v of each node.
+
+        """
+        return self.__solution.reshape(-1, self.__dof_count)
+
+    def get_nodes_deformation_for_plot(self) -> np.ndarray:
+        """
+        Returns deformations of nodes.
+
+        Returns
+        -------
+        ndarray
+            Deformations of nodes in the form of a matrix
+            (see FEM.get_field_for_plot).
+
+        """
+        return self.__fem.get_field_for_plot(self.nodal_solution[:, 0])
+
+    def get_max_node_deformation(self) -> float:
+        """
+        Returns max deformation of nodes.
+
+        Returns
+        -------
+        float
+            Max deformation of nodes.
+
+        """
+        return float(np.max(self.nodal_solution[:, 0]))
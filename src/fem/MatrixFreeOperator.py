@@ -0,0 +1,198 @@
+"""
+Class that applies the global stiffness matrix of a uniform mesh
+without storing it.
+
+"""
+
+from typing import Final, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from scipy import sparse
+
+from src.fem.Element import Element
+from src.fem.MeshTopology import MeshTopology
+from src.fem.Node import Node
+from src.fem.SparsePattern import SparsePattern
+
+
+class MatrixFreeOperator:
+    """
+    Applies the global stiffness matrix (with the fixation applied)
+    of a uniform mesh without storing it.
+
+    All elements share the local stiffness matrix, so the product is
+    computed as a gather of the element degrees of freedom, one batched
+    multiplication by the local matrix and a scatter back to the nodes.
+    On the structured grid the element degrees of freedom are a strided
+    view of the nodal array and the scatter adds slices of it, so no index
+    arrays are stored either: the memory is a few vectors of the size
+    of the system.
+
+    Parameters
+    ----------
+    h_element_count : positive int
+        The number of finite elements horizontally.
+    v_element_count : positive int
+        The number of finite elements vertically.
+    local_stiffness_matrix : ndarray
+        Local stiffness matrix of the elements.
+    fixed_dofs : ndarray
+        Boolean array that determines whether each degree of freedom is fixed.
+
+    Attributes
+    ----------
+    h_element_count : positive int
+        The number of finite elements horizontally.
+    v_element_count : positive int
+        The number of finite elements vertically.
+    fixed_dofs : ndarray
+        Boolean array that determines whether each degree of freedom is fixed.
+
+    """
+
+    # Offsets of the element nodes on the grid in the order of Element.nodes
+    __NODE_OFFSETS: Final = ((0, 0), (0, 1), (1, 1), (1, 0))
+    # Element nodes in the order of the 2 x 2 window of the grid: (0, 0), (0, 1), (1, 0), (1, 1)
+    __WINDOW_NODES: Final = (0, 1, 3, 2)
+
+    def __init__(
+        self,
+        h_element_count: int,
+        v_element_count: int,
+        local_stiffness_matrix: np.ndarray,
+        fixed_dofs: np.ndarray,
+    ) -> None:
+        self.h_element_count: Final = h_element_count
+        self.v_element_count: Final = v_element_count
+        self.fixed_dofs: Final = fixed_dofs
+        self.__local_stiffness_matrix = local_stiffness_matrix
+        self.__grid_shape = (h_element_count + 1, v_element_count + 1, Node.DOF_COUNT)
+
+        window_dofs = (
+            Node.DOF_COUNT * np.array(MatrixFreeOperator.__WINDOW_NODES)[:, np.newaxis]
+            + np.arange(Node.DOF_COUNT)
+        ).ravel()
+        window_matrix = local_stiffness_matrix[np.ix_(window_dofs, window_dofs)]
+        # Columns of the forces on each node of the window, contiguous for the multiplication
+        self.__window_matrices = [
+            np.ascontiguousarray(window_matrix[:, Node.DOF_COUNT * i : Node.DOF_COUNT * (i + 1)])
+            for i in range(Element.NODE_COUNT)
+        ]
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        Property that returns the shape of the matrix.
+
+        Returns
+        -------
+        tuple
+            Number of rows and columns.
+
+        """
+        size = len(self.fixed_dofs)
+        return size, size
+
+    def __node_slice(self, offset: Tuple[int, int]) -> Tuple[slice, slice]:
+        h = self.h_element_count
+        v = self.v_element_count
+        return slice(offset[0], offset[0] + h), slice(offset[1], offset[1] + v)
+
+    def __matmul__(self, u: np.ndarray) -> np.ndarray:
+        free_u = np.where(self.fixed_dofs, 0, u).reshape(self.__grid_shape)
+        strides = free_u.strides
+        element_dofs = as_strided(
+            free_u,
+            (self.h_element_count, self.v_element_count, 2, 2, Node.DOF_COUNT),
+            (strides[0], strides[1], strides[0], strides[1], strides[2]),
+            writeable=False,
+        ).reshape(-1, Element.NODE_COUNT * Node.DOF_COUNT)
+
+        result = np.zeros(self.__grid_shape)
+        for i, window_matrix in enumerate(self.__window_matrices):
+            result[self.__node_slice(divmod(i, 2))] += (element_dofs @ window_matrix).reshape(
+                self.h_element_count, self.v_element_count, Node.DOF_COUNT
+            )
+        result = result.ravel()
+        result[self.fixed_dofs] = u[self.fixed_dofs]
+        return result
+
+    def get_node_blocks(self) -> np.ndarray:
+        """
+        Returns the diagonal blocks of the matrix.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (node count, Node.DOF_COUNT, Node.DOF_COUNT)
+            with the blocks that couple the degrees of freedom of each node.
+
+        """
+        blocks = np.zeros(self.__grid_shape + (Node.DOF_COUNT,))
+        for i, offset in enumerate(MatrixFreeOperator.__NODE_OFFSETS):
+            local_slice = slice(Node.DOF_COUNT * i, Node.DOF_COUNT * (i + 1))
+            blocks[self.__node_slice(offset)] += self.__local_stiffness_matrix[local_slice, local_slice]
+        blocks = blocks.reshape(-1, Node.DOF_COUNT, Node.DOF_COUNT)
+
+        fixed = self.fixed_dofs.reshape(-1, Node.DOF_COUNT)
+        blocks[fixed[:, :, np.newaxis] | fixed[:, np.newaxis, :]] = 0
+        blocks[:, np.arange(Node.DOF_COUNT), np.arange(Node.DOF_COUNT)] += fixed
+        return blocks
+
+    def coarsen(self) -> "MatrixFreeOperator":
+        """
+        Creates the operator of the mesh with half as many elements per side.
+        The element count must be even in both directions.
+
+        Returns
+        -------
+        MatrixFreeOperator
+            Operator of the coarse mesh. A coarse degree of freedom is fixed
+            if the coinciding fine one is fixed.
+
+        """
+        # The same deflection shape on an element twice as large has the energy divided by 4
+        # and the rotations halved: K(2a, 2b) = S K(a, b) S / 4, S = diag(1, 2, 2) per node
+        scales = np.tile([1, 2, 2], Element.NODE_COUNT)
+        local_matrix = self.__local_stiffness_matrix * np.outer(scales, scales) / 4
+        fixed = self.fixed_dofs.reshape(self.__grid_shape)[::2, ::2].ravel()
+        return MatrixFreeOperator(self.h_element_count // 2, self.v_element_count // 2, local_matrix, fixed)
+
+    def get_strip(self, first_column: int, last_column: int) -> "MatrixFreeOperator":
+        """
+        Creates the operator of a strip of the mesh.
+
+        Parameters
+        ----------
+        first_column : non-negative int
+            Index of the first element column of the strip.
+        last_column : positive int
+            Index of the element column that follows the strip.
+
+        Returns
+        -------
+        MatrixFreeOperator
+            Operator of the elements of the columns; its nodes are the node
+            columns from first_column to last_column inclusive.
+
+        """
+        fixed = self.fixed_dofs.reshape(self.__grid_shape)[first_column : last_column + 1].ravel()
+        return MatrixFreeOperator(
+            last_column - first_column, self.v_element_count, self.__local_stiffness_matrix, fixed
+        )
+
+    def assemble(self) -> sparse.csr_matrix:
+        """
+        Assembles the matrix.
+
+        Returns
+        -------
+        csr_matrix
+            Global stiffness matrix with the fixation applied.
+
+        """
+        pattern = MeshTopology.get(
+            self.h_element_count, self.v_element_count, tuple(np.flatnonzero(self.fixed_dofs).tolist())
+        ).sparse_pattern
+        return SparsePattern.apply_fixation(pattern.assemble(self.__local_stiffness_matrix), self.fixed_dofs)
@@ -0,0 +1,312 @@
+"""
+Class that contains the data of a plate mesh that depend only on
+its topology and are shared by all calculations with the same one.
+
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Final, Optional, Tuple
+
+import numpy as np
+
+from src.fem.Element import Element
+from src.fem.Node import Node
+from src.fem.SparsePattern import SparsePattern
+
+
+class MeshTopology:
+    """
+    Topology of a structured plate mesh: the element connectivity,
+    the fixed degrees of freedom and the index arrays of the assembly.
+
+    Only the active elements of the grid are included; the nodes that do
+    not belong to any of them are dropped and the rest are numbered in
+    the order of their indices on the grid, so the inactive regions cost
+    nothing in the assembly and the solution.
+
+    The topology depends only on the element counts, the active elements
+    and the fixed degrees of freedom, not on the dimensions, material or
+    load of the plate, so it is created once per key by get and shared by
+    all FEM instances through an LRU cache: repeated calculations only fill
+    the numeric values of the matrices. The arrays are read-only. The sparse
+    pattern and the dense scatter indices are created on the first use.
+
+    The cache keeps at most CACHE_SIZE topologies whose arrays (see nbytes)
+    take at most CACHE_MEMORY bytes together; the least recently used ones
+    are evicted when a topology is got. The last one is kept whatever its
+    size. The arrays created on the first use are counted from the next get.
+
+    Parameters
+    ----------
+    h_element_count : positive int
+        The number of finite elements horizontally.
+    v_element_count : positive int
+        The number of finite elements vertically.
+    fixed_dofs : tuple
+        Indices of the fixed degrees of freedom on the grid
+        (dof_count * node index on the grid + index of the degree of freedom).
+    active_elements : bytes or None
+        Bits (see np.packbits) that determine whether each element of the grid
+        in the order of its element connectivity is active; all by default.
+    dof_count : positive int
+        Number of degrees of freedom of a node.
+
+    Attributes
+    ----------
+    h_node_count : positive int
+        The number of nodes of the grid horizontally.
+    v_node_count : positive int
+        The number of nodes of the grid vertically.
+    dof_count : positive int
+        Number of degrees of freedom of a node.
+    grid_nodes : ndarray
+        Indices of the nodes on the grid (i * v_node_count + j for the node
+        of the i-th column and the j-th row).
+    grid_elements : ndarray
+        Index of each element of the grid (i * v_element_count + j for the
+        element of the i-th column and the j-th row) in the element
+        connectivity or -1 if the element is inactive.
+    element_connectivity : ndarray
+        Array of shape (element count, Element.NODE_COUNT) with the indices
+        of the nodes of each element.
+    element_dofs : ndarray
+        Array of shape (element count, Element.NODE_COUNT * dof_count)
+        with the indices of the degrees of freedom of each element.
+    fixed_nodes : ndarray
+        Boolean array that determines whether the deformation of each node is fixed.
+    fixed_dofs : ndarray
+        Boolean array that determines whether each degree of freedom is fixed.
+
+    Class Attributes
+    ----------------
+    CACHE_SIZE : positive int
+        Maximum number of topologies kept by get.
+    CACHE_MEMORY : positive int
+        Maximum memory in bytes of the topologies kept by get.
+
+    """
+
+    CACHE_SIZE: Final = 16
+    CACHE_MEMORY: Final = 2 ** 30
+    __cache: "OrderedDict[tuple, MeshTopology]" = OrderedDict()
+    __cache_lock: Final = threading.Lock()
+
+    def __init__(
+        self,
+        h_element_count: int,
+        v_element_count: int,
+        fixed_dofs: Tuple[int, ...],
+        active_elements: Optional[bytes] = None,
+        dof_count: int = Node.DOF_COUNT,
+    ) -> None:
+        self.h_node_count: Final = h_element_count + 1
+        self.v_node_count: Final = v_element_count + 1
+        self.dof_count: Final = dof_count
+        grid_node_count = self.h_node_count * self.v_node_count
+
+        first_nodes = (
+            np.arange(h_element_count)[:, np.newaxis] * self.v_node_count + np.arange(v_element_count)
+        ).ravel()
+        connectivity = np.column_stack(
+            (
+                first_nodes,
+                first_nodes + 1,
+                first_nodes + self.v_node_count + 1,
+                first_nodes + self.v_node_count,
+            )
+        )
+        if active_elements is None:
+            self.grid_nodes: Final = np.arange(grid_node_count)
+            self.grid_elements: Final = np.arange(len(first_nodes))
+        else:
+            mask = np.unpackbits(np.frombuffer(active_elements, dtype=np.uint8), count=len(first_nodes))
+            mask = mask.astype(bool)
+            self.grid_elements: Final = np.full(len(first_nodes), -1)
+            self.grid_elements[mask] = np.arange(np.count_nonzero(mask))
+            connectivity = connectivity[mask]
+            self.grid_nodes: Final = np.unique(connectivity)
+            numbering = np.full(grid_node_count, -1)
+            numbering[self.grid_nodes] = np.arange(len(self.grid_nodes))
+            connectivity = numbering[connectivity]
+
+        self.element_connectivity: Final = connectivity
+        self.element_dofs: Final = (
+            dof_count * connectivity[:, :, np.newaxis] + np.arange(dof_count)
+        ).reshape(len(connectivity), Element.NODE_COUNT * dof_count)
+        grid_fixed_dofs = np.zeros(grid_node_count * dof_count, dtype=bool)
+        grid_fixed_dofs[list(fixed_dofs)] = True
+        self.fixed_dofs: Final = grid_fixed_dofs.reshape(-1, dof_count)[self.grid_nodes].ravel()
+        self.fixed_nodes: Final = self.fixed_dofs[::dof_count]
+        for array in (
+            self.grid_nodes,
+            self.grid_elements,
+            self.element_connectivity,
+            self.element_dofs,
+            self.fixed_nodes,
+            self.fixed_dofs,
+        ):
+            array.flags.writeable = False
+
+        self.__lock = threading.Lock()
+        self.__sparse_pattern: Optional[SparsePattern] = None
+        self.__dense_indices: Optional[np.ndarray] = None
+
+    @staticmethod
+    def get(
+        h_element_count: int,
+        v_element_count: int,
+        fixed_dofs: Tuple[int, ...],
+        active_elements: Optional[bytes] = None,
+        dof_count: int = Node.DOF_COUNT,
+    ) -> "MeshTopology":
+        """
+        Returns the cached topology, creating it if necessary.
+
+        Parameters
+        ----------
+        h_element_count : positive int
+            The number of finite elements horizontally.
+        v_element_count : positive int
+            The number of finite elements vertically.
+        fixed_dofs : tuple
+            Indices of the fixed degrees of freedom on the grid.
+        active_elements : bytes or None
+            Bits that determine whether each element of the grid is active;
+            all by default.
+        dof_count : positive int
+            Number of degrees of freedom of a node.
+
+        Returns
+        -------
+        MeshTopology
+            Shared topology.
+
+        """
+        key = (h_element_count, v_element_count, fixed_dofs, active_elements, dof_count)
+        with MeshTopology.__cache_lock:
+            topology = MeshTopology.__cache.get(key)
+            if topology is not None:
+                MeshTopology.__cache.move_to_end(key)
+                MeshTopology.__evict()
+                return topology
+        # The topology of a large mesh takes a while, so other keys are not blocked meanwhile
+        topology = MeshTopology(*key)
+        with MeshTopology.__cache_lock:
+            topology = MeshTopology.__cache.setdefault(key, topology)
+            MeshTopology.__cache.move_to_end(key)
+            MeshTopology.__evict()
+        return topology
+
+    @staticmethod
+    def __evict() -> None:
+        cache = MeshTopology.__cache
+        memory = sum(topology.nbytes for topology in cache.values())
+        while len(cache) > 1 and (len(cache) > MeshTopology.CACHE_SIZE or memory > MeshTopology.CACHE_MEMORY):
+            _, topology = cache.popitem(last=False)
+            memory -= topology.nbytes
+
+    @staticmethod
+    def clear_cache() -> None:
+        """
+        Removes all topologies from the cache of get.
+
+        """
+        with MeshTopology.__cache_lock:
+            MeshTopology.__cache.clear()
+
+    @staticmethod
+    def get_cache_size() -> Tuple[int, int]:
+        """
+        Determines the size of the cache of get.
+
+        Returns
+        -------
+        tuple
+            Number of cached topologies and their memory in bytes.
+
+        """
+        with MeshTopology.__cache_lock:
+            topologies = list(MeshTopology.__cache.values())
+        return len(topologies), sum(topology.nbytes for topology in topologies)
+
+    @property
+    def node_count(self) -> int:
+        """
+        Property that returns the number of nodes.
+
+        Returns
+        -------
+        positive int
+            Number of nodes of the mesh (without the dropped ones).
+
+        """
+        return len(self.fixed_nodes)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Property that returns the memory of the arrays of the topology.
+
+        Returns
+        -------
+        positive int
+            Number of bytes of the arrays, the sparse pattern and
+            the dense scatter indices created so far.
+
+        """
+        memory = sum(
+            array.nbytes
+            for array in (
+                self.grid_nodes,
+                self.grid_elements,
+                self.element_connectivity,
+                self.element_dofs,
+                self.fixed_nodes,
+                self.fixed_dofs,
+            )
+        )
+        if self.__sparse_pattern is not None:
+            memory += self.__sparse_pattern.nbytes
+        if self.__dense_indices is not None:
+            memory += self.__dense_indices.nbytes
+        return memory
+
+    @property
+    def sparse_pattern(self) -> SparsePattern:
+        """
+        Property that returns the sparsity pattern of the global matrices.
+
+        Returns
+        -------
+        SparsePattern
+            Pattern of the mesh.
+
+        """
+        with self.__lock:
+            if self.__sparse_pattern is None:
+                self.__sparse_pattern = SparsePattern(self.element_connectivity, self.node_count)
+            return self.__sparse_pattern
+
+    def assemble_dense(self, local_matrix: np.ndarray) -> np.ndarray:
+        """
+        Assembles the dense global matrix.
+
+        Parameters
+        ----------
+        local_matrix : ndarray
+            Matrix of an element, the same for all elements.
+
+        Returns
+        -------
+        ndarray
+            Global matrix without the fixation.
+
+        """
+        size = self.dof_count * self.node_count
+        with self.__lock:
+            if self.__dense_indices is None:
+                dofs = self.element_dofs.astype(np.int64)
+                self.__dense_indices = (dofs[:, :, np.newaxis] * size + dofs[:, np.newaxis, :]).ravel()
+        weights = np.tile(local_matrix.ravel(), len(self.element_dofs))
+        return np.bincount(self.__dense_indices, weights, minlength=size * size).reshape(size, size)
@@ -0,0 +1,301 @@
+"""
+Class that solves the plate system by the conjugate gradient method
+preconditioned with a geometric multigrid V-cycle.
+
+"""
+
+import warnings
+from typing import Final, List, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from src.fem.ConjugateGradient import ConjugateGradient
+from src.fem.Element import Element
+from src.fem.MatrixFreeOperator import MatrixFreeOperator
+from src.fem.Node import Node
+
+
+class MultigridSolver:
+    """
+    Solves the plate system by the conjugate gradient method
+    preconditioned with a geometric multigrid V-cycle.
+
+    Uniform meshes are nested when the element counts are halved, so
+    the levels are built by halving the counts while both are even and
+    the system is larger than COARSE_SIZE. The prolongation from a level
+    to the finer one interpolates the coarse degrees of freedom with the
+    element shape functions, the coarse matrices are the Galerkin products
+    P^T A P, the smoother is damped block Jacobi over the nodes, and the
+    coarsest system is factorized. Time and memory grow linearly with
+    the number of degrees of freedom.
+
+    A mesh with an odd element count cannot be halved, so its coarsest
+    level stays larger than COARSE_SIZE (the fine system itself if a count
+    is odd from the start) and its factorization costs as much as the
+    "direct" solver; a RuntimeWarning is issued then. SolverPlanner sizes
+    the coarsest level by get_level_counts as well.
+
+    If the matrix is given as a MatrixFreeOperator, the coarse levels are
+    matrix-free operators of the coarse meshes as well, and only the
+    coarsest one is assembled.
+
+    Parameters
+    ----------
+    matrix : csr_matrix or MatrixFreeOperator
+        Global stiffness matrix with the fixation applied.
+    fixed_dofs : ndarray
+        Boolean array that determines whether each degree of freedom is fixed.
+    h_element_count : positive int
+        The number of finite elements horizontally.
+    v_element_count : positive int
+        The number of finite elements vertically.
+    element_width : positive float
+        Width of element.
+    element_height : positive float
+        Height of element.
+    tolerance : positive float
+        Relative residual norm at which the iterations stop.
+
+    Attributes
+    ----------
+    iterations : non-negative int
+        Number of conjugate gradient iterations of the last solve.
+
+    Class Attributes
+    ----------------
+    COARSE_SIZE : positive int
+        Maximum size of the system that is factorized.
+    SMOOTHING_STEPS : positive int
+        Number of smoothing steps before and after the coarse correction.
+    DAMPING : positive float
+        Damping factor of the Jacobi smoother.
+
+    """
+
+    COARSE_SIZE: Final = 2000
+    SMOOTHING_STEPS: Final = 2
+    DAMPING: Final = 0.6
+
+    def __init__(
+        self,
+        matrix: Union[sparse.csr_matrix, MatrixFreeOperator],
+        fixed_dofs: np.ndarray,
+        h_element_count: int,
+        v_element_count: int,
+        element_width: float,
+        element_height: float,
+        tolerance: float = 1e-10,
+    ) -> None:
+        self.__matrices: List[Union[sparse.csr_matrix, MatrixFreeOperator]] = [matrix]
+        self.__prolongations: List[sparse.csr_matrix] = []
+        self.__restrictions: List[sparse.csr_matrix] = []
+        self.__smoothers: List[np.ndarray] = []
+        self.__cg = ConjugateGradient(tolerance)
+        self.iterations = 0
+
+        fixed = fixed_dofs
+        for h, v in MultigridSolver.get_level_counts(h_element_count, v_element_count)[1:]:
+            prolongation, fixed = MultigridSolver.create_prolongation(
+                h, v, 2 * element_width, 2 * element_height, fixed
+            )
+            if isinstance(self.__matrices[-1], MatrixFreeOperator):
+                coarse = self.__matrices[-1].coarsen()
+            else:
+                coarse = (prolongation.T @ self.__matrices[-1] @ prolongation).tocsr()
+                # The fixed coarse degrees of freedom are excluded from the prolongation
+                coarse = coarse + sparse.diags(fixed.astype(float))
+            self.__prolongations.append(prolongation)
+            self.__restrictions.append(prolongation.T.tocsr())
+            self.__matrices.append(coarse)
+            element_width, element_height = 2 * element_width, 2 * element_height
+
+        for level_matrix in self.__matrices[:-1]:
+            self.__smoothers.append(MultigridSolver.__invert_node_blocks(level_matrix))
+        coarsest = self.__matrices[-1]
+        if coarsest.shape[0] > MultigridSolver.COARSE_SIZE:
+            warnings.warn(
+                "The coarsest multigrid level of the mesh of {}x{} elements has {} degrees of freedom: "
+                "an odd element count stops the coarsening and the level is factorized directly".format(
+                    h_element_count, v_element_count, coarsest.shape[0]
+                ),
+                RuntimeWarning,
+            )
+        if isinstance(coarsest, MatrixFreeOperator):
+            coarsest = coarsest.assemble()
+        self.__coarse_solver = splu(coarsest.tocsc())
+
+    @property
+    def level_count(self) -> int:
+        """
+        Property that returns the number of grid levels.
+
+        Returns
+        -------
+        positive int
+            Number of grid levels including the finest one.
+
+        """
+        return len(self.__matrices)
+
+    @staticmethod
+    def get_level_counts(h_element_count: int, v_element_count: int) -> List[Tuple[int, int]]:
+        """
+        Determines the element counts of the grid levels.
+
+        Parameters
+        ----------
+        h_element_count : positive int
+            The number of finite elements horizontally.
+        v_element_count : positive int
+            The number of finite elements vertically.
+
+        Returns
+        -------
+        list of tuple
+            Horizontal and vertical element counts of each level from the finest one.
+
+        """
+        counts = [(h_element_count, v_element_count)]
+        h, v = counts[-1]
+        while h % 2 == 0 and v % 2 == 0 and Node.DOF_COUNT * (h + 1) * (v + 1) > MultigridSolver.COARSE_SIZE:
+            h, v = h // 2, v // 2
+            counts.append((h, v))
+        return counts
+
+    @staticmethod
+    def create_prolongation(
+        h_element_count: int,
+        v_element_count: int,
+        element_width: float,
+        element_height: float,
+        fine_fixed_dofs: np.ndarray,
+    ) -> Tuple[sparse.csr_matrix, np.ndarray]:
+        """
+        Creates the prolongation from a uniform mesh to the one with twice
+        as many elements per side.
+
+        Parameters
+        ----------
+        h_element_count : positive int
+            The number of coarse finite elements horizontally.
+        v_element_count : positive int
+            The number of coarse finite elements vertically.
+        element_width : positive float
+            Width of coarse element.
+        element_height : positive float
+            Height of coarse element.
+        fine_fixed_dofs : ndarray
+            Boolean array that determines whether each fine degree of freedom is fixed.
+
+        Returns
+        -------
+        tuple
+            Prolongation matrix and the boolean array that determines whether
+            each coarse degree of freedom is fixed (if the coinciding fine one is).
+
+        """
+        h_node_count = h_element_count + 1
+        v_node_count = v_element_count + 1
+        fine_v_node_count = 2 * v_element_count + 1
+
+        # Fine nodes are numbered like the coarse ones: index = i * v_node_count + j
+        i, j = np.meshgrid(
+            np.arange(2 * h_element_count + 1), np.arange(fine_v_node_count), indexing="ij"
+        )
+        i, j = i.ravel(), j.ravel()
+        element_i = np.minimum(i // 2, h_element_count - 1)
+        element_j = np.minimum(j // 2, v_element_count - 1)
+        x = (i - 2 * element_i) * element_width / 2
+        y = (j - 2 * element_j) * element_height / 2
+
+        shape_functions = Element.get_shape_functions(x, y, element_width, element_height)
+        gradients = Element.get_shape_function_gradients(x, y, element_width, element_height)
+        # Rows of the fine degrees of freedom: w, dw/dy, -dw/dx
+        weights = np.stack((shape_functions, gradients[:, 1], -gradients[:, 0]), axis=1)
+
+        first = element_i * v_node_count + element_j
+        element_nodes = np.stack((first, first + 1, first + v_node_count + 1, first + v_node_count), axis=1)
+        columns = (
+            Node.DOF_COUNT * element_nodes[:, :, np.newaxis] + np.arange(Node.DOF_COUNT)
+        ).reshape(-1, Element.NODE_COUNT * Node.DOF_COUNT)
+        rows = Node.DOF_COUNT * (i * fine_v_node_count + j)[:, np.newaxis] + np.arange(Node.DOF_COUNT)
+
+        fine_size = Node.DOF_COUNT * len(i)
+        coarse_size = Node.DOF_COUNT * h_node_count * v_node_count
+        prolongation = sparse.csr_matrix(
+            (
+                weights.ravel(),
+                (
+                    np.repeat(rows, columns.shape[1], axis=1).ravel(),
+                    np.repeat(columns[:, np.newaxis, :], Node.DOF_COUNT, axis=1).ravel(),
+                ),
+            ),
+            shape=(fine_size, coarse_size),
+        )
+        prolongation.data[np.abs(prolongation.data) < 1e-12 * np.abs(prolongation.data).max()] = 0
+
+        # A coarse degree of freedom is fixed if the coinciding fine one is fixed
+        coarse_i, coarse_j = np.meshgrid(np.arange(h_node_count), np.arange(v_node_count), indexing="ij")
+        coinciding = Node.DOF_COUNT * (2 * coarse_i * fine_v_node_count + 2 * coarse_j).ravel()
+        coarse_fixed_dofs = fine_fixed_dofs[
+            (coinciding[:, np.newaxis] + np.arange(Node.DOF_COUNT)).ravel()
+        ]
+
+        free_rows = sparse.diags((~fine_fixed_dofs).astype(float))
+        free_columns = sparse.diags((~coarse_fixed_dofs).astype(float))
+        prolongation = (free_rows @ prolongation @ free_columns).tocsr()
+        prolongation.eliminate_zeros()
+        return prolongation, coarse_fixed_dofs
+
+    @staticmethod
+    def __invert_node_blocks(matrix: Union[sparse.csr_matrix, MatrixFreeOperator]) -> np.ndarray:
+        if isinstance(matrix, MatrixFreeOperator):
+            return np.linalg.inv(matrix.get_node_blocks())
+        node_count = matrix.shape[0] // Node.DOF_COUNT
+        blocks = np.empty((node_count, Node.DOF_COUNT, Node.DOF_COUNT))
+        for a in range(Node.DOF_COUNT):
+            for b in range(Node.DOF_COUNT):
+                blocks[:, a, b] = matrix.diagonal(b - a)[
+                    np.arange(node_count) * Node.DOF_COUNT + min(a, b)
+                ]
+        return np.linalg.inv(blocks)
+
+    def __smooth(self, level: int, x: np.ndarray, b: np.ndarray) -> np.ndarray:
+        inverse_blocks = self.__smoothers[level]
+        for _ in range(MultigridSolver.SMOOTHING_STEPS):
+            residual = (b - self.__matrices[level] @ x).reshape(-1, Node.DOF_COUNT)
+            x = x + MultigridSolver.DAMPING * (inverse_blocks @ residual[:, :, np.newaxis]).ravel()
+        return x
+
+    def __v_cycle(self, level: int, b: np.ndarray) -> np.ndarray:
+        if level == len(self.__matrices) - 1:
+            return self.__coarse_solver.solve(b)
+        x = self.__smooth(level, np.zeros_like(b), b)
+        residual = b - self.__matrices[level] @ x
+        x = x + self.__prolongations[level] @ self.__v_cycle(
+            level + 1, self.__restrictions[level] @ residual
+        )
+        return self.__smooth(level, x, b)
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        Solves the system.
+
+        Parameters
+        ----------
+        b : ndarray
+            Right-hand side.
+
+        Returns
+        -------
+        ndarray
+            Solution.
+
+        """
+        solution = self.__cg.solve(
+            lambda x: self.__matrices[0] @ x, b, lambda r: self.__v_cycle(0, r)
+        )
+        self.iterations = self.__cg.iterations
+        return solution
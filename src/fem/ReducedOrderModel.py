@@ -0,0 +1,356 @@
+"""
+Class of the reduced-order model of the plate deflections that
+answers parameter queries without the finite element calculation.
+
+"""
+
+from typing import Any, Dict, Final, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+from scipy import linalg
+
+from src.fem.Sweep import Sweep
+
+
+class ReducedOrderModel:
+    """
+    Reduced-order model of the plate deflections over the material
+    and load parameters (see PARAMETERS) for a fixed plate and mesh.
+
+    The model is trained on deflections calculated by the finite element
+    method. In the linear plate theory the deflections are proportional
+    to pressure / (young * thickness^3), so the snapshots are divided by
+    that factor; the remaining dependence on the parameters is smooth.
+    The snapshots are compressed by the proper orthogonal decomposition
+    (truncated SVD) and the coefficients of the modes are interpolated
+    with multiquadric radial basis functions with a linear tail over the
+    logarithms of the positive parameters (and the Poisson ratio itself),
+    scaled to the unit cube of the training range. The shape parameter of
+    the basis functions minimizes the leave-one-out error, which is computed
+    for all training points at once by Rippa's formula, among those whose
+    system matrix has a condition number below MAX_CONDITION; the same
+    errors plus the error of the fit at the training points give the error
+    estimate of a query. The nodes removed by cut-outs (NaN) are not part
+    of the snapshots.
+
+    A query is answered by the model when it is inside the training range,
+    the other parameters equal the base ones and the estimated error is
+    within the tolerance; otherwise the plate is calculated.
+
+    Parameters
+    ----------
+    base_parameters : dict
+        Keyword arguments for the FEM class shared by all calculations.
+    tolerance : positive float
+        Maximum estimated relative error of the answers of the model.
+    pod_tolerance : positive float
+        Relative error of the compression of the snapshots.
+
+    Attributes
+    ----------
+    fallback_count : non-negative int
+        Number of queries answered by the finite element calculation.
+
+    Class Attributes
+    ----------------
+    PARAMETERS : tuple
+        Parameters of the FEM class the model can vary.
+    MAX_CONDITION : positive float
+        Maximum condition number of the interpolation system.
+
+    """
+
+    PARAMETERS: Final = ("thickness", "pressure", "young", "poisson")
+    MAX_CONDITION: Final = 1e12
+    # Candidate shape parameters of the basis functions in the scaled coordinates
+    __SHAPE_PARAMETERS: Final = np.logspace(-1, 1, 21)
+
+    def __init__(
+        self, base_parameters: Mapping[str, Any], tolerance: float = 1e-3, pod_tolerance: float = 1e-6
+    ) -> None:
+        self.__base_parameters: Final = dict(base_parameters)
+        self.__tolerance: Final = tolerance
+        self.__pod_tolerance: Final = pod_tolerance
+        self.fallback_count = 0
+
+        self.__names: List[str] = []
+        self.__lower: np.ndarray
+        self.__upper: np.ndarray
+        self.__points: np.ndarray
+        self.__shape_parameter: float
+        self.__weights: np.ndarray
+        self.__mean: np.ndarray
+        self.__basis: np.ndarray
+        self.__field_shape: Tuple[int, ...]
+        self.__valid: np.ndarray
+        self.__loo_errors: np.ndarray
+        self.__truncation_error: float
+        self.__fit_error: float
+        self.__trained = False
+
+    @property
+    def mode_count(self) -> int:
+        """
+        Property that returns the number of modes of the compression.
+
+        Returns
+        -------
+        non-negative int
+            Number of retained modes.
+
+        """
+        return len(self.__basis) if self.__trained else 0
+
+    @property
+    def training_error(self) -> float:
+        """
+        Property that returns the largest leave-one-out relative error.
+
+        Returns
+        -------
+        non-negative float
+            Error of the model at the worst training point when it is
+            predicted from the others.
+
+        """
+        return float(self.__loo_errors.max() + self.__truncation_error + self.__fit_error)
+
+    @staticmethod
+    def __transform(name: str, values: np.ndarray) -> np.ndarray:
+        return values if name == "poisson" else np.log(values)
+
+    @staticmethod
+    def __get_scale(parameters: Mapping[str, Any]) -> float:
+        return parameters["pressure"] / (parameters["young"] * parameters["thickness"] ** 3)
+
+    @staticmethod
+    def sample(
+        base_parameters: Mapping[str, Any],
+        bounds: Mapping[str, Tuple[float, float]],
+        count: int,
+        seed: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Creates the training parameter sets by Latin hypercube sampling:
+        the values of each parameter are evenly spaced from the lower bound to
+        the upper one and are combined with those of the others at random.
+
+        Parameters
+        ----------
+        base_parameters : dict
+            Keyword arguments for the FEM class shared by all calculations.
+        bounds : dict
+            Lower and upper bounds of the varied parameters (see PARAMETERS).
+            The positive parameters are sampled uniformly in the logarithm.
+        count : positive int
+            Number of parameter sets.
+        seed : int or None
+            Seed of the random generator.
+
+        Returns
+        -------
+        list of dict
+            Keyword arguments for the FEM class.
+
+        """
+        random = np.random.RandomState(seed)
+        sets = [dict(base_parameters) for _ in range(count)]
+        for name, (lower, upper) in bounds.items():
+            fractions = random.permutation(count) / max(count - 1, 1)
+            if name == "poisson":
+                values = lower + fractions * (upper - lower)
+            else:
+                values = np.exp(np.log(lower) + fractions * (np.log(upper) - np.log(lower)))
+            for parameters, value in zip(sets, values):
+                parameters[name] = float(value)
+        return sets
+
+    def train(self, parameter_sets: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Calculates the plate for the training parameter sets and builds the model.
+
+        Parameters
+        ----------
+        parameter_sets : iterable of dict
+            Keyword arguments for the FEM class; the parameters that are not
+            in PARAMETERS must equal the base ones.
+
+        Raises
+        ------
+        ValueError
+            If there are fewer than two distinct parameter sets
+            or a parameter set differs from the base one in other parameters.
+        ArithmeticError
+            If the interpolation system is ill-conditioned for all shape
+            parameters (e.g. the training points nearly coincide).
+
+        """
+        parameter_sets = [dict(self.__base_parameters, **parameters) for parameters in parameter_sets]
+        for parameters in parameter_sets:
+            if not self.__is_compatible(parameters):
+                raise ValueError(
+                    "Only the parameters {} can vary".format(", ".join(ReducedOrderModel.PARAMETERS))
+                )
+        self.__names = [
+            name for name in ReducedOrderModel.PARAMETERS
+            if len({parameters[name] for parameters in parameter_sets}) > 1
+        ]
+        if not self.__names:
+            raise ValueError("At least two distinct parameter sets are required")
+
+        records = list(Sweep(parameter_sets, keep_deformation=True))
+        self.__field_shape = records[0].deformation.shape
+        # The nodes removed by cut-outs are NaN in every snapshot
+        self.__valid = ~np.isnan(records[0].deformation.ravel())
+        snapshots = np.array(
+            [
+                record.deformation.ravel()[self.__valid] / ReducedOrderModel.__get_scale(record.parameters)
+                for record in records
+            ]
+        )
+
+        coordinates = np.column_stack(
+            [
+                ReducedOrderModel.__transform(name, np.array([p[name] for p in parameter_sets], dtype=float))
+                for name in self.__names
+            ]
+        )
+        self.__lower, self.__upper = coordinates.min(axis=0), coordinates.max(axis=0)
+        self.__points = (coordinates - self.__lower) / (self.__upper - self.__lower)
+
+        # Proper orthogonal decomposition of the centered snapshots
+        self.__mean = snapshots.mean(axis=0)
+        _, singular_values, basis = np.linalg.svd(snapshots - self.__mean, full_matrices=False)
+        energy = np.cumsum(singular_values[::-1] ** 2)[::-1] / np.sum(snapshots ** 2)
+        mode_count = int(np.count_nonzero(energy > self.__pod_tolerance ** 2))
+        self.__basis = basis[:mode_count]
+        self.__truncation_error = float(np.sqrt(energy[mode_count])) if mode_count < len(energy) else 0.0
+        coefficients = (snapshots - self.__mean) @ self.__basis.T
+
+        snapshot_norms = np.linalg.norm(snapshots, axis=1)
+        count = len(self.__points)
+        best = None
+        for shape_parameter in ReducedOrderModel.__SHAPE_PARAMETERS:
+            matrix = self.__get_system_matrix(shape_parameter)
+            # The leave-one-out errors of an ill-conditioned system are rounding noise
+            if np.linalg.cond(matrix) > ReducedOrderModel.MAX_CONDITION:
+                continue
+            factorization = linalg.lu_factor(matrix)
+            rhs = np.vstack((coefficients, np.zeros((matrix.shape[0] - count, mode_count))))
+            weights = linalg.lu_solve(factorization, rhs)
+            # Rippa: the leave-one-out error at a point is its weight over the diagonal of the inverse
+            inverse_diagonal = np.diag(linalg.lu_solve(factorization, np.eye(len(matrix))[:, :count]))
+            errors = weights[:count] / inverse_diagonal[:, np.newaxis]
+            relative_errors = np.linalg.norm(errors, axis=1) / snapshot_norms
+            # Error of the fit at the training points themselves
+            fit_errors = np.linalg.norm(matrix[:count] @ weights - coefficients, axis=1) / snapshot_norms
+            if best is None or relative_errors.max() < best[0].max():
+                best = (relative_errors, float(fit_errors.max()), shape_parameter, weights)
+        if best is None:
+            raise ArithmeticError("The interpolation is ill-conditioned for all shape parameters")
+        self.__loo_errors, self.__fit_error, self.__shape_parameter, self.__weights = best
+        self.__trained = True
+
+    def __get_kernel(self, points: np.ndarray, shape_parameter: float) -> np.ndarray:
+        distances = np.linalg.norm(points[:, np.newaxis, :] - self.__points[np.newaxis, :, :], axis=-1)
+        return np.sqrt(1 + (shape_parameter * distances) ** 2)
+
+    def __get_system_matrix(self, shape_parameter: float) -> np.ndarray:
+        count, dimension = self.__points.shape
+        tail = np.column_stack((np.ones(count), self.__points))
+        matrix = np.zeros((count + dimension + 1, count + dimension + 1))
+        matrix[:count, :count] = self.__get_kernel(self.__points, shape_parameter)
+        matrix[:count, count:] = tail
+        matrix[count:, :count] = tail.T
+        return matrix
+
+    @staticmethod
+    def __equal(first: Any, second: Any) -> bool:
+        # Array parameters (e.g. element_mask) are compared element-wise
+        if isinstance(first, np.ndarray) or isinstance(second, np.ndarray):
+            return np.array_equal(first, second)
+        return first == second
+
+    def __is_compatible(self, parameters: Mapping[str, Any]) -> bool:
+        return all(
+            ReducedOrderModel.__equal(parameters.get(name), value)
+            for name, value in self.__base_parameters.items()
+            if name not in ReducedOrderModel.PARAMETERS
+        ) and set(parameters) <= set(self.__base_parameters) | set(ReducedOrderModel.PARAMETERS)
+
+    def predict(self, parameters: Mapping[str, Any]) -> Tuple[Optional[np.ndarray], float]:
+        """
+        Predicts the deflections by the model.
+
+        Parameters
+        ----------
+        parameters : dict
+            Keyword arguments for the FEM class; missing ones are the base ones.
+
+        Returns
+        -------
+        tuple
+            Deflections of nodes in the form of a matrix (see
+            FEM.get_nodes_deformation_for_plot) and the estimated relative
+            error, or None and infinity if the parameters are out of the model.
+
+        """
+        parameters = dict(self.__base_parameters, **parameters)
+        if not self.__trained or not self.__is_compatible(parameters):
+            return None, np.inf
+        fixed = [name for name in ReducedOrderModel.PARAMETERS if name not in self.__names]
+        if any(parameters[name] != self.__base_parameters[name] for name in fixed):
+            return None, np.inf
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coordinates = np.array(
+                [ReducedOrderModel.__transform(name, float(parameters[name])) for name in self.__names]
+            )
+        point = (coordinates - self.__lower) / (self.__upper - self.__lower)
+        if not np.all((point >= -1e-9) & (point <= 1 + 1e-9)):
+            return None, np.inf
+
+        distances = np.sqrt(np.square(self.__points - point).sum(axis=1))
+        count = len(distances)
+        coefficients = (
+            np.sqrt(1 + (self.__shape_parameter * distances) ** 2) @ self.__weights[:count]
+            + self.__weights[count]
+            + point @ self.__weights[count + 1 :]
+        )
+        deflections = np.full(self.__valid.shape, np.nan)
+        deflections[self.__valid] = (
+            (self.__mean + coefficients @ self.__basis) * ReducedOrderModel.__get_scale(parameters)
+        )
+
+        # Leave-one-out errors of the training points weighted by the inverse distance
+        if distances.min() < 1e-12:
+            error = self.__loo_errors[np.argmin(distances)]
+        else:
+            weights = 1 / distances ** 2
+            error = weights @ self.__loo_errors / weights.sum()
+        error += self.__truncation_error + self.__fit_error
+        return deflections.reshape(self.__field_shape), float(error)
+
+    def query(self, parameters: Mapping[str, Any]) -> np.ndarray:
+        """
+        Returns the deflections predicted by the model or, if the prediction
+        is not possible or not accurate enough, calculated by the finite
+        element method.
+
+        Parameters
+        ----------
+        parameters : dict
+            Keyword arguments for the FEM class; missing ones are the base ones.
+
+        Returns
+        -------
+        ndarray
+            Deflections of nodes in the form of a matrix
+            (see FEM.get_nodes_deformation_for_plot).
+
+        """
+        deflections, error = self.predict(parameters)
+        if deflections is not None and error <= self.__tolerance:
+            return deflections
+        self.fallback_count += 1
+        return Sweep.solve(dict(self.__base_parameters, **parameters), keep_deformation=True).deformation
@@ -0,0 +1,232 @@
+"""
+Class that writes the mesh and the calculated fields of a plate
+to files of external viewers (ParaView, VisIt).
+
+"""
+
+import os
+from typing import BinaryIO, Callable, Dict, Final, Iterator, List, Tuple
+
+import numpy as np
+
+from src.fem.FEM import FEM
+
+
+# Generator of the consecutive parts of an array of the given shape and type
+ChunkSource = Tuple[Tuple[int, ...], np.dtype, Callable[[], Iterator[np.ndarray]]]
+
+
+class ResultExporter:
+    """
+    Writes the mesh and the fields of nodes of a calculated plate to the
+    VTK XML unstructured grid format (.vtu, raw binary appended data) and to
+    the XDMF format (an .xdmf description with a raw binary .bin file).
+
+    The points are the nodes at z = 0 and the cells are the quadrilateral
+    elements. The fields are "deflection", "displacement" (the deflection
+    as the z component, for warping), "rotation" (the rotations about the
+    x-axis and the y-axis as a vector) and "moment" (Mx, My and Mxy, see
+    FEM.get_nodal_moments). The arrays are written straight from the arrays
+    of the FEM instance in parts of CHUNK_SIZE rows, so the extra memory
+    does not depend on the size of the mesh.
+
+    Parameters
+    ----------
+    fem : FEM
+        Calculated plate.
+
+    Class Attributes
+    ----------------
+    CHUNK_SIZE : positive int
+        Number of rows of an array converted and written at once.
+
+    """
+
+    CHUNK_SIZE: Final = 2 ** 18
+    # Type of the quadrilateral cell of VTK
+    __VTK_QUAD: Final = 9
+
+    def __init__(self, fem: FEM) -> None:
+        self.__fem = fem
+        self.__moments = fem.get_nodal_moments()
+
+    @staticmethod
+    def __iterate(array: np.ndarray, convert: Callable[[np.ndarray], np.ndarray]) -> Iterator[np.ndarray]:
+        for first in range(0, len(array), ResultExporter.CHUNK_SIZE):
+            yield np.ascontiguousarray(convert(array[first : first + ResultExporter.CHUNK_SIZE]))
+
+    def __get_vector_source(self, array: np.ndarray, columns: List[int]) -> ChunkSource:
+        # Vector of three components from the given columns (-1 is zero)
+        def convert(chunk: np.ndarray) -> np.ndarray:
+            vector = np.zeros((len(chunk), 3), dtype="<f8")
+            for component, column in enumerate(columns):
+                if column >= 0:
+                    vector[:, component] = chunk[:, column]
+            return vector
+
+        return (len(array), 3), np.dtype("<f8"), lambda: ResultExporter.__iterate(array, convert)
+
+    def __get_points(self) -> ChunkSource:
+        return self.__get_vector_source(self.__fem.node_coordinates, [0, 1, -1])
+
+    def __get_connectivity(self) -> ChunkSource:
+        connectivity = self.__fem.element_connectivity
+        return (
+            connectivity.shape,
+            np.dtype("<i8"),
+            lambda: ResultExporter.__iterate(connectivity, lambda chunk: chunk.astype("<i8")),
+        )
+
+    def __get_fields(self) -> Dict[str, ChunkSource]:
+        solution = self.__fem.nodal_solution
+        node_count = len(solution)
+        return {
+            "deflection": (
+                (node_count,),
+                np.dtype("<f8"),
+                lambda: ResultExporter.__iterate(solution, lambda chunk: chunk[:, 0].astype("<f8")),
+            ),
+            "displacement": self.__get_vector_source(solution, [-1, -1, 0]),
+            "rotation": self.__get_vector_source(solution, [1, 2, -1]),
+            "moment": self.__get_vector_source(self.__moments, [0, 1, 2]),
+        }
+
+    @staticmethod
+    def __write_chunks(file: BinaryIO, source: ChunkSource) -> None:
+        for chunk in source[2]():
+            file.write(memoryview(chunk).cast("B"))
+
+    @staticmethod
+    def __get_size(source: ChunkSource) -> int:
+        return int(np.prod(source[0])) * source[1].itemsize
+
+    def write_vtu(self, path: str) -> None:
+        """
+        Writes the VTK XML unstructured grid file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the .vtu file.
+
+        """
+        element_count = len(self.__fem.element_connectivity)
+        offsets = (
+            (element_count,),
+            np.dtype("<i8"),
+            lambda: ResultExporter.__iterate(np.arange(1, element_count + 1), lambda chunk: 4 * chunk.astype("<i8")),
+        )
+        types = (
+            (element_count,),
+            np.dtype("u1"),
+            lambda: ResultExporter.__iterate(
+                np.broadcast_to(np.uint8(ResultExporter.__VTK_QUAD), (element_count,)), lambda chunk: chunk
+            ),
+        )
+        fields = self.__get_fields()
+
+        arrays: List[ChunkSource] = []
+        xml: List[str] = []
+        position = 0
+
+        def add(name: str, vtk_type: str, source: ChunkSource) -> str:
+            nonlocal position
+            components = source[0][1] if len(source[0]) > 1 else 1
+            element = (
+                '<DataArray type="{}" Name="{}" NumberOfComponents="{}" format="appended" offset="{}"/>'
+            ).format(vtk_type, name, components, position)
+            arrays.append(source)
+            # Every array is preceded by its size in bytes
+            position += 8 + ResultExporter.__get_size(source)
+            return element
+
+        xml.append('<?xml version="1.0"?>')
+        xml.append(
+            '<VTKFile type="UnstructuredGrid" version="1.0" byte_order="LittleEndian" header_type="UInt64">'
+        )
+        xml.append("<UnstructuredGrid>")
+        xml.append(
+            '<Piece NumberOfPoints="{}" NumberOfCells="{}">'.format(
+                len(self.__fem.node_coordinates), element_count
+            )
+        )
+        xml.append('<PointData Scalars="deflection">')
+        for name, source in fields.items():
+            xml.append(add(name, "Float64", source))
+        xml.append("</PointData>")
+        xml.append("<Points>")
+        xml.append(add("Points", "Float64", self.__get_points()))
+        xml.append("</Points>")
+        xml.append("<Cells>")
+        xml.append(add("connectivity", "Int64", self.__get_connectivity()))
+        xml.append(add("offsets", "Int64", offsets))
+        xml.append(add("types", "UInt8", types))
+        xml.append("</Cells>")
+        xml.append("</Piece>")
+        xml.append("</UnstructuredGrid>")
+
+        with open(path, "wb") as file:
+            file.write("\n".join(xml).encode())
+            file.write(b'\n<AppendedData encoding="raw">\n_')
+            for source in arrays:
+                file.write(np.uint64(ResultExporter.__get_size(source)).astype("<u8").tobytes())
+                ResultExporter.__write_chunks(file, source)
+            file.write(b"\n</AppendedData>\n</VTKFile>\n")
+
+    def write_xdmf(self, path: str) -> None:
+        """
+        Writes the XDMF file and the binary file with its data
+        (the path with the .bin extension instead of the .xdmf one).
+
+        Parameters
+        ----------
+        path : str
+            Path of the .xdmf file.
+
+        """
+        data_path = os.path.splitext(path)[0] + ".bin"
+        data_name = os.path.basename(data_path)
+        element_count = len(self.__fem.element_connectivity)
+        position = 0
+
+        def describe(source: ChunkSource) -> str:
+            nonlocal position
+            number_type = "Int" if source[1].kind == "i" else "Float"
+            item = (
+                '<DataItem Format="Binary" NumberType="{}" Precision="{}" Endian="Little" '
+                'Seek="{}" Dimensions="{}">{}</DataItem>'
+            ).format(
+                number_type,
+                source[1].itemsize,
+                position,
+                " ".join(str(n) for n in source[0]),
+                data_name,
+            )
+            position += ResultExporter.__get_size(source)
+            return item
+
+        points, connectivity, fields = self.__get_points(), self.__get_connectivity(), self.__get_fields()
+        xml = [
+            '<?xml version="1.0"?>',
+            '<Xdmf Version="3.0">',
+            "<Domain>",
+            '<Grid Name="plate" GridType="Uniform">',
+            '<Topology TopologyType="Quadrilateral" NumberOfElements="{}">'.format(element_count),
+            describe(connectivity),
+            "</Topology>",
+            '<Geometry GeometryType="XYZ">',
+            describe(points),
+            "</Geometry>",
+        ]
+        for name, source in fields.items():
+            attribute_type = "Scalar" if len(source[0]) == 1 else "Vector"
+            xml.append('<Attribute Name="{}" AttributeType="{}" Center="Node">'.format(name, attribute_type))
+            xml.append(describe(source))
+            xml.append("</Attribute>")
+        xml += ["</Grid>", "</Domain>", "</Xdmf>", ""]
+
+        with open(data_path, "wb") as file:
+            for source in [connectivity, points] + list(fields.values()):
+                ResultExporter.__write_chunks(file, source)
+        with open(path, "w") as file:
+            file.write("\n".join(xml))
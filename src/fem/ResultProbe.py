@@ -0,0 +1,173 @@
+"""
+Class that reads the calculated deformation at arbitrary points
+and along sections of a plate.
+
+"""
+
+import itertools
+from typing import Final, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.fem.ConformingElement import ConformingElement
+from src.fem.Element import Element
+from src.fem.FEM import FEM
+
+
+class ResultProbe:
+    """
+    Reads the deformation and the rotations of a calculated plate at
+    arbitrary points by the shape functions of its element, so the values
+    between the nodes are those of the finite element solution.
+
+    The mesh is a structured grid, so the element that contains a point
+    is found from the indices of its column and row without a search,
+    and the points are evaluated at once: a probe costs the same on any
+    mesh and a section of thousands of points takes milliseconds.
+
+    Parameters
+    ----------
+    fem : FEM
+        Plate with a created mesh.
+    nodal_solution : ndarray or None
+        Array of shape (node count, n >= fem.dof_count) whose first
+        fem.dof_count columns are the degrees of freedom of the nodes
+        (e.g. LargeDeflectionAnalysis.nodal_solution of the same mesh);
+        the calculated ones of the FEM instance by default.
+
+    Class Attributes
+    ----------------
+    VALUE_COUNT : positive int
+        Number of values at a point: the deformation and the rotations
+        about the x-axis (dw/dy) and the y-axis (-dw/dx), like those of Node.
+
+    """
+
+    VALUE_COUNT: Final = 3
+
+    def __init__(self, fem: FEM, nodal_solution: Optional[np.ndarray] = None) -> None:
+        if nodal_solution is None:
+            nodal_solution = fem.nodal_solution
+        self.__solution: Final = np.asarray(nodal_solution)[:, : fem.dof_count]
+        self.__element_type: Final = ConformingElement if fem.element == "bfs" else Element
+        self.__connectivity: Final = fem.element_connectivity
+        self.__grid_elements: Final = fem.grid_elements
+        self.__width: Final = fem.width
+        self.__height: Final = fem.height
+        self.__h_element_count: Final = fem.h_element_count
+        self.__v_element_count: Final = fem.v_element_count
+        self.__element_width: Final = fem.width / fem.h_element_count
+        self.__element_height: Final = fem.height / fem.v_element_count
+
+    @staticmethod
+    def __get_cells(coordinates: np.ndarray, size: float, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        # Indices of the cells of the grid on both sides of the coordinates (the same cell twice
+        # unless a coordinate is on a line of the grid); the far edge belongs to the last cell
+        cells = coordinates / size
+        return (
+            np.clip(np.floor(cells), 0, count - 1).astype(int),
+            np.clip(np.ceil(cells) - 1, 0, count - 1).astype(int),
+        )
+
+    def locate(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Finds the elements that contain points.
+
+        Parameters
+        ----------
+        x : ndarray
+            X-axis coordinates of the points.
+        y : ndarray
+            Y-axis coordinates of the points.
+
+        Returns
+        -------
+        tuple of ndarray
+            Index of the element of each point in fem.element_connectivity
+            (-1 for the points outside the plate or in the removed elements)
+            and the coordinates of the points relative to the first node
+            of the element.
+
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        inside = (x >= 0) & (x <= self.__width) & (y >= 0) & (y <= self.__height)
+        column_candidates = ResultProbe.__get_cells(
+            np.where(inside, x, 0), self.__element_width, self.__h_element_count
+        )
+        row_candidates = ResultProbe.__get_cells(
+            np.where(inside, y, 0), self.__element_height, self.__v_element_count
+        )
+
+        # A point on a line of the grid is placed in the first active element that contains it
+        elements = np.full(x.shape, -1)
+        columns = np.zeros(x.shape, dtype=int)
+        rows = np.zeros(x.shape, dtype=int)
+        for column, row in itertools.product(column_candidates, row_candidates):
+            candidates = self.__grid_elements[column * self.__v_element_count + row]
+            found = inside & (elements < 0) & (candidates >= 0)
+            elements[found] = candidates[found]
+            columns[found] = column[found]
+            rows[found] = row[found]
+        return elements, x - columns * self.__element_width, y - rows * self.__element_height
+
+    def probe(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Interpolates the deformation and the rotations at points.
+
+        Parameters
+        ----------
+        x : ndarray
+            X-axis coordinates of the points.
+        y : ndarray
+            Y-axis coordinates of the points.
+
+        Returns
+        -------
+        ndarray
+            Array of shape x.shape + (VALUE_COUNT,) with the deformation and
+            the rotations at each point; NaN outside the plate and in the
+            removed elements.
+
+        """
+        elements, local_x, local_y = self.locate(x, y)
+        values = np.full(elements.shape + (ResultProbe.VALUE_COUNT,), np.nan)
+        found = elements >= 0
+        if not np.any(found):
+            return values
+
+        local_x, local_y = local_x[found], local_y[found]
+        dofs = self.__solution[self.__connectivity[elements[found]]].reshape(len(local_x), -1)
+        width, height = self.__element_width, self.__element_height
+        functions = self.__element_type.get_shape_functions(local_x, local_y, width, height)
+        gradients = self.__element_type.get_shape_function_gradients(local_x, local_y, width, height)
+        slopes = np.einsum("pkj,pj->pk", gradients, dofs)
+        values[found] = np.column_stack((np.einsum("pj,pj->p", functions, dofs), slopes[:, 1], -slopes[:, 0]))
+        return values
+
+    def get_profile(
+        self, start: Sequence[float], end: Sequence[float], point_count: int = 200
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Interpolates the deformation and the rotations along a straight section.
+
+        Parameters
+        ----------
+        start : sequence of float
+            Coordinates of the start of the section.
+        end : sequence of float
+            Coordinates of the end of the section.
+        point_count : int
+            Number of equally spaced points (at least 2, the ends included).
+
+        Returns
+        -------
+        tuple of ndarray
+            Distances of the points from the start and an array of shape
+            (point_count, VALUE_COUNT) with the values at them (see probe).
+
+        """
+        start = np.asarray(start, dtype=float)
+        end = np.asarray(end, dtype=float)
+        fractions = np.linspace(0, 1, point_count)
+        points = start + np.multiply.outer(fractions, end - start)
+        return fractions * np.linalg.norm(end - start), self.probe(points[:, 0], points[:, 1])
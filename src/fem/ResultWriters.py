@@ -0,0 +1,272 @@
+"""
+Classes that write sweep result records to files incrementally.
+
+"""
+
+import csv
+import json
+import numbers
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.fem.Sweep import SweepResult
+
+
+def _encode_json(value: Any) -> Any:
+    # Values that the json module does not serialize itself
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError("The value {!r} cannot be written to JSON".format(value))
+
+
+def _check_parameters(columns: List[str], parameters: Dict[str, Any]) -> None:
+    # The columns are fixed by the first record
+    missing = [name for name in columns if name not in parameters]
+    unexpected = [name for name in parameters if name not in columns]
+    if missing or unexpected:
+        raise ValueError(
+            "The parameters of the record do not match the columns {}: missing {}, unexpected {}".format(
+                columns, missing, unexpected
+            )
+        )
+
+
+class CsvResultWriter:
+    """
+    Appends the scalar part of result records (parameters and max
+    deformation) to a CSV file, one row per record.
+
+    The columns are the parameters of the first record; the later records
+    must have the same ones. Numbers, strings, booleans and None are
+    written as they are, the other values (e.g. the cut-outs or the
+    element mask) as JSON, so that arrays are written in full.
+
+    Parameters
+    ----------
+    path : str
+        Path to the CSV file.
+
+    """
+
+    def __init__(self, path: str) -> None:
+        self.__file = open(path, "w", newline="")
+        self.__writer = csv.writer(self.__file)
+        self.__columns: Optional[List[str]] = None
+
+    def write(self, record: SweepResult) -> None:
+        """
+        Writes one record.
+
+        Parameters
+        ----------
+        record : SweepResult
+            Result of one calculation.
+
+        Raises
+        ------
+        ValueError
+            If the parameters differ from those of the first record.
+
+        """
+        if self.__columns is None:
+            self.__columns = list(record.parameters)
+            self.__writer.writerow(self.__columns + ["max_deformation"])
+        _check_parameters(self.__columns, record.parameters)
+        self.__writer.writerow(
+            [CsvResultWriter.__to_cell(record.parameters[name]) for name in self.__columns]
+            + [CsvResultWriter.__to_cell(record.max_deformation)]
+        )
+
+    @staticmethod
+    def __to_cell(value: Any) -> Any:
+        if isinstance(value, np.generic):
+            value = value.item()
+        if value is None or isinstance(value, (numbers.Number, str)):
+            return value
+        return json.dumps(value, default=_encode_json)
+
+    def close(self) -> None:
+        """
+        Closes the file.
+
+        """
+        self.__file.close()
+
+    def __enter__(self) -> "CsvResultWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class ColumnarResultWriter:
+    """
+    Writes result records to a directory with one raw binary file
+    per column, so that each column can be read back without parsing
+    the others.
+
+    Numeric columns are stored as float64. The other parameters (e.g.
+    the solver, the cut-outs or the element mask) are stored as JSON, one
+    line per row, in "<name>.jsonl"; the kind of a column is determined by
+    its value in the first record, and the later records must have the
+    same parameters of the same kinds. Deformations of nodes, if the records
+    contain them, are stored flattened one after another in
+    "deformation.bin" with their offsets and shapes kept in the
+    "deformation_offset", "deformation_rows" and "deformation_columns"
+    columns, which are NaN for the records without them. The list of
+    columns, the JSON ones and the number of rows are written to
+    "schema.json" when the writer is closed.
+
+    Parameters
+    ----------
+    directory : str
+        Path to the output directory.
+
+    """
+
+    SCHEMA_FILE = "schema.json"
+    FIELD_FILE = "deformation.bin"
+
+    def __init__(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.__directory = directory
+        self.__files: Dict[str, object] = {}
+        self.__columns: Optional[List[str]] = None
+        self.__json_columns: List[str] = []
+        self.__row_count = 0
+        self.__field_offset = 0
+
+    def __append(self, name: str, values: np.ndarray) -> None:
+        if name not in self.__files:
+            self.__files[name] = open(os.path.join(self.__directory, name + ".bin"), "wb")
+        self.__files[name].write(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+
+    def __append_json(self, name: str, value: Any) -> None:
+        if name not in self.__files:
+            self.__files[name] = open(os.path.join(self.__directory, name + ".jsonl"), "w")
+        self.__files[name].write(json.dumps(value, default=_encode_json) + "\n")
+
+    def __write_offset(self, offset: float, rows: float, columns: float) -> None:
+        self.__append("deformation_offset", offset)
+        self.__append("deformation_rows", rows)
+        self.__append("deformation_columns", columns)
+
+    def write(self, record: SweepResult) -> None:
+        """
+        Writes one record.
+
+        Parameters
+        ----------
+        record : SweepResult
+            Result of one calculation.
+
+        Raises
+        ------
+        ValueError
+            If the parameters differ from those of the first record or
+            a numeric parameter is not a number.
+
+        """
+        if self.__columns is None:
+            self.__columns = list(record.parameters) + ["max_deformation"]
+            self.__json_columns = [
+                name
+                for name, value in record.parameters.items()
+                if not ColumnarResultWriter.__is_number(value)
+            ]
+        _check_parameters(self.__columns[:-1], record.parameters)
+        # Nothing is written before the whole record is checked, so the columns stay aligned
+        for name in self.__columns[:-1]:
+            value = record.parameters[name]
+            if name not in self.__json_columns and not ColumnarResultWriter.__is_number(value):
+                raise ValueError("The column {} is numeric, but the record has {!r}".format(name, value))
+        for name in self.__columns[:-1]:
+            if name in self.__json_columns:
+                self.__append_json(name, record.parameters[name])
+            else:
+                self.__append(name, record.parameters[name])
+        self.__append("max_deformation", record.max_deformation)
+
+        if record.deformation is not None:
+            if "deformation_offset" not in self.__files:
+                # The records written before the first field have none
+                for _ in range(self.__row_count):
+                    self.__write_offset(np.nan, np.nan, np.nan)
+            self.__write_offset(self.__field_offset, *record.deformation.shape)
+            self.__append("deformation", record.deformation)
+            self.__field_offset += record.deformation.size
+        elif "deformation_offset" in self.__files:
+            self.__write_offset(np.nan, np.nan, np.nan)
+
+        self.__row_count += 1
+
+    @staticmethod
+    def __is_number(value: Any) -> bool:
+        return isinstance(value, numbers.Real) and not isinstance(value, (bool, np.bool_))
+
+    def close(self) -> None:
+        """
+        Closes the column files and writes the schema.
+
+        """
+        for file in self.__files.values():
+            file.close()
+        schema = {
+            "row_count": self.__row_count,
+            "columns": self.__columns or [],
+            "json_columns": self.__json_columns,
+            "field": "deformation" in self.__files,
+        }
+        with open(os.path.join(self.__directory, ColumnarResultWriter.SCHEMA_FILE), "w") as file:
+            json.dump(schema, file)
+
+    def __enter__(self) -> "ColumnarResultWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def read(directory: str) -> Dict[str, np.ndarray]:
+        """
+        Opens the columns written by the writer as memory-mapped arrays.
+
+        Parameters
+        ----------
+        directory : str
+            Path to the directory with the columns.
+
+        Returns
+        -------
+        dict
+            Columns by name; the JSON columns are object arrays of the
+            decoded values. If the records contained deformations of
+            nodes, the "deformation" entry is the flat array of all fields
+            (see the class description).
+
+        """
+        with open(os.path.join(directory, ColumnarResultWriter.SCHEMA_FILE)) as file:
+            schema = json.load(file)
+
+        json_columns = schema.get("json_columns", [])
+        names = [name for name in schema["columns"] if name not in json_columns]
+        if schema["field"]:
+            names += ["deformation_offset", "deformation_rows", "deformation_columns", "deformation"]
+
+        columns = {}
+        for name in json_columns:
+            with open(os.path.join(directory, name + ".jsonl")) as file:
+                values = [json.loads(line) for line in file]
+            columns[name] = np.empty(len(values), dtype=object)
+            columns[name][:] = values
+        for name in names:
+            path = os.path.join(directory, name + ".bin")
+            if os.path.getsize(path) == 0:
+                columns[name] = np.zeros(0)
+            else:
+                columns[name] = np.memmap(path, dtype=np.float64, mode="r")
+        return columns
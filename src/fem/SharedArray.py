@@ -0,0 +1,253 @@
+"""
+Class of NumPy arrays in shared memory that are passed between
+processes without copying.
+
+"""
+
+import os
+import sys
+import threading
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Final, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+class SharedArrayHandle(NamedTuple):
+    """
+    Description of a shared array sufficient to attach to it.
+
+    Attributes
+    ----------
+    name : str
+        Name of the shared memory block.
+    shape : tuple
+        Shape of the array.
+    dtype : str
+        Data type of the array.
+
+    """
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class SharedArray:
+    """
+    NumPy array in a shared memory block.
+
+    The process that creates the array owns the block: the block is
+    unlinked when the last reference of the owner is released (see acquire
+    and release). Other processes attach to the block by its handle and
+    get a view of the same memory; releasing their references only closes
+    the block for them. A copy of the array inherited by a forked process
+    does not own the block either, and the processes that attach without
+    the ownership do not register the block with their resource tracker,
+    which would unlink it when they exit. Pickling a shared array pickles its handle, so
+    passing it to a worker process attaches the worker to the same memory
+    instead of copying the data.
+
+    Ownership can be passed to another process: the creator disowns the
+    array and returns its handle, the receiver attaches with owner=True.
+
+    Parameters
+    ----------
+    shape : tuple or int
+        Shape of the array.
+    dtype : data-type
+        Data type of the array.
+
+    """
+
+    # Registration with the resource tracker is switched off while a block is attached
+    __tracker_lock: Final = threading.Lock()
+
+    def __init__(self, shape, dtype=np.float64) -> None:
+        shape = tuple(int(n) for n in np.atleast_1d(shape))
+        dtype = np.dtype(dtype)
+        with SharedArray.__tracker_lock:
+            memory = SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+        self.__setup(memory, shape, dtype, True)
+
+    def __setup(self, memory: SharedMemory, shape: Tuple[int, ...], dtype: np.dtype, owner: bool) -> None:
+        self.__owner = owner
+        self.__owner_pid = os.getpid()
+        self.__memory: Optional[SharedMemory] = memory
+        self.__handle = SharedArrayHandle(memory.name, shape, dtype.str)
+        self.__array: Optional[np.ndarray] = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+        self.__reference_count = 1
+
+    @staticmethod
+    def publish(array: np.ndarray) -> "SharedArray":
+        """
+        Creates a shared array with a copy of the data.
+
+        Parameters
+        ----------
+        array : array_like
+            Data of the array.
+
+        Returns
+        -------
+        SharedArray
+            Owned shared array.
+
+        """
+        array = np.asarray(array)
+        shared = SharedArray(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    @staticmethod
+    def attach(handle: SharedArrayHandle, owner: bool = False) -> "SharedArray":
+        """
+        Attaches to the shared array created by another process.
+
+        Parameters
+        ----------
+        handle : SharedArrayHandle
+            Handle of the array.
+        owner : bool
+            Determines whether the ownership of the array is taken over
+            (it must be disowned by its creator).
+
+        Returns
+        -------
+        SharedArray
+            Shared array viewing the same memory.
+
+        """
+        shared = SharedArray.__new__(SharedArray)
+        memory = SharedArray.__open(handle.name, owner)
+        shared.__setup(memory, tuple(handle.shape), np.dtype(handle.dtype), owner)
+        return shared
+
+    @staticmethod
+    def __open(name: str, track: bool) -> SharedMemory:
+        if track or os.name != "posix":
+            return SharedMemory(name)
+        if sys.version_info >= (3, 13):
+            return SharedMemory(name, track=False)
+        # Earlier versions always register the block, and the tracker of an
+        # unrelated process would unlink it when the process exits
+        with SharedArray.__tracker_lock:
+            register = resource_tracker.register
+            resource_tracker.register = lambda name, rtype: None
+            try:
+                return SharedMemory(name)
+            finally:
+                resource_tracker.register = register
+
+    @property
+    def owner(self) -> bool:
+        """
+        Property that returns whether the block is unlinked when the array is released.
+
+        Returns
+        -------
+        bool
+            True if this process owns the block.
+
+        """
+        return self.__owner and self.__owner_pid == os.getpid()
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        Property that returns the view of the shared memory.
+
+        Returns
+        -------
+        ndarray
+            Array in the shared memory.
+
+        Raises
+        ------
+        ValueError
+            If the array is released.
+
+        """
+        if self.__array is None:
+            raise ValueError("Shared array is released")
+        return self.__array
+
+    @property
+    def handle(self) -> SharedArrayHandle:
+        """
+        Property that returns the handle to attach to the array.
+
+        Returns
+        -------
+        SharedArrayHandle
+            Handle of the array.
+
+        """
+        return self.__handle
+
+    def acquire(self) -> "SharedArray":
+        """
+        Adds a reference to the array.
+
+        Returns
+        -------
+        SharedArray
+            The array itself.
+
+        """
+        if self.__memory is None:
+            raise ValueError("Shared array is released")
+        self.__reference_count += 1
+        return self
+
+    def release(self) -> None:
+        """
+        Removes a reference to the array. When the last one is removed,
+        the memory is closed and, if the array is owned, unlinked.
+        Views of the array must not be used after that.
+
+        """
+        if self.__memory is None:
+            return
+        self.__reference_count -= 1
+        if self.__reference_count > 0:
+            return
+        self.__array = None
+        self.__memory.close()
+        if self.owner:
+            self.__memory.unlink()
+        self.__memory = None
+
+    def disown(self) -> SharedArrayHandle:
+        """
+        Gives up the ownership of the array, so that the process that
+        attaches to it with owner=True is responsible for unlinking it.
+
+        Returns
+        -------
+        SharedArrayHandle
+            Handle of the array.
+
+        Raises
+        ------
+        ValueError
+            If the array is released.
+
+        """
+        if self.__memory is None:
+            raise ValueError("Shared array is released")
+        if self.owner and os.name == "posix":
+            # The resource tracker of this process would unlink the block when it exits
+            resource_tracker.unregister("/" + self.__handle.name.lstrip("/"), "shared_memory")
+        self.__owner = False
+        return self.__handle
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+    def __reduce__(self):
+        return SharedArray.attach, (self.__handle,)
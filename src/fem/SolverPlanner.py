@@ -0,0 +1,292 @@
+"""
+Class that estimates the memory and time of the methods of solving
+the plate system and chooses one before any work is done.
+
+"""
+
+import math
+import os
+from typing import Final, List, NamedTuple, Optional, Sequence
+
+from src.fem.MultigridSolver import MultigridSolver
+from src.fem.Node import Node
+
+
+class SolverEstimate(NamedTuple):
+    """
+    Estimated cost of solving the plate system by one method.
+
+    Attributes
+    ----------
+    solver : str
+        Method of solving the system of equations (see FEM.SOLVERS).
+    memory : int
+        Peak memory in bytes.
+    time : float
+        Time of the mesh creation and the calculation in seconds.
+    system_size : positive int
+        Number of degrees of freedom of the system.
+
+    """
+
+    solver: str
+    memory: int
+    time: float
+    system_size: int
+
+
+class SolverPlanner:
+    """
+    Estimates the memory and time of the methods of solving the plate
+    system from the element counts, the degrees of freedom of a node and
+    the number of nodes (fewer than those of the full grid if elements are
+    removed) and chooses the fastest method whose memory fits the budget.
+
+    The estimates follow the asymptotic costs of the methods (n is the
+    number of degrees of freedom, b is the half-bandwidth of the matrix):
+    the dense LU decomposition needs n^2 memory and n^3 time, the banded
+    Cholesky decomposition n * b and n * b^2, the sparse LU decomposition
+    of a two-dimensional mesh about n * log(n) and n^1.5, the multigrid
+    and matrix-free methods are linear in n plus the sparse LU decomposition
+    of their coarsest level, which is the whole system if an element count
+    is odd (see MultigridSolver.get_level_counts). The coefficients were measured
+    on a single core; the times on other machines differ by a common
+    factor, which does not change the choice.
+
+    Parameters
+    ----------
+    memory_budget : positive int or None
+        Memory in bytes available for the calculation; the available
+        physical memory by default (no limit if it is unknown).
+
+    Class Attributes
+    ----------------
+    SOLVERS : tuple
+        Methods the planner chooses from (the "domain-decomposition"
+        method uses several processes and is only chosen explicitly).
+
+    """
+
+    SOLVERS: Final = ("dense", "banded", "direct", "multigrid", "matrix-free")
+    # Memory of the interpreter and the libraries that does not depend on the mesh
+    __BASE_MEMORY: Final = 6e6
+
+    def __init__(self, memory_budget: Optional[int] = None) -> None:
+        self.memory_budget: Final = (
+            SolverPlanner.get_available_memory() if memory_budget is None else memory_budget
+        )
+
+    @staticmethod
+    def get_available_memory() -> Optional[int]:
+        """
+        Returns the available physical memory.
+
+        Returns
+        -------
+        int or None
+            Available memory in bytes or None if it is unknown.
+
+        """
+        try:
+            return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        except (AttributeError, ValueError, OSError):
+            return None
+
+    @staticmethod
+    def estimate(
+        h_element_count: int,
+        v_element_count: int,
+        solver: str,
+        dof_count: int = Node.DOF_COUNT,
+        node_count: Optional[int] = None,
+    ) -> SolverEstimate:
+        """
+        Estimates the cost of solving the plate system by a method.
+
+        Parameters
+        ----------
+        h_element_count : positive int
+            The number of finite elements horizontally.
+        v_element_count : positive int
+            The number of finite elements vertically.
+        solver : str
+            Method of solving the system of equations (one of SOLVERS).
+        dof_count : positive int
+            Number of degrees of freedom of a node (see FEM.dof_count).
+        node_count : positive int or None
+            Number of nodes of the kept elements; all nodes of the grid by default.
+
+        Returns
+        -------
+        SolverEstimate
+            Estimated memory and time.
+
+        Raises
+        ------
+        ValueError
+            If the method is unknown.
+
+        """
+        if node_count is None:
+            node_count = (h_element_count + 1) * (v_element_count + 1)
+        n = dof_count * node_count
+        # Nodes are numbered along the vertical lines of the mesh
+        bandwidth = dof_count * (v_element_count + 2) + 2
+        if solver == "dense":
+            memory, time = 16.5 * n ** 2, 1.6e-11 * n ** 3
+        elif solver == "banded":
+            memory, time = 8 * n * (bandwidth + 1) + 1000 * n, 3e-11 * n * bandwidth ** 2 + 3e-6 * n
+        elif solver == "direct":
+            memory, time = 480 * n * math.log2(n) + 300 * n, 3e-7 * n ** 1.5
+        elif solver in ("multigrid", "matrix-free"):
+            memory, time = (1400 * n, 2e-5 * n) if solver == "multigrid" else (800 * n, 1.4e-5 * n)
+            # The coarsest level is factorized
+            coarse_counts = MultigridSolver.get_level_counts(h_element_count, v_element_count)[-1]
+            coarse = SolverPlanner.estimate(*coarse_counts, "direct", dof_count)
+            memory += coarse.memory - SolverPlanner.__BASE_MEMORY
+            time += coarse.time
+        else:
+            raise ValueError("Unknown solver: {}".format(solver))
+        return SolverEstimate(solver, int(memory + SolverPlanner.__BASE_MEMORY), time, n)
+
+    def estimate_all(
+        self,
+        h_element_count: int,
+        v_element_count: int,
+        solvers: Sequence[str] = SOLVERS,
+        dof_count: int = Node.DOF_COUNT,
+        node_count: Optional[int] = None,
+    ) -> List[SolverEstimate]:
+        """
+        Estimates the costs of the methods.
+
+        Parameters
+        ----------
+        h_element_count : positive int
+            The number of finite elements horizontally.
+        v_element_count : positive int
+            The number of finite elements vertically.
+        solvers : sequence of str
+            Methods to estimate (some of SOLVERS); all by default.
+        dof_count : positive int
+            Number of degrees of freedom of a node (see FEM.dof_count).
+        node_count : positive int or None
+            Number of nodes of the kept elements; all nodes of the grid by default.
+
+        Returns
+        -------
+        list of SolverEstimate
+            Estimates sorted by time.
+
+        """
+        estimates = [
+            SolverPlanner.estimate(h_element_count, v_element_count, solver, dof_count, node_count)
+            for solver in solvers
+        ]
+        return sorted(estimates, key=lambda estimate: estimate.time)
+
+    def fits(self, estimate: SolverEstimate) -> bool:
+        """
+        Determines whether the memory of a method fits the budget.
+
+        Parameters
+        ----------
+        estimate : SolverEstimate
+            Estimated cost of the method.
+
+        Returns
+        -------
+        bool
+            True if the memory fits the budget.
+
+        """
+        return self.memory_budget is None or estimate.memory <= self.memory_budget
+
+    def plan(
+        self,
+        h_element_count: int,
+        v_element_count: int,
+        solvers: Sequence[str] = SOLVERS,
+        dof_count: int = Node.DOF_COUNT,
+        node_count: Optional[int] = None,
+    ) -> SolverEstimate:
+        """
+        Chooses the fastest method that fits the memory budget.
+
+        Parameters
+        ----------
+        h_element_count : positive int
+            The number of finite elements horizontally.
+        v_element_count : positive int
+            The number of finite elements vertically.
+        solvers : sequence of str
+            Methods to choose from (some of SOLVERS); all by default.
+        dof_count : positive int
+            Number of degrees of freedom of a node (see FEM.dof_count).
+        node_count : positive int or None
+            Number of nodes of the kept elements; all nodes of the grid by default.
+
+        Returns
+        -------
+        SolverEstimate
+            Estimated cost of the chosen method.
+
+        Raises
+        ------
+        MemoryError
+            If no method fits the memory budget.
+
+        """
+        estimates = self.estimate_all(h_element_count, v_element_count, solvers, dof_count, node_count)
+        for estimate in estimates:
+            if self.fits(estimate):
+                return estimate
+        raise MemoryError(self.__describe(h_element_count, v_element_count, estimates))
+
+    def check(
+        self,
+        h_element_count: int,
+        v_element_count: int,
+        solver: str,
+        dof_count: int = Node.DOF_COUNT,
+        node_count: Optional[int] = None,
+    ) -> SolverEstimate:
+        """
+        Checks that a method fits the memory budget.
+
+        Parameters
+        ----------
+        h_element_count : positive int
+            The number of finite elements horizontally.
+        v_element_count : positive int
+            The number of finite elements vertically.
+        solver : str
+            Method of solving the system of equations (one of SOLVERS).
+        dof_count : positive int
+            Number of degrees of freedom of a node (see FEM.dof_count).
+        node_count : positive int or None
+            Number of nodes of the kept elements; all nodes of the grid by default.
+
+        Returns
+        -------
+        SolverEstimate
+            Estimated cost of the method.
+
+        Raises
+        ------
+        MemoryError
+            If the method does not fit the memory budget.
+
+        """
+        estimate = SolverPlanner.estimate(h_element_count, v_element_count, solver, dof_count, node_count)
+        if not self.fits(estimate):
+            raise MemoryError(self.__describe(h_element_count, v_element_count, [estimate]))
+        return estimate
+
+    def __describe(self, h_element_count: int, v_element_count: int, estimates: List[SolverEstimate]) -> str:
+        needs = ", ".join(
+            "{} needs {:.1f} GB".format(estimate.solver, estimate.memory / 1e9) for estimate in estimates
+        )
+        return "The memory budget of {:.1f} GB is not enough for the mesh of {}x{} elements: {}".format(
+            self.memory_budget / 1e9, h_element_count, v_element_count, needs
+        )
@@ -0,0 +1,176 @@
+"""
+Class that assembles sparse global matrices from element matrices.
+
+"""
+
+from typing import Final, Optional
+
+import numpy as np
+from scipy import sparse
+
+
+class SparsePattern:
+    """
+    Sparsity pattern of the global matrices of a mesh.
+
+    The pattern is computed once from the element connectivity at the
+    level of nodes; every matrix with the same connectivity is then
+    assembled by summing the element blocks into the pattern, without
+    building and sorting a coordinate list of all element entries.
+
+    Parameters
+    ----------
+    element_connectivity : ndarray
+        Array of shape (element count, nodes per element) with
+        the indices of the nodes of each element.
+    node_count : positive int
+        Number of nodes of the mesh.
+
+    Attributes
+    ----------
+    node_count : positive int
+        Number of nodes of the mesh.
+    element_count : non-negative int
+        Number of elements of the mesh.
+
+    """
+
+    def __init__(self, element_connectivity: np.ndarray, node_count: int) -> None:
+        self.node_count: Final = node_count
+        self.element_count: Final = element_connectivity.shape[0]
+        self.__nodes_per_element: int = element_connectivity.shape[1]
+
+        n = self.__nodes_per_element
+        rows = np.repeat(element_connectivity, n, axis=1).ravel().astype(np.int64)
+        columns = np.tile(element_connectivity, (1, n)).ravel()
+        keys, self.__block_index = np.unique(rows * node_count + columns, return_inverse=True)
+        self.__block_index = self.__block_index.ravel()
+
+        self.__indices: np.ndarray = (keys % node_count).astype(np.int32)
+        self.__indptr: np.ndarray = np.concatenate(
+            ([0], np.cumsum(np.bincount(keys // node_count, minlength=node_count)))
+        ).astype(np.int32)
+
+    @property
+    def block_count(self) -> int:
+        """
+        Property that returns the number of nonzero node blocks.
+
+        Returns
+        -------
+        non-negative int
+            Number of pairs of nodes that share an element.
+
+        """
+        return len(self.__indices)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Property that returns the memory of the index arrays of the pattern.
+
+        Returns
+        -------
+        positive int
+            Number of bytes.
+
+        """
+        return self.__block_index.nbytes + self.__indices.nbytes + self.__indptr.nbytes
+
+    def assemble(
+        self, local_matrix: np.ndarray, element_scales: Optional[np.ndarray] = None
+    ) -> sparse.csr_matrix:
+        """
+        Assembles the global matrix.
+
+        Parameters
+        ----------
+        local_matrix : ndarray
+            Matrix of an element, the same for all elements.
+        element_scales : ndarray or None
+            Factors of the matrix of each element.
+
+        Returns
+        -------
+        csr_matrix
+            Global matrix.
+
+        """
+        n = self.__nodes_per_element
+        dof_count = local_matrix.shape[0] // n
+        blocks = (
+            local_matrix.reshape(n, dof_count, n, dof_count)
+            .transpose(0, 2, 1, 3)
+            .reshape(n * n, dof_count * dof_count)
+        )
+
+        data = np.empty((self.block_count, dof_count * dof_count))
+        for k in range(dof_count * dof_count):
+            if element_scales is None:
+                weights = np.tile(blocks[:, k], self.element_count)
+            else:
+                weights = np.outer(element_scales, blocks[:, k]).ravel()
+            data[:, k] = np.bincount(self.__block_index, weights, minlength=self.block_count)
+
+        size = self.node_count * dof_count
+        return sparse.bsr_matrix(
+            (data.reshape(-1, dof_count, dof_count), self.__indices, self.__indptr),
+            shape=(size, size),
+        ).tocsr()
+
+    def assemble_elements(self, local_matrices: np.ndarray) -> sparse.csr_matrix:
+        """
+        Assembles the global matrix from different matrices of the elements.
+
+        Parameters
+        ----------
+        local_matrices : ndarray
+            Array of shape (element count, n, n) with the matrix of each element.
+
+        Returns
+        -------
+        csr_matrix
+            Global matrix.
+
+        """
+        n = self.__nodes_per_element
+        dof_count = local_matrices.shape[1] // n
+        blocks = (
+            local_matrices.reshape(self.element_count, n, dof_count, n, dof_count)
+            .transpose(0, 1, 3, 2, 4)
+            .reshape(-1, dof_count * dof_count)
+        )
+
+        data = np.empty((self.block_count, dof_count * dof_count))
+        for k in range(dof_count * dof_count):
+            data[:, k] = np.bincount(self.__block_index, blocks[:, k], minlength=self.block_count)
+
+        size = self.node_count * dof_count
+        return sparse.bsr_matrix(
+            (data.reshape(-1, dof_count, dof_count), self.__indices, self.__indptr),
+            shape=(size, size),
+        ).tocsr()
+
+    @staticmethod
+    def apply_fixation(matrix: sparse.csr_matrix, fixed_dofs: np.ndarray) -> sparse.csr_matrix:
+        """
+        Applies the fixation to a global matrix: the rows and columns
+        of the fixed degrees of freedom are replaced with those of the identity.
+
+        Parameters
+        ----------
+        matrix : csr_matrix
+            Global matrix.
+        fixed_dofs : ndarray
+            Boolean array that determines whether each degree of freedom is fixed.
+
+        Returns
+        -------
+        csr_matrix
+            Global matrix with the fixation applied.
+
+        """
+        rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+        matrix.data[fixed_dofs[rows] | fixed_dofs[matrix.indices]] = 0
+        matrix.eliminate_zeros()
+        return (matrix + sparse.diags(fixed_dofs.astype(float))).tocsr()
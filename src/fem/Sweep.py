@@ -0,0 +1,132 @@
+"""
+Streaming calculation of plate bending over a sequence of parameter sets.
+
+"""
+
+import itertools
+from typing import Any, Dict, Iterable, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+from src.fem.FEM import FEM
+
+
+class SweepResult(NamedTuple):
+    """
+    Lightweight result of one calculation of the sweep.
+
+    Attributes
+    ----------
+    parameters : dict
+        Keyword arguments the FEM instance was created with.
+    max_deformation : float
+        Max deformation of nodes.
+    deformation : ndarray or None
+        Deformations of nodes in the form of a matrix
+        (see FEM.get_nodes_deformation_for_plot) if it was requested.
+
+    """
+
+    parameters: Dict[str, Any]
+    max_deformation: float
+    deformation: Optional[np.ndarray]
+
+
+class Sweep:
+    """
+    Iterable over the results of plate bending calculations for
+    a sequence of parameter sets.
+
+    The parameter sets are consumed lazily and every FEM instance
+    (together with its global stiffness matrix) is released as soon
+    as its result record is produced, so the memory consumption does not
+    depend on the length of the sweep.
+
+    Parameters
+    ----------
+    parameter_sets : iterable of dict
+        Keyword arguments for the FEM class, one dict per calculation.
+    keep_deformation : bool
+        Determines whether records contain the deformations of nodes.
+
+    """
+
+    def __init__(self, parameter_sets: Iterable[Dict[str, Any]], keep_deformation: bool = False) -> None:
+        self.__parameter_sets = parameter_sets
+        self.__keep_deformation = keep_deformation
+
+    @staticmethod
+    def grid(base: Dict[str, Any], **axes: Iterable) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily generates the cartesian product of parameter values.
+
+        Parameters
+        ----------
+        base : dict
+            Parameters that are the same for every calculation.
+        **axes : iterable
+            Values of the varied parameters.
+
+        Yields
+        ------
+        dict
+            Keyword arguments for the FEM class.
+
+        """
+        names = list(axes)
+        for values in itertools.product(*(axes[name] for name in names)):
+            parameters = dict(base)
+            parameters.update(zip(names, values))
+            yield parameters
+
+    @staticmethod
+    def solve(parameters: Dict[str, Any], keep_deformation: bool = False) -> SweepResult:
+        """
+        Performs one calculation and returns its result record.
+
+        Parameters
+        ----------
+        parameters : dict
+            Keyword arguments for the FEM class.
+        keep_deformation : bool
+            Determines whether the record contains the deformations of nodes.
+
+        Returns
+        -------
+        SweepResult
+            Result of the calculation.
+
+        """
+        fem = FEM(**parameters)
+        fem.create_mesh()
+        fem.calculate()
+        deformation = None
+        if keep_deformation:
+            # Copy so that the record does not keep the whole solution vector alive
+            deformation = np.array(fem.get_nodes_deformation_for_plot())
+        return SweepResult(dict(parameters), float(fem.get_max_node_deformation()), deformation)
+
+    def __iter__(self) -> Iterator[SweepResult]:
+        for parameters in self.__parameter_sets:
+            yield Sweep.solve(parameters, self.__keep_deformation)
+
+    def write(self, writer) -> int:
+        """
+        Performs the calculations and writes every record as soon as it is produced.
+
+        Parameters
+        ----------
+        writer : CsvResultWriter or ColumnarResultWriter
+            Destination of the records.
+
+        Returns
+        -------
+        non-negative int
+            Number of written records.
+
+        """
+        count = 0
+        for record in self:
+            writer.write(record)
+            count += 1
+        return count
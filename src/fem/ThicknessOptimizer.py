@@ -0,0 +1,282 @@
+"""
+Class that searches for the minimum plate thickness that keeps
+the deflection below a limit.
+
+"""
+
+from typing import Any, Final, Mapping, Optional, Tuple
+
+import numpy as np
+from scipy.sparse.linalg import splu
+
+from src.fem.ConjugateGradient import ConjugateGradient
+from src.fem.FEM import FEM
+
+
+class ThicknessOptimizer:
+    """
+    Searches for the minimum plate thickness that keeps the max deflection
+    of nodes (see FEM.get_max_node_deformation) below a limit.
+
+    The stiffness of an element is proportional to the cube of its thickness,
+    so for a uniform thickness the deflections scale exactly as its inverse
+    cube and the optimum follows from one calculation. For the thicknesses of
+    the elements the volume is minimized by the optimality criteria method
+    with the sensitivities of the max deflection computed by the adjoint
+    method: one additional solve with the same matrix per iteration.
+    The factorization of the stiffness matrix is reused between iterations
+    as the preconditioner of the conjugate gradient method while it
+    converges in a few iterations, and renewed otherwise.
+
+    The final design is scaled onto the constraint boundary; the elements
+    that the scaling would make thicker than max_thickness are kept at it and
+    the others are thickened further by a common scale, found by safeguarded
+    Newton steps, until the deflection is within the limit.
+
+    Parameters
+    ----------
+    parameters : dict
+        Keyword arguments for the FEM class; the thickness is the initial one.
+    deflection_limit : positive float
+        Maximum allowed deflection.
+    min_thickness : positive float or None
+        Lower bound of the thicknesses of the elements; a hundredth of the
+        initial thickness by default.
+    max_thickness : positive float or None
+        Upper bound of the thicknesses of the elements; ten times the initial
+        thickness by default.
+
+    Attributes
+    ----------
+    solve_count : non-negative int
+        Number of solved systems.
+    factorization_count : non-negative int
+        Number of factorizations of the stiffness matrix.
+
+    Class Attributes
+    ----------------
+    REUSE_ITERATIONS : positive int
+        Maximum number of the conjugate gradient iterations with a previous
+        factorization before the matrix is factorized again.
+    MOVE_LIMIT : positive float
+        Maximum relative change of the thicknesses in one iteration.
+
+    """
+
+    REUSE_ITERATIONS: Final = 30
+    MOVE_LIMIT: Final = 0.2
+    # Relative excess of the deflection limit accepted in the final design
+    __LIMIT_TOLERANCE: Final = 1e-6
+
+    def __init__(
+        self,
+        parameters: Mapping[str, Any],
+        deflection_limit: float,
+        min_thickness: Optional[float] = None,
+        max_thickness: Optional[float] = None,
+    ) -> None:
+        self.__thickness: Final = float(parameters["thickness"])
+        self.__deflection_limit: Final = deflection_limit
+        self.__min_thickness: Final = self.__thickness / 100 if min_thickness is None else min_thickness
+        self.__max_thickness: Final = self.__thickness * 10 if max_thickness is None else max_thickness
+        self.solve_count = 0
+        self.factorization_count = 0
+
+        self.__fem = FEM(**parameters)
+        self.__fem.create_mesh()
+        self.__free_dofs = ~self.__fem.fixed_dofs
+        connectivity = self.__fem.element_connectivity
+        self.__element_dofs = (
+            self.__fem.dof_count * connectivity[:, :, np.newaxis] + np.arange(self.__fem.dof_count)
+        ).reshape(len(connectivity), -1)
+        self.__forces = self.__fem.assemble_pressure_load(
+            np.full(len(connectivity), float(parameters["pressure"]))
+        )[self.__free_dofs]
+
+        self.__matrix = None
+        self.__solver = None
+        self.__cg = ConjugateGradient(1e-10, ThicknessOptimizer.REUSE_ITERATIONS)
+
+    @property
+    def element_count(self) -> int:
+        """
+        Property that returns the number of elements.
+
+        Returns
+        -------
+        positive int
+            Number of elements of the mesh.
+
+        """
+        return len(self.__element_dofs)
+
+    def __set_thicknesses(self, thicknesses: np.ndarray) -> None:
+        scales = (thicknesses / self.__thickness) ** 3
+        free = self.__free_dofs
+        self.__matrix = self.__fem.assemble_stiffness_matrix(scales)[free][:, free].tocsc()
+
+    def __solve(self, b: np.ndarray) -> np.ndarray:
+        self.solve_count += 1
+        if self.__solver is not None:
+            try:
+                return self.__cg.solve(lambda x: self.__matrix @ x, b, self.__solver.solve)
+            except ArithmeticError:
+                pass
+        self.__solver = splu(self.__matrix)
+        self.factorization_count += 1
+        return self.__solver.solve(b)
+
+    def get_sensitivities(self, thicknesses: np.ndarray) -> Tuple[float, np.ndarray]:
+        """
+        Calculates the max deflection and its derivatives with respect to
+        the thicknesses of the elements by the adjoint method.
+
+        Parameters
+        ----------
+        thicknesses : ndarray
+            Thickness of each element in the order of FEM.element_connectivity.
+
+        Returns
+        -------
+        tuple
+            Max deflection of nodes and the array of its derivatives.
+
+        """
+        self.__set_thicknesses(thicknesses)
+        free = self.__free_dofs
+        displacements = np.zeros(len(free))
+        displacements[free] = self.__solve(self.__forces)
+
+        deflections = displacements[:: self.__fem.dof_count]
+        node = int(np.argmax(deflections))
+        # The matrix is symmetric: the adjoint system has the same matrix
+        unit = np.zeros(len(free))
+        unit[self.__fem.dof_count * node] = 1
+        adjoint = np.zeros(len(free))
+        adjoint[free] = self.__solve(unit[free])
+
+        # dK/dt_e = 3 t_e^2 / t^3 K_e, dw/dt_e = -adjoint_e^T dK/dt_e u_e
+        element_energies = np.einsum(
+            "ei,ij,ej->e",
+            adjoint[self.__element_dofs],
+            self.__fem.local_stiffness_matrix,
+            displacements[self.__element_dofs],
+        )
+        gradient = -3 * thicknesses ** 2 / self.__thickness ** 3 * element_energies
+        return float(deflections[node]), gradient
+
+    def get_uniform_thickness(self) -> float:
+        """
+        Calculates the minimum uniform thickness.
+
+        Returns
+        -------
+        positive float
+            Thickness at which the max deflection equals the limit.
+
+        """
+        self.__set_thicknesses(np.full(self.element_count, self.__thickness))
+        displacements = np.zeros(len(self.__free_dofs))
+        displacements[self.__free_dofs] = self.__solve(self.__forces)
+        max_deflection = displacements[:: self.__fem.dof_count].max()
+        return self.__thickness * (max_deflection / self.__deflection_limit) ** (1 / 3)
+
+    def optimize(self, max_iterations: int = 50, tolerance: float = 1e-2) -> np.ndarray:
+        """
+        Minimizes the volume of the plate over the thicknesses of the elements.
+
+        Parameters
+        ----------
+        max_iterations : positive int
+            Maximum number of iterations.
+        tolerance : positive float
+            Relative change of the volume in an iteration at which
+            the iterations stop.
+
+        Returns
+        -------
+        ndarray
+            Thickness of each element in the order of FEM.element_connectivity.
+
+        Raises
+        ------
+        ValueError
+            If the deflection limit cannot be met with the thicknesses
+            not greater than max_thickness.
+
+        """
+        # The optimal uniform thickness is the starting point on the constraint boundary
+        thicknesses = np.full(self.element_count, self.get_uniform_thickness())
+        thicknesses = np.clip(thicknesses, self.__min_thickness, self.__max_thickness)
+        move = ThicknessOptimizer.MOVE_LIMIT
+
+        for _ in range(max_iterations):
+            deflection, gradient = self.get_sensitivities(thicknesses)
+            # Scaling all thicknesses by s scales the deflection by s^-3 and its derivatives
+            # by s^-4, so the design is moved onto the constraint boundary without a solve
+            scale = (deflection / self.__deflection_limit) ** (1 / 3)
+            thicknesses, gradient = thicknesses * scale, gradient / scale ** 4
+
+            # Optimality criterion: the derivatives of the deflection are proportional
+            # to those of the volume, which are equal for all elements
+            benefit = np.maximum(-gradient, 0)
+            benefit /= benefit @ thicknesses / thicknesses.sum()
+            new_thicknesses = np.clip(
+                thicknesses * np.sqrt(np.maximum(benefit, 1e-12)),
+                np.maximum(thicknesses * (1 - move), self.__min_thickness),
+                np.minimum(thicknesses * (1 + move), self.__max_thickness),
+            )
+            change = abs(new_thicknesses.sum() / thicknesses.sum() - 1)
+            thicknesses = new_thicknesses
+            if change <= tolerance:
+                break
+
+        deflection, _ = self.get_sensitivities(thicknesses)
+        scale = (deflection / self.__deflection_limit) ** (1 / 3)
+        thicknesses = np.clip(thicknesses * scale, self.__min_thickness, self.__max_thickness)
+        return self.__enforce_limit(thicknesses, max_iterations, tolerance)
+
+    def __scale_free(self, thicknesses: np.ndarray, log_scale: float) -> np.ndarray:
+        free = thicknesses < self.__max_thickness
+        scaled = thicknesses.copy()
+        scaled[free] *= np.exp(log_scale)
+        return np.minimum(scaled, self.__max_thickness)
+
+    def __enforce_limit(self, thicknesses: np.ndarray, max_iterations: int, tolerance: float) -> np.ndarray:
+        # The elements clipped at max_thickness make the deflection exceed the limit
+        limit = self.__deflection_limit
+        deflection, gradient = self.get_sensitivities(thicknesses)
+        if deflection <= limit * (1 + ThicknessOptimizer.__LIMIT_TOLERANCE):
+            return thicknesses
+
+        # The log of the common scale of the thinner elements is searched between low, which is
+        # infeasible, and high, which is feasible; at the first high all elements are at max_thickness
+        free = thicknesses < self.__max_thickness
+        low, high = 0.0, np.log(self.__max_thickness / thicknesses[free].min()) if free.any() else 0.0
+        best = self.__scale_free(thicknesses, high)
+        max_deflection, _ = self.get_sensitivities(best)
+        if max_deflection > limit * (1 + ThicknessOptimizer.__LIMIT_TOLERANCE):
+            raise ValueError(
+                "The deflection limit of {} cannot be met with the max thickness of {}: "
+                "the deflection is {}".format(limit, self.__max_thickness, max_deflection)
+            )
+
+        for _ in range(max_iterations):
+            # Newton step for the log of the deflection from the infeasible end; the deflection
+            # is convex in the log of the scale, so the step does not pass the boundary
+            current = self.__scale_free(thicknesses, low)
+            scaled = current < self.__max_thickness
+            slope = current[scaled] @ gradient[scaled] / deflection
+            log_scale = low + np.log(limit / deflection) / slope if slope < 0 else high
+            if not low < log_scale < high:
+                log_scale = (low + high) / 2
+
+            new_thicknesses = self.__scale_free(thicknesses, log_scale)
+            new_deflection, new_gradient = self.get_sensitivities(new_thicknesses)
+            if new_deflection > limit * (1 + ThicknessOptimizer.__LIMIT_TOLERANCE):
+                low, deflection, gradient = log_scale, new_deflection, new_gradient
+            else:
+                high, best = log_scale, new_thicknesses
+                if new_deflection >= limit * (1 - tolerance):
+                    break
+        return best
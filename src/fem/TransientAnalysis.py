@@ -0,0 +1,257 @@
+"""
+Class that calculates the response of the plate over time
+to loads that change in time.
+
+"""
+
+from typing import Callable, Final, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from src.fem.FEM import FEM
+
+
+class TransientAnalysis:
+    """
+    Calculates the response of the plate over time by the HHT-alpha method
+    (the Newmark method when alpha is 0).
+
+    The time step is constant, so the effective matrix of the step
+    is factorized once and every step costs a few sparse products and
+    one solve. The deflections are streamed to a memory-mapped .npy file
+    as they are calculated and are not kept in memory.
+
+    The mesh of the FEM instance must be created (see FEM.create_mesh).
+    Initially the plate is at rest and undeformed.
+
+    Parameters
+    ----------
+    fem : FEM
+        Plate with the created mesh.
+    time_step : positive float
+        Time step.
+    alpha : float
+        Parameter of the HHT-alpha method from -1/3 to 0; negative values
+        damp the high-frequency modes.
+    beta : positive float or None
+        Parameter of the Newmark method; (1 - alpha)^2 / 4 by default.
+    gamma : positive float or None
+        Parameter of the Newmark method; 1/2 - alpha by default.
+    mass_damping : non-negative float
+        Factor of the mass matrix in the Rayleigh damping matrix.
+    stiffness_damping : non-negative float
+        Factor of the stiffness matrix in the Rayleigh damping matrix.
+    lumped : bool
+        Determines whether the lumped mass matrix is used instead of
+        the consistent one (see Element.get_local_mass_matrix).
+
+    Attributes
+    ----------
+    max_deflections : ndarray
+        Max absolute deflection of nodes at every time of the last run,
+        starting from zero time.
+
+    """
+
+    def __init__(
+        self,
+        fem: FEM,
+        time_step: float,
+        alpha: float = 0.0,
+        beta: Optional[float] = None,
+        gamma: Optional[float] = None,
+        mass_damping: float = 0.0,
+        stiffness_damping: float = 0.0,
+        lumped: bool = False,
+    ) -> None:
+        if not -1 / 3 <= alpha <= 0:
+            raise ValueError("The alpha parameter must be from -1/3 to 0")
+
+        self.__fem: Final = fem
+        self.__time_step: Final = time_step
+        self.__alpha: Final = alpha
+        self.__beta: Final = (1 - alpha) ** 2 / 4 if beta is None else beta
+        self.__gamma: Final = 0.5 - alpha if gamma is None else gamma
+        self.__free_dofs: Final = ~fem.fixed_dofs
+        self.max_deflections = np.zeros(0)
+
+        free = self.__free_dofs
+        self.__stiffness_matrix = fem.assemble_stiffness_matrix()[free][:, free].tocsr()
+        self.__mass_matrix = fem.assemble_mass_matrix(lumped)[free][:, free].tocsr()
+        self.__damping_matrix = (
+            mass_damping * self.__mass_matrix + stiffness_damping * self.__stiffness_matrix
+        ).tocsr()
+
+        dt, a, b, g = time_step, alpha, self.__beta, self.__gamma
+        effective_matrix = (
+            self.__mass_matrix / (b * dt ** 2)
+            + (1 + a) * g / (b * dt) * self.__damping_matrix
+            + (1 + a) * self.__stiffness_matrix
+        )
+        self.__effective_solver = splu(sparse.csc_matrix(effective_matrix))
+        self.__mass_solver = splu(sparse.csc_matrix(self.__mass_matrix))
+
+    @staticmethod
+    def get_element_centers(fem: FEM) -> np.ndarray:
+        """
+        Returns the centers of the elements.
+
+        Parameters
+        ----------
+        fem : FEM
+            Plate with the created mesh.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (element count, 2) with the x and y coordinates
+            of the center of each element.
+
+        """
+        return fem.node_coordinates[fem.element_connectivity].mean(axis=1)
+
+    @staticmethod
+    def impulsive_load(
+        fem: FEM,
+        pressure: float,
+        duration: float,
+        region: Optional[Tuple[float, float, float, float]] = None,
+    ) -> Callable[[float], np.ndarray]:
+        """
+        Creates a pressure that acts on a rectangular region for a limited time.
+
+        Parameters
+        ----------
+        fem : FEM
+            Plate with the created mesh.
+        pressure : float
+            Pressure while the load acts.
+        duration : positive float
+            Time during which the load acts.
+        region : tuple or None
+            Left, bottom, right and top sides of the region;
+            the whole plate by default.
+
+        Returns
+        -------
+        callable
+            Returns the pressure on each element at the given time.
+
+        """
+        centers = TransientAnalysis.get_element_centers(fem)
+        if region is None:
+            pressures = np.full(len(centers), float(pressure))
+        else:
+            left, bottom, right, top = region
+            inside = (
+                (centers[:, 0] >= left) & (centers[:, 0] <= right)
+                & (centers[:, 1] >= bottom) & (centers[:, 1] <= top)
+            )
+            pressures = np.where(inside, float(pressure), 0.0)
+        zero = np.zeros_like(pressures)
+        return lambda time: pressures if time <= duration else zero
+
+    @staticmethod
+    def moving_load(
+        fem: FEM, pressure: float, speed: float, patch_width: float, start: float = 0.0
+    ) -> Callable[[float], np.ndarray]:
+        """
+        Creates a pressure on a strip across the plate that moves along
+        the x-axis at a constant speed.
+
+        Parameters
+        ----------
+        fem : FEM
+            Plate with the created mesh.
+        pressure : float
+            Pressure on the strip.
+        speed : float
+            Speed of the strip.
+        patch_width : positive float
+            Width of the strip.
+        start : float
+            X-axis coordinate of the center of the strip at zero time.
+
+        Returns
+        -------
+        callable
+            Returns the pressure on each element at the given time.
+
+        """
+        x = TransientAnalysis.get_element_centers(fem)[:, 0]
+        return lambda time: np.where(
+            np.abs(x - start - speed * time) <= patch_width / 2, float(pressure), 0.0
+        )
+
+    def run(
+        self,
+        load: Callable[[float], np.ndarray],
+        step_count: int,
+        path: str,
+        snapshot_interval: int = 1,
+    ) -> np.memmap:
+        """
+        Calculates the response over the given number of time steps.
+
+        Parameters
+        ----------
+        load : callable
+            Returns the pressure on each element (see FEM.assemble_pressure_load)
+            at the given time.
+        step_count : positive int
+            Number of time steps.
+        path : str
+            Path of the .npy file for the deflections.
+        snapshot_interval : positive int
+            Number of time steps between the saved deflections.
+
+        Returns
+        -------
+        memmap
+            Array of shape (snapshot count, *deflection matrix shape) with the
+            deflections of nodes (see FEM.get_nodes_deformation_for_plot)
+            at zero time and after every snapshot_interval steps.
+
+        """
+        fem = self.__fem
+        free = self.__free_dofs
+        dt, a, b, g = self.__time_step, self.__alpha, self.__beta, self.__gamma
+        k, m, c = self.__stiffness_matrix, self.__mass_matrix, self.__damping_matrix
+
+        size = np.count_nonzero(free)
+        u, v = np.zeros(size), np.zeros(size)
+        force = fem.assemble_pressure_load(load(0.0))[free]
+        acceleration = self.__mass_solver.solve(force)
+
+        full = np.zeros(len(free))
+        plot_shape = fem.get_field_for_plot(full[:: fem.dof_count]).shape
+        snapshots = np.lib.format.open_memmap(
+            path, mode="w+", dtype=np.float64, shape=(step_count // snapshot_interval + 1,) + plot_shape
+        )
+        snapshots[0] = 0
+        self.max_deflections = np.zeros(step_count + 1)
+
+        for step in range(1, step_count + 1):
+            next_force = fem.assemble_pressure_load(load(step * dt))[free]
+            u_predicted = u + dt * v + dt ** 2 * (0.5 - b) * acceleration
+            v_predicted = v + dt * (1 - g) * acceleration
+
+            rhs = (1 + a) * next_force - a * force + m @ u_predicted / (b * dt ** 2) + a * (k @ u)
+            if c.nnz:
+                rhs += (1 + a) * (c @ (g / (b * dt) * u_predicted - v_predicted)) + a * (c @ v)
+            u_next = self.__effective_solver.solve(rhs)
+
+            acceleration = (u_next - u_predicted) / (b * dt ** 2)
+            v = v_predicted + g * dt * acceleration
+            u, force = u_next, next_force
+
+            full[free] = u
+            deflections = full[:: fem.dof_count]
+            self.max_deflections[step] = np.abs(deflections).max()
+            if step % snapshot_interval == 0:
+                snapshots[step // snapshot_interval] = fem.get_field_for_plot(deflections)
+
+        snapshots.flush()
+        return snapshots
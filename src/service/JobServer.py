@@ -0,0 +1,458 @@
+"""
+Local HTTP service that accepts plate bending calculations from
+several clients and performs them in worker processes that share the CPU cores.
+
+Run from the root of the project folder:
+    python -m src.service.JobServer --port 8080
+
+"""
+
+import argparse
+import asyncio
+import inspect
+import itertools
+import json
+import math
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from src.fem.FEM import FEM
+from src.fem.SharedArray import SharedArray, SharedArrayHandle
+from src.fem.Sweep import Sweep, SweepResult
+from src.service.ResourceScheduler import ResourceScheduler
+
+
+def _solve_in_worker(
+    parameters: Dict[str, Any], keep_deformation: bool
+) -> Tuple[SweepResult, Optional[SharedArrayHandle]]:
+    # Runs in a worker process: the deformations are passed back through
+    # shared memory owned by the server instead of being pickled
+    record = Sweep.solve(parameters, keep_deformation)
+    if record.deformation is None:
+        return record, None
+    shared = SharedArray.publish(record.deformation)
+    handle = shared.disown()
+    shared.release()
+    return record._replace(deformation=None), handle
+
+
+class Job:
+    """
+    State of one submitted calculation.
+
+    Parameters
+    ----------
+    job_id : str
+        Identifier of the job.
+    parameters : dict
+        Keyword arguments for the FEM class.
+    keep_deformation : bool
+        Determines whether the result contains the deformations of nodes.
+
+    Attributes
+    ----------
+    id : str
+        Identifier of the job.
+    parameters : dict
+        Keyword arguments for the FEM class.
+    keep_deformation : bool
+        Determines whether the result contains the deformations of nodes.
+    status : str
+        One of "queued" (waiting for the cores or a worker), "running",
+        "done", "failed" and "timeout".
+    result : dict or None
+        Result of the calculation when the status is "done".
+    error : str or None
+        Description of the error when the status is "failed" or "timeout".
+    done : asyncio.Event
+        Set when the job is finished.
+    future : Future or None
+        Future of the calculation once it is submitted to a worker pool.
+
+    """
+
+    def __init__(self, job_id: str, parameters: Dict[str, Any], keep_deformation: bool) -> None:
+        self.id = job_id
+        self.parameters = parameters
+        self.keep_deformation = keep_deformation
+        self.status = "queued"
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.done = asyncio.Event()
+        self.future: Optional[Future] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the JSON-compatible representation of the job.
+
+        Returns
+        -------
+        dict
+            Identifier, status and result or error of the job.
+
+        """
+        data: Dict[str, Any] = {"id": self.id, "status": self.status}
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+class JobServer:
+    """
+    Asyncio HTTP service for plate bending calculations.
+
+    Endpoints
+    ---------
+    POST /jobs
+        Body: {"parameters": {...FEM arguments...}, "keep_deformation": false}.
+        Returns the job handle (202). With the "?wait=1" query the response
+        is sent when the job is finished. Identical payloads submitted while
+        a job is still queued or running share that job. When "max_pending"
+        jobs are unfinished, new ones are rejected with 503; bodies longer
+        than "max_body_size" bytes are rejected with 413.
+    GET /jobs/<id>
+        Returns the job handle with the result when it is finished.
+
+    Parameters
+    ----------
+    host : str
+        Address to listen on.
+    port : non-negative int
+        Port to listen on; 0 selects a free port (see the port property).
+    max_workers : positive int or None
+        Number of CPU cores shared by the worker processes and their BLAS
+        threads (see ResourceScheduler); the number of CPUs by default.
+    max_pending : positive int
+        Maximum number of unfinished jobs.
+    timeout : positive float
+        Maximum time of one calculation in seconds; the worker of a
+        calculation that takes longer is terminated.
+    max_history : positive int
+        Number of finished jobs whose results are kept.
+    max_body_size : positive int
+        Maximum length of a request body in bytes.
+
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_workers: Optional[int] = None,
+        max_pending: int = 64,
+        timeout: float = 600.0,
+        max_history: int = 1024,
+        max_body_size: int = 1 << 20,
+    ) -> None:
+        self.__host = host
+        self.__port = port
+        self.__max_pending = max_pending
+        self.__timeout = timeout
+        self.__max_history = max_history
+        self.__max_body_size = max_body_size
+
+        self.__scheduler = ResourceScheduler(max_workers)
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__ids = itertools.count(1)
+        self.__jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.__in_flight: Dict[str, Job] = {}
+        self.__tasks: Set[asyncio.Future] = set()
+        self.__parameter_names = set(inspect.signature(FEM).parameters)
+
+    @property
+    def port(self) -> int:
+        """
+        Property that returns the port the server listens on.
+
+        Returns
+        -------
+        non-negative int
+            Port of the server.
+
+        """
+        if self.__server is not None:
+            return self.__server.sockets[0].getsockname()[1]
+        return self.__port
+
+    async def start(self) -> None:
+        """
+        Starts listening for connections.
+
+        """
+        self.__server = await asyncio.start_server(self.__handle_connection, self.__host, self.__port)
+
+    async def stop(self) -> None:
+        """
+        Stops listening, fails the unfinished jobs and shuts down the worker processes.
+
+        """
+        if self.__server is not None:
+            self.__server.close()
+        # The connections waiting for the jobs are answered before the server is closed
+        tasks = list(self.__tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.__server is not None:
+            await self.__server.wait_closed()
+        self.__scheduler.shutdown()
+
+    async def serve_forever(self) -> None:
+        """
+        Starts the server and serves until cancelled.
+
+        """
+        await self.start()
+        try:
+            await self.__server.serve_forever()
+        finally:
+            await self.stop()
+
+    def __validate(self, payload: Any) -> Tuple[Dict[str, Any], bool]:
+        if not isinstance(payload, dict) or not isinstance(payload.get("parameters"), dict):
+            raise ValueError('The payload must contain the "parameters" object')
+        parameters = payload["parameters"]
+        unknown = set(parameters) - self.__parameter_names
+        if unknown:
+            raise ValueError("Unknown parameters: " + ", ".join(sorted(unknown)))
+        try:
+            inspect.signature(FEM).bind(**parameters)
+        except TypeError as error:
+            raise ValueError(str(error))
+        return parameters, bool(payload.get("keep_deformation", False))
+
+    def submit(self, parameters: Dict[str, Any], keep_deformation: bool = False) -> Job:
+        """
+        Queues a calculation or returns the unfinished job with the same payload.
+
+        Parameters
+        ----------
+        parameters : dict
+            Keyword arguments for the FEM class.
+        keep_deformation : bool
+            Determines whether the result contains the deformations of nodes.
+
+        Returns
+        -------
+        Job
+            Handle of the job.
+
+        Raises
+        ------
+        OverflowError
+            If the maximum number of unfinished jobs is reached.
+
+        """
+        key = json.dumps([parameters, keep_deformation], sort_keys=True)
+        if key in self.__in_flight:
+            return self.__in_flight[key]
+        if len(self.__in_flight) >= self.__max_pending:
+            raise OverflowError("Too many unfinished jobs")
+
+        job = Job(str(next(self.__ids)), parameters, keep_deformation)
+        self.__jobs[job.id] = job
+        self.__in_flight[key] = job
+        task = asyncio.ensure_future(self.__run(job, key))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """
+        Returns the job by its identifier.
+
+        Parameters
+        ----------
+        job_id : str
+            Identifier of the job.
+
+        Returns
+        -------
+        Job or None
+            The job, or None if it is unknown or its result has been discarded.
+
+        """
+        job = self.__jobs.get(job_id)
+        # A submitted job runs when a worker of its pool picks it up
+        if job is not None and job.status == "queued" and job.future is not None:
+            if self.__scheduler.is_started(job.future):
+                job.status = "running"
+        return job
+
+    async def __calculate(self, job: Job) -> Tuple[Any, Optional[SharedArrayHandle]]:
+        # A job whose pool was recycled because another job of it timed out is run again once
+        for attempt in range(2):
+            future = await self.__scheduler.submit(
+                job.parameters, _solve_in_worker, job.parameters, job.keep_deformation
+            )
+            job.future = future
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), self.__timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                # Terminating the worker releases the cores reserved by the job
+                future.add_done_callback(JobServer.__discard_result)
+                self.__scheduler.cancel(future)
+                raise
+            except BrokenProcessPool:
+                if attempt > 0:
+                    raise
+
+    async def __run(self, job: Job, key: str) -> None:
+        try:
+            record, handle = await self.__calculate(job)
+            job.result = {
+                "parameters": record.parameters,
+                "max_deformation": None if math.isnan(record.max_deformation) else record.max_deformation,
+                "deformation": None,
+            }
+            if handle is not None:
+                with SharedArray.attach(handle, owner=True) as deformation:
+                    job.result["deformation"] = JobServer.__to_list(deformation.array)
+            job.status = "done"
+        except asyncio.TimeoutError:
+            job.status = "timeout"
+            job.error = "The calculation took longer than {} s".format(self.__timeout)
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "The server is stopped"
+            raise
+        except Exception as error:
+            job.status = "failed"
+            job.error = "{}: {}".format(type(error).__name__, error)
+        finally:
+            del self.__in_flight[key]
+            job.done.set()
+            self.__discard_history()
+
+    @staticmethod
+    def __reject_constant(name: str) -> None:
+        # Python accepts NaN and Infinity, which are not JSON and could not be sent back
+        raise ValueError("Invalid JSON constant: " + name)
+
+    @staticmethod
+    def __to_list(array: np.ndarray) -> List[Any]:
+        # JSON has no NaN, the deformations of the removed nodes are sent as null
+        return np.where(np.isnan(array), None, array).tolist()
+
+    @staticmethod
+    def __discard_result(future: Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            _, handle = future.result()
+            if handle is not None:
+                SharedArray.attach(handle, owner=True).release()
+
+    def __discard_history(self) -> None:
+        finished = [job_id for job_id, job in self.__jobs.items() if job.done.is_set()]
+        for job_id in finished[: max(0, len(finished) - self.__max_history)]:
+            del self.__jobs[job_id]
+
+    async def __handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            status, body = await self.__handle_request(reader)
+        except (ValueError, asyncio.IncompleteReadError) as error:
+            status, body = 400, {"error": str(error)}
+
+        data = json.dumps(body, allow_nan=False).encode()
+        reasons = {
+            200: "OK",
+            202: "Accepted",
+            400: "Bad Request",
+            404: "Not Found",
+            413: "Payload Too Large",
+            503: "Service Unavailable",
+        }
+        header = (
+            "HTTP/1.1 {} {}\r\n"
+            "Content-Type: application/json\r\n"
+            "Content-Length: {}\r\n"
+            "Connection: close\r\n\r\n"
+        ).format(status, reasons[status], len(data))
+        writer.write(header.encode() + data)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def __handle_request(self, reader: asyncio.StreamReader) -> Tuple[int, Dict[str, Any]]:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) != 3:
+            raise ValueError("Malformed request line")
+        method, target = request_line[0], urlsplit(request_line[1])
+
+        content_length = 0
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                content_length = int(value)
+                if content_length < 0:
+                    raise ValueError("Negative Content-Length")
+        if content_length > self.__max_body_size:
+            return 413, {"error": "The body is longer than {} bytes".format(self.__max_body_size)}
+
+        path = target.path.rstrip("/").split("/")[1:]
+        if method == "POST" and path == ["jobs"]:
+            payload = json.loads(
+                (await reader.readexactly(content_length)).decode() or "null",
+                parse_constant=JobServer.__reject_constant,
+            )
+            parameters, keep_deformation = self.__validate(payload)
+            try:
+                job = self.submit(parameters, keep_deformation)
+            except OverflowError as error:
+                return 503, {"error": str(error)}
+            if parse_qs(target.query).get("wait", ["0"])[0] in ("1", "true"):
+                await job.done.wait()
+                return 200, job.to_dict()
+            return 202, job.to_dict()
+
+        if method == "GET" and len(path) == 2 and path[0] == "jobs":
+            job = self.get_job(path[1])
+            if job is None:
+                return 404, {"error": "Unknown job"}
+            return 200, job.to_dict()
+
+        return 404, {"error": "Unknown endpoint"}
+
+
+def main() -> None:
+    """
+    Runs the server from the command line.
+
+    """
+    parser = argparse.ArgumentParser(description="Plate bending calculation service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=600.0)
+    parser.add_argument("--max-body-size", type=int, default=1 << 20)
+    arguments = parser.parse_args()
+
+    async def serve() -> None:
+        server = JobServer(
+            arguments.host,
+            arguments.port,
+            arguments.workers,
+            arguments.max_pending,
+            arguments.timeout,
+            max_body_size=arguments.max_body_size,
+        )
+        await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
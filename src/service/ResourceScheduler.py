@@ -0,0 +1,296 @@
+"""
+Class that runs plate bending calculations in worker processes and
+shares the CPU cores between the processes and their BLAS threads.
+
+"""
+
+import asyncio
+import contextlib
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.queues import SimpleQueue
+from typing import Any, Callable, Dict, Final, Iterator, Optional, Set, Tuple
+
+from src.fem.FEM import FEM
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+
+# Variables read by the BLAS and OpenMP libraries when they are loaded
+_THREAD_VARIABLES: Final = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+@contextlib.contextmanager
+def _thread_environment(thread_count: int) -> Iterator[None]:
+    # Processes started inside inherit the variables, so their libraries
+    # are loaded with the given number of threads
+    saved = {name: os.environ.get(name) for name in _THREAD_VARIABLES}
+    os.environ.update({name: str(thread_count) for name in _THREAD_VARIABLES})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                del os.environ[name]
+            else:
+                os.environ[name] = value
+
+
+# Queue of the pool of a worker process through which it reports the tasks it starts
+_started_tasks: Optional[SimpleQueue] = None
+
+
+def _initialize_worker(thread_count: int, started_tasks: SimpleQueue) -> None:
+    # Runs in a worker process when it starts: the libraries that are already
+    # loaded are limited by threadpoolctl if it is installed
+    global _started_tasks
+    _started_tasks = started_tasks
+    if threadpool_limits is not None:
+        threadpool_limits(thread_count)
+
+
+def _run_task(task_id: int, function: Callable, *args: Any) -> Any:
+    # Runs in a worker process: the task is reported as started before the calculation
+    _started_tasks.put(task_id)
+    return function(*args)
+
+
+class ResourceScheduler:
+    """
+    Runs plate bending calculations in worker processes without
+    oversubscribing the CPU cores.
+
+    Every calculation reserves as many cores as it uses threads (or
+    processes) and waits until they are free. The dense and banded solvers
+    spend their time in the multithreaded BLAS, so large calculations with
+    them run in few fat workers with several BLAS threads each; the other
+    solvers and small calculations run in single-threaded workers, which
+    share the cores. The "domain-decomposition" solver reserves a core for
+    each of its processes. The workers with the same number of threads form
+    one pool; the pools are created on demand.
+
+    The number of BLAS threads of a worker is set by the environment
+    variables when the worker is started and, if threadpoolctl is installed,
+    also by it when the worker is initialized. The workers report the
+    calculations they pick up from the queue of their pool (see is_started).
+
+    Parameters
+    ----------
+    core_count : positive int or None
+        Number of CPU cores shared by the calculations; the number of CPUs by default.
+    small_size : positive int
+        Number of degrees of freedom per BLAS thread of a calculation
+        (see get_resources).
+
+    Class Attributes
+    ----------------
+    BLAS_SOLVERS : tuple
+        Solvers whose time is spent in the multithreaded BLAS.
+    SMALL_SIZE : positive int
+        Default number of degrees of freedom per BLAS thread.
+
+    """
+
+    BLAS_SOLVERS: Final = ("dense", "banded")
+    SMALL_SIZE: Final = 2000
+
+    def __init__(self, core_count: Optional[int] = None, small_size: int = SMALL_SIZE) -> None:
+        self.core_count: Final = core_count or os.cpu_count() or 1
+        self.__small_size: Final = small_size
+        self.__free_cores = self.core_count
+        self.__condition: Optional[asyncio.Condition] = None
+        self.__executors: Dict[int, ProcessPoolExecutor] = {}
+        self.__started_queues: Dict[ProcessPoolExecutor, SimpleQueue] = {}
+        self.__tasks: Dict[Future, Tuple[int, ProcessPoolExecutor]] = {}
+        self.__task_ids = itertools.count()
+        self.__started: Set[int] = set()
+
+    def get_resources(self, parameters: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Determines the cores reserved by a calculation and the number
+        of BLAS threads of its worker.
+
+        The calculations with the BLAS solvers get a thread per small_size
+        degrees of freedom, rounded down to a power of two and limited by
+        the number of cores.
+
+        Parameters
+        ----------
+        parameters : dict
+            Keyword arguments for the FEM class.
+
+        Returns
+        -------
+        tuple
+            Number of reserved cores and number of BLAS threads.
+
+        """
+        # The instance chooses the "auto" solver and sizes the system without creating the mesh
+        fem = FEM(**parameters)
+        if fem.solver == "domain-decomposition":
+            return min(parameters.get("process_count") or self.core_count, self.core_count), 1
+        if fem.solver not in ResourceScheduler.BLAS_SOLVERS:
+            return 1, 1
+        size = fem.estimate_cost().system_size
+        thread_count = 1
+        while 2 * thread_count <= min(size // self.__small_size, self.core_count):
+            thread_count *= 2
+        return thread_count, thread_count
+
+    def __get_executor(self, thread_count: int) -> ProcessPoolExecutor:
+        if thread_count not in self.__executors:
+            # Forked workers would inherit the sockets of open connections and keep them open
+            context = multiprocessing.get_context("spawn")
+            started_tasks = context.SimpleQueue()
+            executor = ProcessPoolExecutor(
+                max(self.core_count // thread_count, 1),
+                context,
+                initializer=_initialize_worker,
+                initargs=(thread_count, started_tasks),
+            )
+            self.__executors[thread_count] = executor
+            self.__started_queues[executor] = started_tasks
+        return self.__executors[thread_count]
+
+    async def submit(
+        self, parameters: Dict[str, Any], function: Callable, *args: Any
+    ) -> Future:
+        """
+        Waits until the cores of a calculation are free and starts it.
+
+        Parameters
+        ----------
+        parameters : dict
+            Keyword arguments for the FEM class that determine the
+            reserved cores (see get_resources).
+        function : callable
+            Picklable function that performs the calculation.
+        *args
+            Arguments of the function.
+
+        Returns
+        -------
+        Future
+            Future of the result. The cores are released when the
+            calculation is finished, even if nobody waits for it.
+
+        """
+        loop = asyncio.get_event_loop()
+        # The FEM instance of a large mesh takes a while to create, so it is not done in the loop
+        core_count, thread_count = await loop.run_in_executor(None, self.get_resources, parameters)
+        if self.__condition is None:
+            self.__condition = asyncio.Condition()
+        async with self.__condition:
+            await self.__condition.wait_for(lambda: self.__free_cores >= core_count)
+            self.__free_cores -= core_count
+
+        task_id = next(self.__task_ids)
+        try:
+            # Workers are started by submit, so they inherit the variables
+            with _thread_environment(thread_count):
+                executor = self.__get_executor(thread_count)
+                future = executor.submit(_run_task, task_id, function, *args)
+        except BaseException:
+            await self.__release(core_count)
+            raise
+        self.__tasks[future] = (task_id, executor)
+        future.add_done_callback(lambda _: self.__finish(future, loop, core_count))
+        return future
+
+    def __finish(self, future: Future, loop: asyncio.AbstractEventLoop, core_count: int) -> None:
+        # Called in the thread of the executor when the future is finished
+        task_id, _ = self.__tasks.pop(future)
+        self.__started.discard(task_id)
+        # The loop of a stopped server no longer runs callbacks, so nothing is reserved any more
+        if not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(lambda: asyncio.ensure_future(self.__release(core_count)))
+            except RuntimeError:
+                pass
+
+    def is_started(self, future: Future) -> bool:
+        """
+        Determines whether a worker has picked up a calculation.
+
+        A calculation submitted to a pool waits in its queue until a worker
+        is free (or started); until then it is not running.
+
+        Parameters
+        ----------
+        future : Future
+            Future returned by submit.
+
+        Returns
+        -------
+        bool
+            True if a worker has started the calculation or it is finished.
+
+        """
+        for started_tasks in list(self.__started_queues.values()):
+            while not started_tasks.empty():
+                self.__started.add(started_tasks.get())
+        if future.done():
+            return True
+        task = self.__tasks.get(future)
+        return task is not None and task[0] in self.__started
+
+    def cancel(self, future: Future) -> None:
+        """
+        Stops a calculation started by submit.
+
+        A calculation that waits for a worker is cancelled. A running one
+        cannot be interrupted, so the workers of its pool are terminated and
+        the pool is replaced by a new one on the next submit; the other
+        calculations of the pool fail with BrokenProcessPool. The cores are
+        released when the future is finished.
+
+        Parameters
+        ----------
+        future : Future
+            Future returned by submit.
+
+        """
+        if future.cancel() or future.done():
+            return
+        task = self.__tasks.get(future)
+        if task is not None:
+            self.__terminate(task[1])
+
+    def __terminate(self, executor: ProcessPoolExecutor) -> None:
+        for thread_count in [count for count, pool in self.__executors.items() if pool is executor]:
+            del self.__executors[thread_count]
+        # ProcessPoolExecutor has no public way to stop a running task; the terminated
+        # workers break the pool, which fails its futures and releases their cores
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False)
+        # The queue may be left locked by a terminated worker, so it is not read any more
+        self.__started_queues.pop(executor, None)
+
+    async def __release(self, core_count: int) -> None:
+        async with self.__condition:
+            self.__free_cores += core_count
+            self.__condition.notify_all()
+
+    def shutdown(self) -> None:
+        """
+        Shuts down the worker processes: the waiting calculations are
+        cancelled and the running ones are terminated.
+
+        """
+        for future in list(self.__tasks):
+            future.cancel()
+        for executor in list(self.__executors.values()):
+            self.__terminate(executor)
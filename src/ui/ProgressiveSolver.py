@@ -0,0 +1,134 @@
+"""
+Class that calculates the plate bending on a sequence of refining meshes
+for the live preview of the results.
+
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Final, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from src.fem.FEM import FEM
+
+
+class ProgressiveSolver(QObject):
+    """
+    Calculates the plate bending on a sequence of refining meshes
+    for the live preview of the results.
+
+    The coarsest mesh is calculated immediately in the calling thread,
+    the finer ones (each one has twice as many elements per side, up to
+    the requested counts) in a background thread. A new request makes
+    the previous one stale: its remaining meshes are not calculated and
+    the result of the mesh being calculated is discarded. The background
+    thread is stopped by shutdown, which the owner calls when it is closed.
+
+    Signals
+    -------
+    solved(FEM, bool)
+        Emitted in the thread of the object with the calculated FEM
+        instance and whether its mesh is the requested one.
+
+    Class Attributes
+    ----------------
+    COARSE_ELEMENT_COUNT : positive int
+        Maximum number of elements per side of the coarsest mesh.
+
+    """
+
+    COARSE_ELEMENT_COUNT: Final = 4
+
+    solved = pyqtSignal(object, bool)
+    __level_solved = pyqtSignal(object, bool, int)
+
+    def __init__(self, parent: QObject = None) -> None:
+        super().__init__(parent)
+        self.__executor = ThreadPoolExecutor(max_workers=1)
+        self.__generation = 0
+        self.__future: Optional[Future] = None
+        self.__level_solved.connect(self.__on_level_solved)
+
+    @staticmethod
+    def get_element_counts(h_element_count: int, v_element_count: int) -> List[Tuple[int, int]]:
+        """
+        Returns the element counts of the refining meshes.
+
+        Parameters
+        ----------
+        h_element_count : positive int
+            Requested number of finite elements horizontally.
+        v_element_count : positive int
+            Requested number of finite elements vertically.
+
+        Returns
+        -------
+        list
+            Pairs of horizontal and vertical element counts
+            from the coarsest mesh to the requested one.
+
+        """
+        counts = [(h_element_count, v_element_count)]
+        while max(counts[-1]) > ProgressiveSolver.COARSE_ELEMENT_COUNT:
+            h, v = counts[-1]
+            counts.append((max(1, (h + 1) // 2), max(1, (v + 1) // 2)))
+        return counts[::-1]
+
+    @staticmethod
+    def __solve(parameters: Dict[str, Any], counts: Tuple[int, int]) -> FEM:
+        fem = FEM(**dict(parameters, h_element_count=counts[0], v_element_count=counts[1]))
+        fem.create_mesh()
+        fem.calculate()
+        return fem
+
+    def request(self, parameters: Dict[str, Any]) -> None:
+        """
+        Starts calculating the plate with the given parameters.
+
+        Parameters
+        ----------
+        parameters : dict
+            Keyword arguments for the FEM class.
+
+        """
+        self.cancel()
+        counts = ProgressiveSolver.get_element_counts(
+            parameters["h_element_count"], parameters["v_element_count"]
+        )
+        self.solved.emit(ProgressiveSolver.__solve(parameters, counts[0]), len(counts) == 1)
+        if len(counts) > 1:
+            self.__future = self.__executor.submit(self.__refine, self.__generation, parameters, counts[1:])
+
+    def cancel(self) -> None:
+        """
+        Makes the current request stale.
+
+        """
+        self.__generation += 1
+        # A refinement that has not started yet is dropped from the queue
+        if self.__future is not None:
+            self.__future.cancel()
+            self.__future = None
+
+    def shutdown(self) -> None:
+        """
+        Makes the current request stale and stops the background thread.
+        The mesh being calculated is finished first, but not waited for.
+
+        """
+        self.cancel()
+        self.__executor.shutdown(wait=False)
+
+    def __refine(self, generation: int, parameters: Dict[str, Any], counts: List[Tuple[int, int]]) -> None:
+        for i, level_counts in enumerate(counts):
+            if generation != self.__generation:
+                return
+            fem = ProgressiveSolver.__solve(parameters, level_counts)
+            if generation != self.__generation:
+                return
+            # Emitted from the background thread, delivered to the thread of the object
+            self.__level_solved.emit(fem, i == len(counts) - 1, generation)
+
+    def __on_level_solved(self, fem: FEM, final: bool, generation: int) -> None:
+        if generation == self.__generation:
+            self.solved.emit(fem, final)
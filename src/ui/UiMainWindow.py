@@ -401,9 +401,17 @@ class Ui_MainWindow(object):
         self.makeCalculationPushButton.setFont(font)
         self.makeCalculationPushButton.setObjectName("makeCalculationPushButton")
         self.verticalLayout_7.addWidget(self.makeCalculationPushButton)
+        self.livePreviewCheckBox = QtWidgets.QCheckBox(self.centralwidget)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(10)
+        self.livePreviewCheckBox.setFont(font)
+        self.livePreviewCheckBox.setObjectName("livePreviewCheckBox")
+        self.verticalLayout_7.addWidget(self.livePreviewCheckBox)
         self.verticalLayout_7.setStretch(0, 100)
         self.verticalLayout_7.setStretch(1, 1)
         self.verticalLayout_7.setStretch(2, 1)
+        self.verticalLayout_7.setStretch(3, 1)
         self.horizontalLayout_14.addLayout(self.verticalLayout_7)
         self.horizontalLayout_15 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_15.setObjectName("horizontalLayout_15")
@@ -450,3 +458,4 @@ class Ui_MainWindow(object):
         self.label_10.setText(_translate("MainWindow", "По вертикали"))
         self.createMeshPushButton.setText(_translate("MainWindow", "Сетка"))
         self.makeCalculationPushButton.setText(_translate("MainWindow", "Расчёт"))
+        self.livePreviewCheckBox.setText(_translate("MainWindow", "Предпросмотр"))
@@ -0,0 +1,176 @@
+"""
+Class that displays a large nodal field on the axes with
+a resolution matching the size of the canvas.
+
+"""
+
+import math
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+from matplotlib.image import AxesImage
+
+
+class LevelOfDetailImage:
+    """
+    Displays a large nodal field on the axes with a resolution matching
+    the size of the canvas.
+
+    The visible part of the field is reduced by averaging blocks of
+    2^level x 2^level values, where the level is the smallest one at which
+    the part fits into the pixels of the axes. The visible part is rounded
+    out to whole tiles of the level, and the rendered windows are cached,
+    so panning inside a window or resizing without changing the level
+    reuses the cached image and only zooming refines it.
+
+    Parameters
+    ----------
+    image : AxesImage
+        Image that shows the field.
+    max_cache_size : positive int
+        Maximum number of cached windows.
+
+    Class Attributes
+    ----------------
+    TILE_SIZE : positive int
+        Size of a tile in values of the reduced field.
+
+    """
+
+    TILE_SIZE = 64
+
+    def __init__(self, image: AxesImage, max_cache_size: int = 16) -> None:
+        self.__image = image
+        self.__max_cache_size = max_cache_size
+        self.__field: Optional[np.ndarray] = None
+        self.__extent: Tuple[float, float, float, float] = (0, 1, 0, 1)
+        self.__cache: "OrderedDict[tuple, Tuple[np.ndarray, tuple]]" = OrderedDict()
+        self.__shown_key: Optional[tuple] = None
+        self.__updating = False
+
+        axes = image.axes
+        axes.callbacks.connect("xlim_changed", self.__on_change)
+        axes.callbacks.connect("ylim_changed", self.__on_change)
+        axes.figure.canvas.mpl_connect("resize_event", self.__on_change)
+
+    def set_field(self, field: np.ndarray, extent: Tuple[float, float, float, float]) -> None:
+        """
+        Sets the field to display and shows it entirely.
+
+        Parameters
+        ----------
+        field : ndarray
+            Values of the field in the form of a matrix.
+        extent : tuple
+            Left, right, bottom and top boundaries of the field.
+
+        """
+        self.__field = np.asarray(field, dtype=float)
+        self.__extent = extent
+        self.__cache.clear()
+        self.__shown_key = None
+
+        self.__image.set_clim(np.nanmin(self.__field), np.nanmax(self.__field))
+        axes = self.__image.axes
+        axes.set_aspect("equal")
+        # Fixed limits, so that changing the extent of the image does not autoscale the axes
+        axes.set_autoscale_on(False)
+        axes.set_xlim(extent[0], extent[1])
+        axes.set_ylim(extent[2], extent[3])
+        self.update()
+
+    def __on_change(self, *args) -> None:
+        if self.__image.get_visible() and not self.__updating:
+            self.update()
+
+    def __window(self) -> tuple:
+        axes = self.__image.axes
+        left, right, bottom, top = self.__extent
+        rows, columns = self.__field.shape
+        upper = self.__image.origin == "upper"
+
+        c0, c1 = self.__index_range(axes.get_xlim(), left, right, columns)
+        if upper:
+            r0, r1 = self.__index_range(axes.get_ylim(), top, bottom, rows)
+        else:
+            r0, r1 = self.__index_range(axes.get_ylim(), bottom, top, rows)
+
+        bbox = axes.get_window_extent()
+        width = max(1.0, bbox.width)
+        height = max(1.0, bbox.height)
+        stride = max(1.0, (c1 - c0) / width, (r1 - r0) / height)
+        level = int(math.ceil(math.log2(stride)))
+
+        tile = LevelOfDetailImage.TILE_SIZE << level
+        return (
+            level,
+            r0 // tile * tile,
+            min(rows, -(-r1 // tile) * tile),
+            c0 // tile * tile,
+            min(columns, -(-c1 // tile) * tile),
+        )
+
+    @staticmethod
+    def __index_range(limits: Tuple[float, float], start: float, stop: float, count: int) -> Tuple[int, int]:
+        # Index of the cells of the image (each value occupies one cell) that are visible
+        step = (stop - start) / count
+        low, high = sorted(((limits[0] - start) / step, (limits[1] - start) / step))
+        low = min(count - 1, max(0, int(math.floor(low))))
+        high = max(low + 1, min(count, int(math.ceil(high))))
+        return low, high
+
+    def __render(self, key: tuple) -> Tuple[np.ndarray, tuple]:
+        level, r0, r1, c0, c1 = key
+        window = self.__field[r0:r1, c0:c1]
+        if level > 0:
+            block = 1 << level
+            row_starts = np.arange(0, window.shape[0], block)
+            column_starts = np.arange(0, window.shape[1], block)
+            sums = np.add.reduceat(np.add.reduceat(window, row_starts, axis=0), column_starts, axis=1)
+            counts = np.outer(
+                np.diff(np.append(row_starts, window.shape[0])),
+                np.diff(np.append(column_starts, window.shape[1])),
+            )
+            window = sums / counts
+
+        left, right, bottom, top = self.__extent
+        rows, columns = self.__field.shape
+        dx = (right - left) / columns
+        dy = (top - bottom) / rows
+        if self.__image.origin == "upper":
+            extent = (left + c0 * dx, left + c1 * dx, top - r1 * dy, top - r0 * dy)
+        else:
+            extent = (left + c0 * dx, left + c1 * dx, bottom + r0 * dy, bottom + r1 * dy)
+        return window, extent
+
+    def update(self) -> None:
+        """
+        Shows the window of the field matching the current limits
+        and size of the axes.
+
+        """
+        if self.__field is None:
+            return
+        key = self.__window()
+        if key == self.__shown_key:
+            return
+
+        if key in self.__cache:
+            self.__cache.move_to_end(key)
+        else:
+            self.__cache[key] = self.__render(key)
+            if len(self.__cache) > self.__max_cache_size:
+                self.__cache.popitem(last=False)
+
+        data, extent = self.__cache[key]
+        self.__updating = True
+        try:
+            self.__image.set_data(data)
+            self.__image.set_extent(extent)
+            # The window must not stick the margins of the axes to its boundaries
+            self.__image.sticky_edges.x[:] = []
+            self.__image.sticky_edges.y[:] = []
+        finally:
+            self.__updating = False
+        self.__shown_key = key
@@ -3,6 +3,11 @@ Class for drawing graphs using matplotlib.
 
 """
 
+import time
+from typing import Final, Optional
+
+from PyQt5.QtCore import QPoint, QRect, QTimer
+from PyQt5.QtGui import QPainter, QPaintEvent, QPixmap, QResizeEvent
 from PyQt5.QtWidgets import QSizePolicy
 
 import matplotlib
@@ -15,6 +20,12 @@ class MatplotlibCanvas(FigureCanvasQTAgg):
     """
     Canvas for drawing graphs using matplotlib.
 
+    Resizing is debounced: while resize events keep coming, the last
+    rendered picture is scaled to the new size, and the figure is resized
+    and drawn (with the constrained layout solved) once the events stop
+    for RESIZE_DELAY milliseconds, or at least every MAX_RESIZE_DELAY
+    milliseconds during a long resize.
+
     Attributes
     ----------
     fig : Figure
@@ -22,8 +33,18 @@ class MatplotlibCanvas(FigureCanvasQTAgg):
     ax : Axes
         Used for creating and editing graphs.
 
+    Class Attributes
+    ----------------
+    RESIZE_DELAY : positive int
+        Pause in resize events (ms) after which the figure is redrawn.
+    MAX_RESIZE_DELAY : positive int
+        Maximum time (ms) the figure is shown as a scaled picture.
+
     """
 
+    RESIZE_DELAY: Final = 150
+    MAX_RESIZE_DELAY: Final = 1000
+
     def __init__(self) -> None:
         matplotlib.rcParams.update({"font.size": 10})
         self.fig: Figure = Figure(constrained_layout=True)
@@ -31,3 +52,56 @@ class MatplotlibCanvas(FigureCanvasQTAgg):
         super().__init__(self.fig)
         FigureCanvasQTAgg.setSizePolicy(self, QSizePolicy.Preferred, QSizePolicy.Preferred)
         FigureCanvasQTAgg.updateGeometry(self)
+
+        self.__preview: Optional[QPixmap] = None
+        self.__resize_started: float = 0
+        self.__resize_timer = QTimer(self)
+        self.__resize_timer.setSingleShot(True)
+        self.__resize_timer.timeout.connect(self.__finish_resize)
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        """
+        Called when the canvas is resized.
+
+        Parameters
+        ----------
+        event : QResizeEvent
+            Event when the canvas is resized.
+
+        """
+        if self.__preview is None:
+            if not event.oldSize().isValid():
+                super().resizeEvent(event)
+                return
+            # The picture of the previous size is still in the buffer of the canvas
+            self.__preview = self.grab(QRect(QPoint(0, 0), event.oldSize()))
+            self.__resize_started = time.monotonic()
+
+        elapsed = (time.monotonic() - self.__resize_started) * 1000
+        if elapsed >= MatplotlibCanvas.MAX_RESIZE_DELAY:
+            self.__finish_resize()
+        else:
+            self.__resize_timer.start(MatplotlibCanvas.RESIZE_DELAY)
+
+    def __finish_resize(self) -> None:
+        self.__resize_timer.stop()
+        self.__preview = None
+        size = self.size()
+        super().resizeEvent(QResizeEvent(size, size))
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """
+        Called when the canvas is repainted.
+
+        Parameters
+        ----------
+        event : QPaintEvent
+            Event when the canvas is repainted.
+
+        """
+        if self.__preview is None:
+            super().paintEvent(event)
+        else:
+            painter = QPainter(self)
+            painter.drawPixmap(self.rect(), self.__preview)
+            painter.end()
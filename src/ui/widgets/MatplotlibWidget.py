@@ -4,8 +4,11 @@ matplotlib library and displays them in the GUI.
 
 """
 
+from typing import Callable, Dict
+
 from PyQt5.QtWidgets import QWidget, QVBoxLayout
 
+from matplotlib.artist import Artist
 from matplotlib.axes import Axes
 
 from src.ui.widgets.MatplotlibCanvas import MatplotlibCanvas
@@ -26,6 +29,7 @@ class MatplotlibWidget(QWidget):
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.__canvas: MatplotlibCanvas = MatplotlibCanvas()
+        self.__artists: Dict[str, Artist] = {}
         self.__vbl = QVBoxLayout()
         self.__vbl.setContentsMargins(0, 0, 0, 0)
         self.__vbl.addWidget(self.__canvas)
@@ -37,6 +41,8 @@ class MatplotlibWidget(QWidget):
     def update_widget(self, width: int, height: int) -> None:
         """
         Updates the graph (MatplotlibWidget) size when the parent widget is resized.
+        The figure itself is resized and redrawn by the canvas when
+        the resizing stops.
 
         Parameters
         ----------
@@ -47,7 +53,6 @@ class MatplotlibWidget(QWidget):
 
         """
         self.setFixedSize(width, height)
-        self.__canvas.fig.set_size_inches(width * 0.95 / self.__dpi, height * 0.96 / self.__dpi)
 
     @property
     def ax(self) -> Axes:
@@ -62,14 +67,52 @@ class MatplotlibWidget(QWidget):
         """
         return self.__canvas.ax
 
+    def artist(self, name: str, create: Callable[[Axes], Artist]) -> Artist:
+        """
+        Returns the artist that is reused between plots under the given name.
+
+        Parameters
+        ----------
+        name : str
+            Name of the artist.
+        create : callable
+            Creates the artist on the axes if it does not exist yet.
+
+        Returns
+        -------
+        Artist
+            The visible artist whose data can be updated
+            (set_segments, set_offsets, set_data).
+
+        """
+        if name not in self.__artists:
+            self.__artists[name] = create(self.ax)
+        artist = self.__artists[name]
+        artist.set_visible(True)
+        return artist
+
     def clear(self) -> None:
         """
-        Completely clears the chart widget.
+        Clears the chart widget.
+        Artists created with the artist method are hidden instead
+        of being removed, so that the next plot can reuse them.
 
         """
         if len(self.ax.images) > 0 and self.ax.images[-1].colorbar is not None:
             self.ax.images[-1].colorbar.remove()
-        self.ax.clear()
+
+        reused = set(self.__artists.values())
+        for artist in list(self.ax.images) + list(self.ax.lines) + list(self.ax.collections):
+            if artist in reused:
+                artist.set_visible(False)
+            else:
+                artist.remove()
+        if self.ax.get_legend() is not None:
+            self.ax.get_legend().remove()
+
+        self.ax.set_aspect("auto")
+        self.ax.set_autoscale_on(True)
+        self.ax.relim(visible_only=True)
 
     def draw(self) -> None:
         """
@@ -0,0 +1,90 @@
+"""
+Tests of the exact Navier and Levy solutions and of the finite element
+solutions against them.
+
+"""
+
+import numpy as np
+import pytest
+
+from src.fem.AccuracyBenchmark import AccuracyBenchmark
+from src.fem.AnalyticalSolution import AnalyticalSolution
+from src.fem.FEM import FEM
+
+
+PARAMETERS = dict(width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3)
+
+
+def get_rigidity() -> float:
+    return PARAMETERS["young"] * PARAMETERS["thickness"] ** 3 / (12 * (1 - PARAMETERS["poisson"] ** 2))
+
+
+@pytest.mark.parametrize(
+    "support, coefficient",
+    # Coefficients of q a^4 / D of the square plate tabulated by Timoshenko
+    [("simply-supported", 0.00406), ("simply-supported-clamped", 0.00192)],
+)
+def test_square_plate_matches_tabulated_deflection(support, coefficient):
+    parameters = dict(PARAMETERS, height=PARAMETERS["width"])
+    deflection = AnalyticalSolution(support=support, **parameters).get_max_deflection()
+    expected = coefficient * PARAMETERS["pressure"] * PARAMETERS["width"] ** 4 / get_rigidity()
+    assert deflection == pytest.approx(expected, rel=5e-3)
+
+
+def test_solutions_vanish_on_supported_edges():
+    for support in AnalyticalSolution.SUPPORTS:
+        solution = AnalyticalSolution(support=support, **PARAMETERS)
+        edge = np.linspace(0, 1, 11)
+        deflections = np.concatenate(
+            (
+                solution.get_deflection(0, edge * PARAMETERS["height"]),
+                solution.get_deflection(PARAMETERS["width"], edge * PARAMETERS["height"]),
+                solution.get_deflection(edge * PARAMETERS["width"], 0),
+                solution.get_deflection(edge * PARAMETERS["width"], PARAMETERS["height"]),
+            )
+        )
+        np.testing.assert_allclose(deflections, 0, atol=1e-9 * solution.get_max_deflection())
+
+
+@pytest.mark.parametrize("support", AnalyticalSolution.SUPPORTS)
+def test_conforming_element_matches_exact_deflections(support):
+    fem = FEM(
+        **PARAMETERS, h_element_count=16, v_element_count=16, solver="direct", element="bfs", support=support
+    )
+    fem.create_mesh()
+    fem.calculate()
+    solution = AnalyticalSolution(support=support, **PARAMETERS)
+    coordinates = fem.node_coordinates
+    expected = solution.get_deflection(coordinates[:, 0], coordinates[:, 1])
+    np.testing.assert_allclose(
+        fem.nodal_solution[:, 0], expected, rtol=0, atol=1e-4 * solution.get_max_deflection()
+    )
+
+
+@pytest.mark.parametrize("support", AnalyticalSolution.SUPPORTS)
+def test_plate_element_converges_to_exact_deflection(support):
+    reference = AnalyticalSolution(support=support, **PARAMETERS).get_max_deflection()
+    errors = []
+    for element_count in (4, 8, 16):
+        fem = FEM(**PARAMETERS, h_element_count=element_count, v_element_count=element_count, support=support)
+        fem.create_mesh()
+        fem.calculate()
+        errors.append(abs(fem.get_max_node_deformation() / reference - 1))
+    # The error of the element decreases as the square of the element size
+    assert errors[-1] < 0.01
+    assert errors[1] < errors[0] / 3 and errors[2] < errors[1] / 3
+
+
+def test_benchmark_accepts_finite_element_only_arguments():
+    benchmark = AccuracyBenchmark(
+        dict(PARAMETERS, density=7.85e-9),
+        supports=["simply-supported"],
+        solvers=["direct"],
+        element_counts=(4, 8),
+    )
+    records = {(record.element, record.element_count): record for record in benchmark.records}
+    assert set(records) == {("acm", 4), ("acm", 8), ("bfs", 4), ("bfs", 8)}
+    # The conforming element has four degrees of freedom per node
+    assert records["bfs", 8].dof_count > records["acm", 8].dof_count
+    assert records["bfs", 8].estimated_memory > records["acm", 8].estimated_memory
+    assert records["bfs", 8].error < records["acm", 8].error
@@ -0,0 +1,55 @@
+"""
+Tests of the batched sweep against the sequential one.
+
+"""
+
+import numpy as np
+
+from src.fem.BatchSweep import BatchSweep
+from src.fem.Sweep import Sweep
+
+
+BASE = dict(
+    width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3,
+    h_element_count=4, v_element_count=4,
+)
+
+
+def test_results_match_sequential_sweep():
+    parameter_sets = list(
+        Sweep.grid(
+            BASE,
+            poisson=[0.2, 0.3],
+            thickness=[8, 10],
+            support=["corners", "simply-supported"],
+            element=["acm", "bfs"],
+        )
+    )
+    expected = list(Sweep(parameter_sets, keep_deformation=True))
+    # The batches split the plates with the same mesh
+    results = list(BatchSweep(parameter_sets, keep_deformation=True, batch_size=3))
+
+    assert [result.parameters for result in results] == parameter_sets
+    for result, reference in zip(results, expected):
+        np.testing.assert_allclose(result.max_deformation, reference.max_deformation, rtol=1e-9)
+        np.testing.assert_allclose(
+            result.deformation, reference.deformation, rtol=0, atol=1e-9 * reference.max_deformation
+        )
+
+
+def test_cut_out_plates_match_sequential_sweep():
+    parameter_sets = [
+        dict(BASE, h_element_count=8, v_element_count=8, cutouts=[[300, 300, 600, 500]], pressure=pressure)
+        for pressure in (0.01, 0.02)
+    ]
+    expected = list(Sweep(parameter_sets, keep_deformation=True))
+    results = list(BatchSweep(parameter_sets, keep_deformation=True))
+    for result, reference in zip(results, expected):
+        np.testing.assert_allclose(result.max_deformation, reference.max_deformation, rtol=1e-9)
+        np.testing.assert_allclose(
+            result.deformation,
+            reference.deformation,
+            rtol=0,
+            atol=1e-9 * reference.max_deformation,
+            equal_nan=True,
+        )
@@ -0,0 +1,46 @@
+"""
+Tests of the linear buckling analysis.
+
+"""
+
+import numpy as np
+import pytest
+
+from src.fem.FEM import FEM
+
+
+WIDTH, HEIGHT, THICKNESS, YOUNG, POISSON = 1000, 800, 10, 200000, 0.3
+
+
+def get_critical_stress() -> float:
+    # Simply supported plate compressed along x: the critical number of half-waves minimizes k
+    rigidity = YOUNG * THICKNESS ** 3 / (12 * (1 - POISSON ** 2))
+    k = min((m * HEIGHT / WIDTH + WIDTH / (m * HEIGHT)) ** 2 for m in range(1, 10))
+    return k * np.pi ** 2 * rigidity / (HEIGHT ** 2 * THICKNESS)
+
+
+def create_plate(element_count: int = 16) -> FEM:
+    fem = FEM(
+        WIDTH, HEIGHT, THICKNESS, 0.01, YOUNG, POISSON, element_count, element_count,
+        solver="direct", element="bfs", support="simply-supported",
+    )
+    fem.create_mesh()
+    return fem
+
+
+def test_factor_matches_uniaxial_compression():
+    fem = create_plate()
+    fem.calculate_buckling(-1.0, 0.0)
+    assert fem.buckling_factors[0] == pytest.approx(get_critical_stress(), rel=1e-3)
+
+
+def test_factor_is_inverse_to_stress():
+    fem = create_plate()
+    fem.calculate_buckling(-2.0, 0.0)
+    assert fem.buckling_factors[0] == pytest.approx(get_critical_stress() / 2, rel=1e-3)
+
+
+def test_tension_does_not_buckle():
+    fem = create_plate(4)
+    fem.calculate_buckling(1.0, 1.0)
+    assert np.isinf(fem.buckling_factors[0])
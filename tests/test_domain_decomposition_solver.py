@@ -0,0 +1,126 @@
+"""
+Tests of the domain decomposition solver with worker processes.
+
+"""
+
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+from scipy.sparse.linalg import spsolve
+
+from src.fem.DomainDecompositionSolver import DomainDecompositionSolver
+from src.fem.FEM import FEM
+from src.fem.MatrixFreeOperator import MatrixFreeOperator
+
+
+PARAMETERS = dict(
+    width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3, support="simply-supported"
+)
+SHARED_MEMORY_DIRECTORY = "/dev/shm"
+
+
+def create_system(h_element_count: int, v_element_count: int):
+    fem = FEM(**PARAMETERS, h_element_count=h_element_count, v_element_count=v_element_count, solver="direct")
+    fem.create_mesh()
+    operator = MatrixFreeOperator(
+        h_element_count, v_element_count, fem.local_stiffness_matrix, fem.fixed_dofs
+    )
+    forces = np.where(
+        fem.fixed_dofs, 0, fem.assemble_pressure_load(np.full(h_element_count * v_element_count, 0.01))
+    )
+    return fem, operator, forces
+
+
+def create_solver(fem: FEM, operator: MatrixFreeOperator, process_count: int) -> DomainDecompositionSolver:
+    return DomainDecompositionSolver(
+        operator, fem.width / fem.h_element_count, fem.height / fem.v_element_count, process_count
+    )
+
+
+def get_shared_memory_names():
+    return set(os.listdir(SHARED_MEMORY_DIRECTORY))
+
+
+@pytest.mark.parametrize(
+    "h_element_count, v_element_count, has_coarse_space",
+    # 40 x 40 elements are coarsened to 20 x 20, 41 x 40 cannot be halved
+    [(40, 40, True), (41, 40, False), (16, 16, False)],
+)
+@pytest.mark.parametrize("process_count", [1, 3])
+def test_solution_matches_direct_solve(h_element_count, v_element_count, has_coarse_space, process_count):
+    fem, operator, forces = create_system(h_element_count, v_element_count)
+    expected = spsolve(operator.assemble().tocsc(), forces)
+    with create_solver(fem, operator, process_count) as solver:
+        assert solver.subdomain_count == process_count
+        coarse_solver = solver._DomainDecompositionSolver__coarse_solver
+        assert (coarse_solver is not None) == has_coarse_space
+        solution = solver.solve(forces)
+    np.testing.assert_allclose(solution, expected, rtol=0, atol=1e-8 * np.abs(expected).max())
+
+
+def test_coarse_space_bounds_iterations_of_many_subdomains():
+    fem, operator, forces = create_system(40, 40)
+    iterations = {}
+    for process_count in (4, 16):
+        with create_solver(fem, operator, process_count) as solver:
+            solver.solve(forces)
+            iterations[process_count] = solver.iterations
+            # The same subdomains without the coarse correction
+            solver._DomainDecompositionSolver__coarse_solver = None
+            solver.solve(forces)
+            one_level_iterations = solver.iterations
+    assert iterations[16] <= iterations[4] + 4
+    assert iterations[16] < one_level_iterations
+
+
+def test_uneven_strips_cover_all_columns():
+    # 17 node columns are split into strips of 6, 5 and 6 columns
+    fem, operator, forces = create_system(16, 8)
+    with create_solver(fem, operator, 3) as solver:
+        rows = solver._DomainDecompositionSolver__global_rows
+        solution = solver.solve(forces)
+    assert rows[0][0] == 0 and rows[-1][1] == operator.shape[0]
+    assert all(first < previous_last for (_, previous_last), (first, _) in zip(rows[:-1], rows[1:]))
+    expected = spsolve(operator.assemble().tocsc(), forces)
+    np.testing.assert_allclose(solution, expected, rtol=0, atol=1e-8 * np.abs(expected).max())
+
+
+def test_fem_calculation_matches_direct_solver():
+    direct = FEM(**PARAMETERS, h_element_count=24, v_element_count=16, solver="direct")
+    direct.create_mesh()
+    direct.calculate()
+    fem = FEM(
+        **PARAMETERS, h_element_count=24, v_element_count=16, solver="domain-decomposition", process_count=2
+    )
+    fem.create_mesh()
+    fem.calculate()
+    expected = direct.get_nodes_deformation_for_plot()
+    np.testing.assert_allclose(
+        fem.get_nodes_deformation_for_plot(), expected, rtol=0, atol=1e-8 * np.abs(expected).max()
+    )
+
+
+@pytest.mark.skipif(not os.path.isdir(SHARED_MEMORY_DIRECTORY), reason="Shared memory is not listed")
+def test_workers_are_cleaned_up_after_worker_error():
+    # The subdomain matrices are zero, so their factorization in the workers fails
+    operator = MatrixFreeOperator(8, 8, np.zeros((12, 12)), np.zeros(3 * 9 * 9, dtype=bool))
+    shared_memory_names = get_shared_memory_names()
+    with pytest.raises(RuntimeError, match="singular"):
+        DomainDecompositionSolver(operator, 125, 100, 2)
+    assert not multiprocessing.active_children()
+    assert get_shared_memory_names() == shared_memory_names
+
+
+@pytest.mark.skipif(not os.path.isdir(SHARED_MEMORY_DIRECTORY), reason="Shared memory is not listed")
+def test_workers_are_cleaned_up_after_error_in_solve():
+    fem, operator, forces = create_system(16, 16)
+    shared_memory_names = get_shared_memory_names()
+    with pytest.raises(ValueError):
+        with create_solver(fem, operator, 2) as solver:
+            assert len(multiprocessing.active_children()) == 2
+            # The right-hand side does not match the system
+            solver.solve(forces[:-1])
+    assert not multiprocessing.active_children()
+    assert get_shared_memory_names() == shared_memory_names
@@ -0,0 +1,80 @@
+"""
+Tests of the local matrices of the plate element.
+
+"""
+
+import numpy as np
+
+from src.fem.Element import Element
+
+
+WIDTH, HEIGHT, THICKNESS, PRESSURE, YOUNG, POISSON = 1000.0, 800.0, 10.0, 0.01, 200000.0, 0.3
+
+
+def get_navier_deflection(x: float, y: float, term_count: int = 100) -> float:
+    # Double sine series of the uniformly loaded simply supported plate
+    orders = np.arange(1, 2 * term_count, 2)
+    m, n = np.meshgrid(orders, orders, indexing="ij")
+    rigidity = YOUNG * THICKNESS ** 3 / (12 * (1 - POISSON ** 2))
+    series = np.sin(m * np.pi * x / WIDTH) * np.sin(n * np.pi * y / HEIGHT)
+    series /= m * n * (m ** 2 / WIDTH ** 2 + n ** 2 / HEIGHT ** 2) ** 2
+    return 16 * PRESSURE / (np.pi ** 6 * rigidity) * series.sum()
+
+
+def solve_simply_supported(element_count: int, local_forces: np.ndarray) -> float:
+    # Deflection at the center of the simply supported plate assembled from the local matrices
+    Element.set_parameters(
+        WIDTH / element_count, HEIGHT / element_count, THICKNESS, PRESSURE, YOUNG, POISSON
+    )
+    stiffness = Element.get_local_stiffness_matrix()
+    node_count = element_count + 1
+    size = 3 * node_count ** 2
+    matrix = np.zeros((size, size))
+    forces = np.zeros(size)
+    for i in range(element_count):
+        for j in range(element_count):
+            first = i * node_count + j
+            nodes = [first, first + 1, first + node_count + 1, first + node_count]
+            dofs = (3 * np.array(nodes)[:, np.newaxis] + np.arange(3)).ravel()
+            matrix[np.ix_(dofs, dofs)] += stiffness
+            forces[dofs] += local_forces
+
+    i, j = np.divmod(np.arange(node_count ** 2), node_count)
+    vertical_edges = (i == 0) | (i == element_count)
+    horizontal_edges = (j == 0) | (j == element_count)
+    fixed = np.zeros((node_count ** 2, 3), dtype=bool)
+    fixed[vertical_edges | horizontal_edges, 0] = True
+    fixed[vertical_edges, 1] = True
+    fixed[horizontal_edges, 2] = True
+    free = ~fixed.ravel()
+    solution = np.zeros(size)
+    solution[free] = np.linalg.solve(matrix[np.ix_(free, free)], forces[free])
+    center = element_count // 2 * node_count + element_count // 2
+    return solution[3 * center]
+
+
+def test_stiffness_matrix_is_positive_semidefinite():
+    Element.set_parameters(62.5, 50.0, THICKNESS, PRESSURE, YOUNG, POISSON)
+    matrix = Element.get_local_stiffness_matrix()
+    np.testing.assert_allclose(matrix, matrix.T, rtol=0, atol=1e-9 * np.abs(matrix).max())
+    eigenvalues = np.linalg.eigvalsh(matrix)
+    # Three rigid body motions: the translation and the rotations about the axes
+    assert np.all(eigenvalues[:3] > -1e-9 * eigenvalues[-1])
+    assert np.all(np.abs(eigenvalues[:3]) < 1e-9 * eigenvalues[-1])
+    assert np.all(eigenvalues[3:] > 1e-6 * eigenvalues[-1])
+
+
+def test_nodal_forces_sum_to_element_load():
+    Element.set_parameters(62.5, 50.0, THICKNESS, PRESSURE, YOUNG, POISSON)
+    forces = Element.get_local_nodal_force_matrix()
+    np.testing.assert_allclose(forces[::3].sum(), PRESSURE * 62.5 * 50.0)
+
+
+def test_simply_supported_plate_matches_navier_solution():
+    element_count = 16
+    Element.set_parameters(
+        WIDTH / element_count, HEIGHT / element_count, THICKNESS, PRESSURE, YOUNG, POISSON
+    )
+    deflection = solve_simply_supported(element_count, Element.get_local_nodal_force_matrix())
+    reference = get_navier_deflection(WIDTH / 2, HEIGHT / 2)
+    assert abs(deflection - reference) < 0.01 * reference
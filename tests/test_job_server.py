@@ -0,0 +1,147 @@
+"""
+Tests of the calculation service on localhost.
+
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, Tuple
+
+import pytest
+
+from src.fem.Sweep import Sweep
+from src.service.JobServer import JobServer
+
+
+PARAMETERS = dict(
+    width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3,
+    h_element_count=6, v_element_count=6,
+)
+# Dense solve of about six seconds
+SLOW_PARAMETERS = dict(PARAMETERS, h_element_count=48, v_element_count=48, solver="dense")
+
+
+async def request(port: int, method: str, path: str, body: Any = None) -> Tuple[int, Dict[str, Any]]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = b"" if body is None else body if isinstance(body, bytes) else json.dumps(body).encode()
+    header = "{} {} HTTP/1.1\r\nContent-Length: {}\r\n\r\n".format(method, path, len(data))
+    writer.write(header.encode() + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def serve(test, **options) -> None:
+    async def run():
+        server = JobServer(port=0, max_workers=1, **options)
+        await server.start()
+        try:
+            await test(server.port)
+        finally:
+            await server.stop()
+
+    asyncio.run(run())
+
+
+def test_submit_and_wait():
+    async def test(port):
+        status, body = await request(port, "POST", "/jobs?wait=1", {"parameters": PARAMETERS})
+        assert status == 200 and body["status"] == "done"
+        expected = Sweep.solve(PARAMETERS)
+        assert body["result"]["max_deformation"] == pytest.approx(expected.max_deformation)
+        assert body["result"]["deformation"] is None
+
+        payload = {"parameters": PARAMETERS, "keep_deformation": True}
+        status, job = await request(port, "POST", "/jobs", payload)
+        assert status == 202 and job["status"] in ("queued", "running")
+        deadline = time.monotonic() + 60
+        while job["status"] not in ("done", "failed"):
+            assert time.monotonic() < deadline
+            await asyncio.sleep(0.05)
+            status, job = await request(port, "GET", "/jobs/" + job["id"])
+            assert status == 200
+        assert job["status"] == "done"
+        assert len(job["result"]["deformation"]) == PARAMETERS["h_element_count"] + 1
+
+    serve(test)
+
+
+def test_removed_nodes_are_null():
+    async def test(port):
+        parameters = dict(PARAMETERS, h_element_count=8, v_element_count=8, cutouts=[[300, 300, 600, 500]])
+        payload = {"parameters": parameters, "keep_deformation": True}
+        _, body = await request(port, "POST", "/jobs?wait=1", payload)
+        assert body["status"] == "done"
+        assert None in sum(body["result"]["deformation"], [])
+
+    serve(test)
+
+
+def test_identical_payloads_share_job():
+    async def test(port):
+        _, first = await request(port, "POST", "/jobs", {"parameters": SLOW_PARAMETERS})
+        _, second = await request(port, "POST", "/jobs", {"parameters": SLOW_PARAMETERS})
+        _, other = await request(port, "POST", "/jobs", {"parameters": PARAMETERS})
+        assert first["id"] == second["id"] != other["id"]
+
+    serve(test)
+
+
+def test_unfinished_jobs_are_limited():
+    async def test(port):
+        status, _ = await request(port, "POST", "/jobs", {"parameters": SLOW_PARAMETERS})
+        assert status == 202
+        status, body = await request(port, "POST", "/jobs", {"parameters": PARAMETERS})
+        assert status == 503 and "Too many" in body["error"]
+
+    serve(test, max_pending=1)
+
+
+def test_invalid_requests_are_rejected():
+    async def test(port):
+        status, body = await request(port, "POST", "/jobs", {"parameters": dict(PARAMETERS, color="red")})
+        assert status == 400 and "color" in body["error"]
+        status, _ = await request(port, "POST", "/jobs", {"parameters": {"width": 1000}})
+        assert status == 400
+        status, _ = await request(port, "POST", "/jobs", b'{"parameters": {"width": NaN}}')
+        assert status == 400
+        status, _ = await request(port, "POST", "/jobs", b"{")
+        assert status == 400
+        status, _ = await request(port, "POST", "/jobs", b" " * 5000)
+        assert status == 413
+        status, _ = await request(port, "GET", "/jobs/unknown")
+        assert status == 404
+
+    serve(test, max_body_size=4096)
+
+
+def test_timeout_terminates_worker_and_releases_cores():
+    async def test(port):
+        start = time.monotonic()
+        _, body = await request(port, "POST", "/jobs?wait=1", {"parameters": SLOW_PARAMETERS})
+        assert body["status"] == "timeout"
+        assert time.monotonic() - start < 10
+        # The only core is free again and a new pool runs the next job
+        # (the timeout covers the start of the worker, about half a second)
+        _, body = await request(port, "POST", "/jobs?wait=1", {"parameters": PARAMETERS})
+        assert body["status"] == "done"
+
+    serve(test, timeout=2)
+
+
+def test_stop_fails_unfinished_jobs(capfd):
+    async def run():
+        server = JobServer(port=0, max_workers=1)
+        await server.start()
+        _, body = await request(server.port, "POST", "/jobs", {"parameters": SLOW_PARAMETERS})
+        await asyncio.sleep(0.5)
+        await server.stop()
+        return server.get_job(body["id"])
+
+    job = asyncio.run(run())
+    assert job.done.is_set() and job.status == "failed"
+    errors = capfd.readouterr().err
+    assert "Event loop is closed" not in errors and "never awaited" not in errors
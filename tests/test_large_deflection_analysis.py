@@ -0,0 +1,87 @@
+"""
+Tests of the large deflection (von Karman) analysis.
+
+"""
+
+import numpy as np
+import pytest
+
+from src.fem.FEM import FEM
+from src.fem.LargeDeflectionAnalysis import LargeDeflectionAnalysis
+
+
+PARAMETERS = dict(
+    width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3,
+    h_element_count=8, v_element_count=8, support="simply-supported",
+)
+# The max linear deflection is about four times the thickness
+HIGH_PRESSURE = 0.1
+
+
+def test_small_load_matches_linear_solution():
+    parameters = dict(PARAMETERS, pressure=1e-5)
+    analysis = LargeDeflectionAnalysis(parameters, step_count=1)
+    analysis.run()
+    fem = FEM(**parameters, solver="direct")
+    fem.create_mesh()
+    fem.calculate()
+    expected = fem.get_nodes_deformation_for_plot()
+    np.testing.assert_allclose(
+        analysis.get_nodes_deformation_for_plot(), expected, rtol=0, atol=1e-6 * np.abs(expected).max()
+    )
+
+
+def test_membrane_forces_reduce_large_deflection():
+    parameters = dict(PARAMETERS, pressure=HIGH_PRESSURE)
+    analysis = LargeDeflectionAnalysis(parameters)
+    analysis.run()
+    fem = FEM(**parameters, solver="direct")
+    fem.create_mesh()
+    fem.calculate()
+    assert analysis.get_max_node_deformation() < 0.7 * fem.get_max_node_deformation()
+
+
+@pytest.mark.parametrize("element", FEM.ELEMENTS)
+def test_modified_newton_matches_full_newton(element):
+    parameters = dict(PARAMETERS, pressure=HIGH_PRESSURE, element=element)
+    modified = LargeDeflectionAnalysis(parameters, tolerance=1e-10)
+    modified.run()
+    full = LargeDeflectionAnalysis(parameters, tolerance=1e-10, full_newton=True)
+    full.run()
+    expected = full.nodal_solution
+    np.testing.assert_allclose(modified.nodal_solution, expected, rtol=0, atol=1e-7 * np.abs(expected).max())
+    assert modified.factorization_count < full.factorization_count
+    assert full.factorization_count == sum(full.iteration_counts)
+
+
+@pytest.mark.parametrize("element", FEM.ELEMENTS)
+def test_tangent_matrix_matches_finite_differences(element):
+    parameters = dict(PARAMETERS, h_element_count=3, v_element_count=2, element=element)
+    analysis = LargeDeflectionAnalysis(parameters)
+    get_forces = analysis._LargeDeflectionAnalysis__get_internal_forces
+    get_matrix = analysis._LargeDeflectionAnalysis__assemble_tangent_matrix
+    free = ~analysis._LargeDeflectionAnalysis__fixed_dofs
+
+    # A state with deflections of the order of the thickness and small in-plane displacements
+    random = np.random.default_rng(0)
+    solution = np.where(free, random.standard_normal(len(free)), 0)
+    dof_count = analysis.nodal_solution.shape[1]
+    solution.reshape(-1, dof_count)[:, 0] *= 10
+    solution.reshape(-1, dof_count)[:, 1 : dof_count - 2] *= 0.02
+    solution.reshape(-1, dof_count)[:, dof_count - 2 :] *= 0.1
+
+    matrix = get_matrix(solution).toarray()[np.ix_(free, free)]
+    differences = np.empty_like(matrix)
+    for column, dof in enumerate(np.flatnonzero(free)):
+        step = np.zeros_like(solution)
+        step[dof] = 1e-6 * max(1.0, abs(solution[dof]))
+        forward, backward = get_forces(solution + step), get_forces(solution - step)
+        differences[:, column] = ((forward - backward) / (2 * step[dof]))[free]
+    np.testing.assert_allclose(matrix, differences, rtol=0, atol=1e-8 * np.abs(matrix).max())
+
+
+def test_run_raises_when_step_does_not_converge():
+    parameters = dict(PARAMETERS, pressure=HIGH_PRESSURE)
+    analysis = LargeDeflectionAnalysis(parameters, step_count=1, max_iterations=2)
+    with pytest.raises(ArithmeticError, match="load step 1"):
+        analysis.run()
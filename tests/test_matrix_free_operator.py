@@ -0,0 +1,39 @@
+"""
+Tests of the matrix-free application of the stiffness matrix.
+
+"""
+
+import numpy as np
+
+from src.fem.FEM import FEM
+from src.fem.MatrixFreeOperator import MatrixFreeOperator
+from src.fem.SparsePattern import SparsePattern
+
+
+PARAMETERS = dict(width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3)
+
+
+def test_product_matches_assembled_matrix():
+    fem = FEM(**PARAMETERS, h_element_count=6, v_element_count=4, solver="direct", support="clamped")
+    fem.create_mesh()
+    operator = MatrixFreeOperator(6, 4, fem.local_stiffness_matrix, fem.fixed_dofs)
+    matrix = SparsePattern.apply_fixation(fem.assemble_stiffness_matrix(), fem.fixed_dofs)
+    u = np.random.default_rng(0).standard_normal(operator.shape[0])
+    expected = matrix @ u
+    np.testing.assert_allclose(operator @ u, expected, rtol=0, atol=1e-12 * np.abs(expected).max())
+    np.testing.assert_allclose(operator.assemble().toarray(), matrix.toarray())
+
+
+def test_matrix_free_solution_matches_direct_solver():
+    deformations = {}
+    for solver in ("direct", "matrix-free"):
+        fem = FEM(
+            **PARAMETERS, h_element_count=16, v_element_count=16, solver=solver, support="simply-supported"
+        )
+        fem.create_mesh()
+        fem.calculate()
+        deformations[solver] = fem.get_nodes_deformation_for_plot()
+    expected = deformations["direct"]
+    np.testing.assert_allclose(
+        deformations["matrix-free"], expected, rtol=0, atol=1e-8 * np.abs(expected).max()
+    )
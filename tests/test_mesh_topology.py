@@ -0,0 +1,99 @@
+"""
+Tests of the cache of the mesh topologies.
+
+"""
+
+import numpy as np
+import pytest
+
+from src.fem.FEM import FEM
+from src.fem.MeshTopology import MeshTopology
+
+
+PARAMETERS = dict(
+    width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3,
+    h_element_count=8, v_element_count=6, solver="direct",
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    MeshTopology.clear_cache()
+    yield
+    MeshTopology.clear_cache()
+
+
+def get_topology(element_count: int, fixed_dofs=(0, 1, 2)) -> MeshTopology:
+    return MeshTopology.get(element_count, element_count, fixed_dofs)
+
+
+def create_plate(**parameters) -> FEM:
+    fem = FEM(**dict(PARAMETERS, **parameters))
+    fem.create_mesh()
+    return fem
+
+
+def test_plates_with_same_topology_share_it():
+    fem = create_plate(support="simply-supported")
+    other = create_plate(support="simply-supported", thickness=20, pressure=0.05, width=2000)
+    assert other.element_connectivity is fem.element_connectivity
+    assert other.fixed_dofs is fem.fixed_dofs
+    assert MeshTopology.get_cache_size()[0] == 1
+    assert not fem.element_connectivity.flags.writeable
+
+
+@pytest.mark.parametrize(
+    "parameters",
+    [
+        dict(support="clamped"),
+        dict(element_mask=np.arange(48) != 20),
+        dict(cutouts=[[300, 200, 600, 500]]),
+        dict(element="bfs"),
+    ],
+)
+def test_topologies_differ_by_support_mask_and_element(parameters):
+    fem = create_plate(support="simply-supported")
+    other = create_plate(**dict(dict(support="simply-supported"), **parameters))
+    assert other.element_connectivity is not fem.element_connectivity
+    assert MeshTopology.get_cache_size()[0] == 2
+    # Both stay cached
+    assert create_plate(**dict(dict(support="simply-supported"), **parameters)).fixed_dofs is other.fixed_dofs
+    assert create_plate(support="simply-supported").fixed_dofs is fem.fixed_dofs
+
+
+def test_least_recently_used_topology_is_evicted(monkeypatch):
+    monkeypatch.setattr(MeshTopology, "CACHE_SIZE", 2)
+    first, second = get_topology(4), get_topology(5)
+    assert get_topology(4) is first
+    get_topology(6)
+    assert MeshTopology.get_cache_size()[0] == 2
+    assert get_topology(4) is first
+    assert get_topology(5) is not second
+
+
+def test_cache_is_bounded_by_memory(monkeypatch):
+    small, large = get_topology(4), get_topology(20)
+    assert small.nbytes < large.nbytes
+    assert MeshTopology.get_cache_size() == (2, small.nbytes + large.nbytes)
+
+    monkeypatch.setattr(MeshTopology, "CACHE_MEMORY", large.nbytes + small.nbytes // 2)
+    # The large topology is the least recently used one after the small one is got
+    assert get_topology(4) is small
+    assert MeshTopology.get_cache_size() == (1, small.nbytes)
+
+    # The last topology is kept even if it does not fit
+    monkeypatch.setattr(MeshTopology, "CACHE_MEMORY", 1)
+    large = get_topology(20)
+    assert MeshTopology.get_cache_size() == (1, large.nbytes)
+    assert get_topology(20) is large
+
+
+def test_memory_includes_patterns_created_on_first_use():
+    topology = get_topology(10)
+    memory = topology.nbytes
+    topology.sparse_pattern
+    with_pattern = topology.nbytes
+    assert with_pattern > memory
+    topology.assemble_dense(np.eye(12))
+    assert topology.nbytes > with_pattern
+    assert MeshTopology.get_cache_size()[1] == topology.nbytes
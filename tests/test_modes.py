@@ -0,0 +1,47 @@
+"""
+Tests of the natural frequency analysis.
+
+"""
+
+import numpy as np
+
+from src.fem.FEM import FEM
+
+
+WIDTH, HEIGHT, THICKNESS, YOUNG, POISSON, DENSITY = 1000, 800, 10, 200000, 0.3, 7.85e-9
+
+
+def get_exact_frequency(m: int, n: int) -> float:
+    # Natural frequency of the simply supported plate with m and n half-waves
+    rigidity = YOUNG * THICKNESS ** 3 / (12 * (1 - POISSON ** 2))
+    return np.pi / 2 * ((m / WIDTH) ** 2 + (n / HEIGHT) ** 2) * np.sqrt(rigidity / (DENSITY * THICKNESS))
+
+
+def create_plate(element: str) -> FEM:
+    fem = FEM(
+        WIDTH, HEIGHT, THICKNESS, 0.01, YOUNG, POISSON, 16, 16,
+        density=DENSITY, solver="direct", element=element, support="simply-supported",
+    )
+    fem.create_mesh()
+    return fem
+
+
+def test_frequencies_match_simply_supported_plate():
+    fem = create_plate("bfs")
+    fem.calculate_modes(3)
+    # The plate is wider than high, so the mode with two half-waves along x is the second one
+    expected = [get_exact_frequency(1, 1), get_exact_frequency(2, 1), get_exact_frequency(1, 2)]
+    np.testing.assert_allclose(fem.natural_frequencies, expected, rtol=1e-3)
+
+
+def test_lumped_mass_gives_close_fundamental_frequency():
+    fem = create_plate("acm")
+    fem.calculate_modes(1, lumped=True)
+    assert abs(fem.natural_frequencies[0] / get_exact_frequency(1, 1) - 1) < 0.02
+
+
+def test_mode_shape_is_normalized():
+    fem = create_plate("bfs")
+    fem.calculate_modes(1)
+    shape = fem.get_mode_shape_for_plot(0)
+    assert np.nanmax(np.abs(shape)) == 1
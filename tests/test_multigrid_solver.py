@@ -0,0 +1,89 @@
+"""
+Tests of the multigrid preconditioned conjugate gradient solver.
+
+"""
+
+import numpy as np
+import pytest
+from scipy.sparse.linalg import spsolve
+
+from src.fem.FEM import FEM
+from src.fem.MatrixFreeOperator import MatrixFreeOperator
+from src.fem.MultigridSolver import MultigridSolver
+from src.fem.SparsePattern import SparsePattern
+
+
+PARAMETERS = dict(width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3)
+
+
+def create_system(element_count: int, support: str = "simply-supported"):
+    fem = FEM(
+        **PARAMETERS,
+        h_element_count=element_count,
+        v_element_count=element_count,
+        solver="direct",
+        support=support,
+    )
+    fem.create_mesh()
+    matrix = SparsePattern.apply_fixation(fem.assemble_stiffness_matrix(), fem.fixed_dofs)
+    forces = np.where(fem.fixed_dofs, 0, fem.assemble_pressure_load(np.full(element_count ** 2, 0.01)))
+    return fem, matrix, forces
+
+
+def create_solver(fem: FEM, matrix) -> MultigridSolver:
+    return MultigridSolver(
+        matrix,
+        fem.fixed_dofs,
+        fem.h_element_count,
+        fem.v_element_count,
+        fem.width / fem.h_element_count,
+        fem.height / fem.v_element_count,
+    )
+
+
+def test_level_counts_halve_even_meshes():
+    assert MultigridSolver.get_level_counts(64, 64) == [(64, 64), (32, 32), (16, 16)]
+    assert MultigridSolver.get_level_counts(64, 24) == [(64, 24), (32, 12)]
+    assert MultigridSolver.get_level_counts(64, 63) == [(64, 63)]
+    assert MultigridSolver.get_level_counts(8, 8) == [(8, 8)]
+
+
+@pytest.mark.parametrize("support", ["simply-supported", "clamped", "corners"])
+def test_solution_matches_direct_solve(support):
+    fem, matrix, forces = create_system(64, support)
+    solver = create_solver(fem, matrix)
+    assert solver.level_count == 3
+    expected = spsolve(matrix.tocsc(), forces)
+    np.testing.assert_allclose(solver.solve(forces), expected, rtol=0, atol=1e-8 * np.abs(expected).max())
+
+
+def test_iteration_count_does_not_grow_with_mesh():
+    iterations = []
+    for element_count in (32, 64, 128):
+        fem, matrix, forces = create_system(element_count)
+        solver = create_solver(fem, matrix)
+        solver.solve(forces)
+        iterations.append(solver.iterations)
+    assert max(iterations) <= 20
+    assert iterations[-1] <= iterations[0] + 2
+
+
+def test_matrix_free_levels_match_assembled_ones():
+    fem, matrix, forces = create_system(64)
+    operator = MatrixFreeOperator(64, 64, fem.local_stiffness_matrix, fem.fixed_dofs)
+    matrix_free = create_solver(fem, operator)
+    assembled = create_solver(fem, matrix)
+    assert matrix_free.level_count == assembled.level_count
+    expected = assembled.solve(forces)
+    np.testing.assert_allclose(
+        matrix_free.solve(forces), expected, rtol=0, atol=1e-8 * np.abs(expected).max()
+    )
+
+
+def test_odd_mesh_warns_about_direct_coarse_solve():
+    fem, matrix, forces = create_system(33)
+    with pytest.warns(RuntimeWarning, match="odd element count"):
+        solver = create_solver(fem, matrix)
+    assert solver.level_count == 1
+    expected = spsolve(matrix.tocsc(), forces)
+    np.testing.assert_allclose(solver.solve(forces), expected, rtol=0, atol=1e-8 * np.abs(expected).max())
@@ -0,0 +1,110 @@
+"""
+Tests of the progressive solver of the live preview.
+
+"""
+
+import threading
+import time
+
+import pytest
+from PyQt5.QtCore import QCoreApplication
+
+from src.ui.ProgressiveSolver import ProgressiveSolver
+
+
+PARAMETERS = dict(
+    width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3,
+    h_element_count=32, v_element_count=32, support="simply-supported", solver="direct",
+)
+
+
+@pytest.fixture(scope="module")
+def application():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+class Recorder:
+    """
+    Records the meshes solved by the progressive solver and blocks
+    the background thread until released.
+
+    """
+
+    def __init__(self, monkeypatch) -> None:
+        self.solved = []
+        self.emitted = []
+        self.release = threading.Event()
+        self.blocked = threading.Event()
+        solve = ProgressiveSolver._ProgressiveSolver__solve
+
+        def record(parameters, counts):
+            self.solved.append((parameters["width"], counts))
+            if threading.current_thread() is not threading.main_thread():
+                self.blocked.set()
+                assert self.release.wait(10)
+            return solve(parameters, counts)
+
+        monkeypatch.setattr(ProgressiveSolver, "_ProgressiveSolver__solve", staticmethod(record))
+
+    def on_solved(self, fem, final) -> None:
+        self.emitted.append((fem.width, fem.h_element_count, final))
+
+
+def wait_until(application, condition) -> None:
+    deadline = time.monotonic() + 10
+    while not condition():
+        assert time.monotonic() < deadline
+        application.processEvents()
+        time.sleep(0.01)
+
+
+def test_element_counts_refine_to_requested_mesh():
+    assert ProgressiveSolver.get_element_counts(32, 20) == [(4, 3), (8, 5), (16, 10), (32, 20)]
+    assert ProgressiveSolver.get_element_counts(3, 2) == [(3, 2)]
+
+
+def test_levels_are_emitted_from_coarse_to_fine(application, monkeypatch):
+    recorder = Recorder(monkeypatch)
+    recorder.release.set()
+    solver = ProgressiveSolver()
+    solver.solved.connect(recorder.on_solved)
+    solver.request(PARAMETERS)
+    wait_until(application, lambda: recorder.emitted and recorder.emitted[-1][2])
+    solver.shutdown()
+    assert recorder.emitted == [(1000, 4, False), (1000, 8, False), (1000, 16, False), (1000, 32, True)]
+
+
+def test_stale_request_does_not_start_next_level(application, monkeypatch):
+    recorder = Recorder(monkeypatch)
+    solver = ProgressiveSolver()
+    solver.solved.connect(recorder.on_solved)
+    solver.request(PARAMETERS)
+    assert recorder.blocked.wait(10)
+    # The 8 x 8 mesh of the first request is being solved
+    solver.request(dict(PARAMETERS, width=2000, h_element_count=8, v_element_count=8))
+    solver.request(dict(PARAMETERS, width=3000, h_element_count=8, v_element_count=8))
+    recorder.release.set()
+    wait_until(application, lambda: recorder.emitted[-1] == (3000, 8, True))
+    solver.shutdown()
+
+    # The second request is dropped before its refinement starts
+    assert recorder.solved == [(1000, (4, 4)), (1000, (8, 8)), (2000, (4, 4)), (3000, (4, 4)), (3000, (8, 8))]
+    assert recorder.emitted == [(1000, 4, False), (2000, 4, False), (3000, 4, False), (3000, 8, True)]
+
+
+def test_shutdown_stops_refinement(application, monkeypatch):
+    recorder = Recorder(monkeypatch)
+    solver = ProgressiveSolver()
+    solver.solved.connect(recorder.on_solved)
+    solver.request(PARAMETERS)
+    assert recorder.blocked.wait(10)
+    solver.shutdown()
+    recorder.release.set()
+    executor = solver._ProgressiveSolver__executor
+    executor.shutdown(wait=True)
+    application.processEvents()
+
+    assert recorder.solved == [(1000, (4, 4)), (1000, (8, 8))]
+    assert recorder.emitted == [(1000, 4, False)]
+    with pytest.raises(RuntimeError):
+        solver.request(PARAMETERS)
@@ -0,0 +1,69 @@
+"""
+Tests of the reduced-order model of the plate deflections.
+
+"""
+
+import numpy as np
+import pytest
+
+from src.fem.ReducedOrderModel import ReducedOrderModel
+from src.fem.Sweep import Sweep
+
+
+BASE = dict(
+    width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3,
+    h_element_count=6, v_element_count=6, solver="direct", support="simply-supported",
+)
+BOUNDS = dict(thickness=(8, 12), poisson=(0.2, 0.4))
+
+
+def train(base: dict) -> ReducedOrderModel:
+    model = ReducedOrderModel(base)
+    model.train(ReducedOrderModel.sample(base, BOUNDS, 12, seed=0))
+    return model
+
+
+def test_prediction_matches_calculation():
+    model = train(BASE)
+    parameters = dict(BASE, thickness=9.3, poisson=0.27)
+    deflections, error = model.predict(parameters)
+    expected = Sweep.solve(parameters, keep_deformation=True).deformation
+    assert error < 1e-2
+    np.testing.assert_allclose(deflections, expected, rtol=0, atol=1e-2 * np.abs(expected).max())
+
+
+def test_training_points_are_reproduced():
+    model = train(BASE)
+    parameters = ReducedOrderModel.sample(BASE, BOUNDS, 12, seed=0)[3]
+    deflections, _ = model.predict(parameters)
+    expected = Sweep.solve(parameters, keep_deformation=True).deformation
+    np.testing.assert_allclose(deflections, expected, rtol=0, atol=1e-8 * np.abs(expected).max())
+
+
+def test_plate_with_cut_out_and_mask():
+    mask = np.ones(36, dtype=bool)
+    mask[2 * 6 + 2] = False
+    model = train(dict(BASE, element_mask=mask))
+    deflections, error = model.predict(dict(thickness=10.5, poisson=0.33, element_mask=mask.copy()))
+    expected = Sweep.solve(
+        dict(BASE, element_mask=mask, thickness=10.5, poisson=0.33), keep_deformation=True
+    ).deformation
+    assert np.isfinite(error)
+    np.testing.assert_array_equal(np.isnan(deflections), np.isnan(expected))
+    # A different mask is not part of the model
+    other = mask.copy()
+    other[0] = False
+    assert model.predict(dict(thickness=10.5, element_mask=other))[0] is None
+
+
+def test_parameter_outside_model_is_calculated():
+    model = train(BASE)
+    assert model.predict(dict(pressure=0.02))[0] is None
+    model.query(dict(pressure=0.02))
+    assert model.fallback_count == 1
+
+
+def test_repeated_training_points_are_rejected():
+    parameter_sets = ReducedOrderModel.sample(BASE, BOUNDS, 6, seed=1)
+    with pytest.raises(ArithmeticError):
+        ReducedOrderModel(BASE).train(parameter_sets + parameter_sets[:1])
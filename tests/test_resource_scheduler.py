@@ -0,0 +1,94 @@
+"""
+Tests of the scheduler that shares the CPU cores between worker processes.
+
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from src.service.ResourceScheduler import ResourceScheduler
+
+
+PARAMETERS = dict(width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3)
+
+
+def create_parameters(element_count: int, solver: str, **parameters) -> dict:
+    return dict(
+        PARAMETERS, h_element_count=element_count, v_element_count=element_count, solver=solver, **parameters
+    )
+
+
+def test_resources_of_solvers():
+    scheduler = ResourceScheduler(4)
+    assert scheduler.get_resources(create_parameters(8, "dense")) == (1, 1)
+    # 3 * 41 * 41 = 5043 degrees of freedom: two threads of 2000
+    assert scheduler.get_resources(create_parameters(40, "dense")) == (2, 2)
+    assert scheduler.get_resources(create_parameters(200, "banded")) == (4, 4)
+    assert scheduler.get_resources(create_parameters(200, "multigrid")) == (1, 1)
+    assert scheduler.get_resources(create_parameters(64, "domain-decomposition", process_count=3)) == (3, 1)
+    assert scheduler.get_resources(create_parameters(64, "domain-decomposition", process_count=8)) == (4, 1)
+    # The conforming element has four degrees of freedom per node
+    assert scheduler.get_resources(create_parameters(35, "dense", element="bfs")) == (2, 2)
+
+
+async def wait_until_started(scheduler: ResourceScheduler, future, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not scheduler.is_started(future):
+        assert time.monotonic() < deadline, "The worker did not start the task"
+        await asyncio.sleep(0.05)
+
+
+def test_workers_get_thread_variables():
+    async def run():
+        scheduler = ResourceScheduler(4)
+        try:
+            single = await scheduler.submit(create_parameters(8, "dense"), os.getenv, "OMP_NUM_THREADS")
+            double = await scheduler.submit(create_parameters(40, "dense"), os.getenv, "OPENBLAS_NUM_THREADS")
+            return await asyncio.wrap_future(single), await asyncio.wrap_future(double)
+        finally:
+            scheduler.shutdown()
+
+    saved = os.environ.get("OMP_NUM_THREADS")
+    assert asyncio.run(run()) == ("1", "2")
+    # The variables of the server process are restored
+    assert os.environ.get("OMP_NUM_THREADS") == saved
+
+
+def test_cancel_terminates_running_task_and_releases_cores():
+    async def run():
+        scheduler = ResourceScheduler(1)
+        try:
+            parameters = create_parameters(8, "dense")
+            future = await scheduler.submit(parameters, time.sleep, 60)
+            await wait_until_started(scheduler, future)
+            waiting = asyncio.ensure_future(scheduler.submit(parameters, os.getpid))
+            await asyncio.sleep(0.2)
+            # The only core is reserved by the running task
+            assert not waiting.done()
+
+            scheduler.cancel(future)
+            with pytest.raises(BrokenProcessPool):
+                await asyncio.wait_for(asyncio.wrap_future(future), 30)
+            second = await asyncio.wait_for(waiting, 30)
+            assert await asyncio.wrap_future(second) > 0
+        finally:
+            scheduler.shutdown()
+
+    asyncio.run(run())
+
+
+def test_shutdown_cancels_tasks_without_errors_after_loop_closes():
+    async def run():
+        scheduler = ResourceScheduler(1)
+        future = await scheduler.submit(create_parameters(8, "dense"), time.sleep, 60)
+        await wait_until_started(scheduler, future)
+        return scheduler, future
+
+    scheduler, future = asyncio.run(run())
+    scheduler.shutdown()
+    with pytest.raises(BrokenProcessPool):
+        future.result(30)
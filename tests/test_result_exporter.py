@@ -0,0 +1,124 @@
+"""
+Tests of the export of the results to the VTK and XDMF formats.
+
+"""
+
+import xml.etree.ElementTree as ElementTree
+
+import numpy as np
+import pytest
+
+from src.fem.FEM import FEM
+from src.fem.ResultExporter import ResultExporter
+
+
+PARAMETERS = dict(
+    width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3,
+    h_element_count=10, v_element_count=8, support="simply-supported", solver="direct",
+)
+VTK_TYPES = {"Float64": "<f8", "Int64": "<i8", "UInt8": "u1"}
+
+
+def create_plate(**parameters) -> FEM:
+    fem = FEM(**dict(PARAMETERS, **parameters))
+    fem.create_mesh()
+    fem.calculate()
+    return fem
+
+
+def get_expected_fields(fem: FEM):
+    solution = fem.nodal_solution
+    zeros = np.zeros(len(solution))
+    return {
+        "deflection": solution[:, 0],
+        "displacement": np.stack((zeros, zeros, solution[:, 0]), axis=1),
+        "rotation": np.stack((solution[:, 1], solution[:, 2], zeros), axis=1),
+        "moment": fem.get_nodal_moments(),
+    }
+
+
+def read_vtu(path):
+    with open(path, "rb") as file:
+        content = file.read()
+    header, data = content.split(b'\n<AppendedData encoding="raw">\n_', 1)
+    # The XML part ends where the raw data begins
+    piece = ElementTree.fromstring(header + b"\n</VTKFile>").find("UnstructuredGrid/Piece")
+    arrays = {}
+    for element in piece.iter("DataArray"):
+        offset = int(element.get("offset"))
+        size = int(np.frombuffer(data, "<u8", 1, offset)[0])
+        array = np.frombuffer(data[offset + 8 : offset + 8 + size], VTK_TYPES[element.get("type")])
+        components = int(element.get("NumberOfComponents"))
+        arrays[element.get("Name")] = array.reshape(-1, components) if components > 1 else array
+    return piece, arrays
+
+
+def read_xdmf(path):
+    grid = ElementTree.parse(path).getroot().find("Domain/Grid")
+    arrays = {}
+    for parent in grid:
+        item = parent.find("DataItem")
+        dtype = "<{}{}".format("i" if item.get("NumberType") == "Int" else "f", item.get("Precision"))
+        shape = tuple(int(n) for n in item.get("Dimensions").split())
+        array = np.fromfile(path.parent / item.text, dtype, int(np.prod(shape)), offset=int(item.get("Seek")))
+        arrays[parent.get("Name", parent.tag)] = array.reshape(shape)
+    return grid, arrays
+
+
+@pytest.mark.parametrize(
+    "parameters",
+    [{}, {"cutouts": [[300, 200, 600, 500]]}, {"cutouts": [[500, 400, 150]], "element": "bfs"}],
+)
+def test_vtu_round_trip(tmp_path, monkeypatch, parameters):
+    # Small parts make the arrays be written in several chunks
+    monkeypatch.setattr(ResultExporter, "CHUNK_SIZE", 7)
+    fem = create_plate(**parameters)
+    path = tmp_path / "plate.vtu"
+    ResultExporter(fem).write_vtu(str(path))
+    piece, arrays = read_vtu(path)
+
+    node_count, element_count = len(fem.node_coordinates), len(fem.element_connectivity)
+    assert int(piece.get("NumberOfPoints")) == node_count
+    assert int(piece.get("NumberOfCells")) == element_count
+    np.testing.assert_array_equal(arrays["Points"][:, :2], fem.node_coordinates)
+    assert not arrays["Points"][:, 2].any()
+    np.testing.assert_array_equal(arrays["connectivity"].reshape(-1, 4), fem.element_connectivity)
+    np.testing.assert_array_equal(arrays["offsets"], 4 * np.arange(1, element_count + 1))
+    assert (arrays["types"] == 9).all()
+    for name, expected in get_expected_fields(fem).items():
+        np.testing.assert_array_equal(arrays[name], expected)
+
+
+@pytest.mark.parametrize("parameters", [{}, {"cutouts": [[300, 200, 600, 500]]}])
+def test_xdmf_round_trip(tmp_path, monkeypatch, parameters):
+    monkeypatch.setattr(ResultExporter, "CHUNK_SIZE", 7)
+    fem = create_plate(**parameters)
+    path = tmp_path / "plate.xdmf"
+    ResultExporter(fem).write_xdmf(str(path))
+    grid, arrays = read_xdmf(path)
+
+    assert (tmp_path / "plate.bin").exists()
+    topology = grid.find("Topology")
+    assert topology.get("TopologyType") == "Quadrilateral"
+    assert int(topology.get("NumberOfElements")) == len(fem.element_connectivity)
+    np.testing.assert_array_equal(arrays["Topology"], fem.element_connectivity)
+    assert arrays["Geometry"].shape == (len(fem.node_coordinates), 3)
+    np.testing.assert_array_equal(arrays["Geometry"][:, :2], fem.node_coordinates)
+    for name, expected in get_expected_fields(fem).items():
+        np.testing.assert_array_equal(arrays[name], expected)
+    assert grid.find("Attribute[@Name='deflection']").get("AttributeType") == "Scalar"
+    assert grid.find("Attribute[@Name='moment']").get("AttributeType") == "Vector"
+
+
+def test_cutout_removes_points_and_cells(tmp_path):
+    full, cut = create_plate(), create_plate(cutouts=[[300, 200, 600, 500]])
+    counts = []
+    for fem in (full, cut):
+        path = tmp_path / "plate.vtu"
+        ResultExporter(fem).write_vtu(str(path))
+        piece, arrays = read_vtu(path)
+        counts.append((int(piece.get("NumberOfPoints")), int(piece.get("NumberOfCells"))))
+        # Every point belongs to a cell
+        assert np.array_equal(np.unique(arrays["connectivity"]), np.arange(counts[-1][0]))
+    assert counts[0] == (11 * 9, 10 * 8)
+    assert counts[1][0] < counts[0][0] and counts[1][1] < counts[0][1]
@@ -0,0 +1,46 @@
+"""
+Tests of the point probes and section profiles of solved plates.
+
+"""
+
+import numpy as np
+
+from src.fem.FEM import FEM
+from src.fem.ResultProbe import ResultProbe
+
+
+PARAMETERS = dict(width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3)
+
+
+def create_plate(element: str, **parameters) -> FEM:
+    fem = FEM(
+        **PARAMETERS, h_element_count=8, v_element_count=8, solver="direct", element=element,
+        support="simply-supported", **parameters,
+    )
+    fem.create_mesh()
+    fem.calculate()
+    return fem
+
+
+def test_probe_reproduces_nodal_values():
+    for element in FEM.ELEMENTS:
+        fem = create_plate(element)
+        coordinates = fem.node_coordinates
+        values = ResultProbe(fem).probe(coordinates[:, 0], coordinates[:, 1])
+        np.testing.assert_allclose(values, fem.nodal_solution[:, : ResultProbe.VALUE_COUNT], atol=1e-12)
+
+
+def test_profile_is_symmetric_and_outside_points_are_nan():
+    probe = ResultProbe(create_plate("bfs"))
+    distances, values = probe.get_profile((0, 400), (1000, 400), 101)
+    np.testing.assert_allclose(distances[[0, -1]], [0, 1000])
+    np.testing.assert_allclose(values[:, 0], values[::-1, 0], rtol=0, atol=1e-9 * values[:, 0].max())
+    assert np.argmax(values[:, 0]) == 50
+    assert np.all(np.isnan(probe.probe([-1.0, 500.0], [400.0, 801.0])))
+
+
+def test_points_on_cut_out_edges_use_remaining_elements():
+    fem = create_plate("acm", cutouts=[[250, 200, 500, 400]])
+    values = ResultProbe(fem).probe([250.0, 375.0, 375.0], [300.0, 400.0, 300.0])
+    assert np.all(np.isfinite(values[:2]))
+    assert np.all(np.isnan(values[2]))
@@ -0,0 +1,96 @@
+"""
+Tests of the writers of sweep results.
+
+"""
+
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from src.fem.ResultWriters import ColumnarResultWriter, CsvResultWriter
+from src.fem.Sweep import SweepResult
+
+
+def create_record(thickness: float, solver: str, deformation) -> SweepResult:
+    parameters = dict(thickness=thickness, solver=solver, element_mask=np.array([True, False]))
+    return SweepResult(parameters, thickness / 100, deformation)
+
+
+def test_non_numeric_parameters_are_written_as_json(tmp_path):
+    with ColumnarResultWriter(str(tmp_path)) as writer:
+        writer.write(create_record(8.0, "direct", None))
+        writer.write(create_record(10.0, "banded", None))
+    columns = ColumnarResultWriter.read(str(tmp_path))
+    np.testing.assert_array_equal(columns["thickness"], [8.0, 10.0])
+    assert list(columns["solver"]) == ["direct", "banded"]
+    assert columns["element_mask"][1] == [True, False]
+    np.testing.assert_allclose(columns["max_deformation"], [0.08, 0.1])
+
+
+def test_field_offsets_stay_aligned_with_rows(tmp_path):
+    fields = [None, np.arange(6.0).reshape(2, 3), None, np.arange(4.0).reshape(2, 2) + 10]
+    with ColumnarResultWriter(str(tmp_path)) as writer:
+        for i, field in enumerate(fields):
+            writer.write(create_record(float(i + 1), "direct", field))
+    columns = ColumnarResultWriter.read(str(tmp_path))
+
+    offsets = columns["deformation_offset"]
+    assert len(offsets) == len(fields)
+    for i, field in enumerate(fields):
+        if field is None:
+            assert np.isnan(offsets[i]) and np.isnan(columns["deformation_rows"][i])
+            continue
+        rows, count = int(columns["deformation_rows"][i]), int(columns["deformation_columns"][i])
+        start = int(offsets[i])
+        stored = columns["deformation"][start : start + rows * count].reshape(rows, count)
+        np.testing.assert_array_equal(stored, field)
+
+
+def test_csv_writes_arrays_in_full_as_json(tmp_path):
+    path = tmp_path / "results.csv"
+    # The repr of a long array would be abbreviated
+    mask = np.arange(2000) % 3 != 0
+    with CsvResultWriter(str(path)) as writer:
+        parameters = dict(thickness=np.float64(8.0), cutouts=[[1, 2, 3]], element_mask=mask)
+        writer.write(SweepResult(parameters, 0.5, None))
+    with open(path, newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ["thickness", "cutouts", "element_mask", "max_deformation"]
+    assert rows[1][0] == "8.0" and rows[1][3] == "0.5"
+    assert json.loads(rows[1][1]) == [[1, 2, 3]]
+    assert json.loads(rows[1][2]) == mask.tolist()
+
+
+@pytest.mark.parametrize("parameters", [dict(thickness=10.0), dict(thickness=10.0, solver="direct", young=1)])
+def test_csv_rejects_records_with_other_parameters(tmp_path, parameters):
+    path = tmp_path / "results.csv"
+    with CsvResultWriter(str(path)) as writer:
+        writer.write(SweepResult(dict(thickness=8.0, solver="direct"), 0.1, None))
+        with pytest.raises(ValueError, match="do not match the columns"):
+            writer.write(SweepResult(parameters, 0.2, None))
+        writer.write(SweepResult(dict(solver="banded", thickness=12.0), 0.3, None))
+    with open(path, newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows == [
+        ["thickness", "solver", "max_deformation"], ["8.0", "direct", "0.1"], ["12.0", "banded", "0.3"]
+    ]
+
+
+def test_columnar_rejects_records_with_other_parameters(tmp_path):
+    with ColumnarResultWriter(str(tmp_path)) as writer:
+        writer.write(create_record(8.0, "direct", None))
+        with pytest.raises(ValueError, match="missing \\['element_mask'\\]"):
+            writer.write(SweepResult(dict(thickness=10.0, solver="direct"), 0.1, None))
+        record = create_record(10.0, "direct", None)
+        with pytest.raises(ValueError, match="unexpected \\['young'\\]"):
+            writer.write(record._replace(parameters=dict(record.parameters, young=1)))
+        with pytest.raises(ValueError, match="thickness is numeric"):
+            writer.write(record._replace(parameters=dict(record.parameters, thickness="thick")))
+        writer.write(create_record(12.0, "banded", None))
+    columns = ColumnarResultWriter.read(str(tmp_path))
+    # The rejected records left nothing behind, so the columns stay aligned
+    np.testing.assert_array_equal(columns["thickness"], [8.0, 12.0])
+    assert list(columns["solver"]) == ["direct", "banded"]
+    assert len(columns["element_mask"]) == len(columns["max_deformation"]) == 2
@@ -0,0 +1,139 @@
+"""
+Tests of the lifetime of the shared arrays across processes.
+
+"""
+
+import os
+import pickle
+import subprocess
+import sys
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from src.fem.SharedArray import SharedArray
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Script run in a fresh interpreter, so that the warnings of its resource tracker are captured
+SCRIPT = """
+import multiprocessing
+import os
+import subprocess
+import sys
+
+from src.fem.SharedArray import SharedArray, SharedArrayHandle
+
+
+def exists(shared):
+    return os.path.exists("/dev/shm/" + shared.handle.name)
+
+
+def write(shared):
+    shared.array[:] = 5
+    shared.release()
+
+
+def take_over(handle):
+    SharedArray.attach(handle, owner=True).release()
+
+
+if __name__ == "__main__":
+    context = multiprocessing.get_context(sys.argv[1])
+
+    shared = SharedArray(4)
+    # A forked process inherits the array, a spawned one attaches by the pickled handle
+    process = context.Process(target=write, args=(shared,))
+    process.start()
+    process.join()
+    print("child", shared.array.tolist(), exists(shared))
+
+    code = "from src.fem.SharedArray import *; SharedArray.attach(SharedArrayHandle{}).release()"
+    subprocess.run([sys.executable, "-c", code.format(tuple(shared.handle))], check=True)
+    print("unrelated", exists(shared))
+    shared.release()
+    print("released", exists(shared))
+
+    shared = SharedArray(4)
+    process = context.Process(target=take_over, args=(shared.disown(),))
+    process.start()
+    process.join()
+    print("taken over", exists(shared))
+    shared.release()
+"""
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="Shared memory is not listed")
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_blocks_are_unlinked_once_by_owner(tmp_path, start_method):
+    script = tmp_path / "shared_array_lifetime.py"
+    script.write_text(SCRIPT)
+    result = subprocess.run(
+        [sys.executable, str(script), start_method],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        env=dict(os.environ, PYTHONPATH=ROOT),
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split("\n") == [
+        "child [5.0, 5.0, 5.0, 5.0] True",
+        "unrelated True",
+        "released False",
+        "taken over False",
+        "",
+    ]
+    # The resource trackers report neither leaked nor missing blocks
+    assert result.stderr == ""
+
+
+def test_release_unlinks_after_last_reference(monkeypatch):
+    unlinked = []
+    unlink = SharedMemory.unlink
+    monkeypatch.setattr(SharedMemory, "unlink", lambda memory: unlinked.append(memory.name) or unlink(memory))
+    shared = SharedArray.publish(np.arange(3.0))
+    assert shared.acquire() is shared
+    shared.release()
+    assert not unlinked
+    np.testing.assert_array_equal(shared.array, [0, 1, 2])
+    shared.release()
+    shared.release()
+    assert unlinked == [shared.handle.name]
+    with pytest.raises(ValueError, match="released"):
+        shared.array
+    with pytest.raises(ValueError, match="released"):
+        shared.acquire()
+    with pytest.raises(ValueError, match="released"):
+        shared.disown()
+
+
+def test_attached_arrays_do_not_unlink(monkeypatch):
+    unlinked = []
+    unlink = SharedMemory.unlink
+    monkeypatch.setattr(SharedMemory, "unlink", lambda memory: unlinked.append(memory.name) or unlink(memory))
+    with SharedArray(2) as shared:
+        # Pickling passes the handle, so the copy views the same memory
+        copy = pickle.loads(pickle.dumps(shared))
+        assert not copy.owner
+        copy.array[:] = 7
+        copy.release()
+        assert not unlinked
+        np.testing.assert_array_equal(shared.array, [7, 7])
+    assert unlinked == [shared.handle.name]
+
+
+def test_disowned_array_is_unlinked_by_new_owner(monkeypatch):
+    unlinked = []
+    unlink = SharedMemory.unlink
+    monkeypatch.setattr(SharedMemory, "unlink", lambda memory: unlinked.append(memory.name) or unlink(memory))
+    shared = SharedArray.publish([1.0, 2.0])
+    handle = shared.disown()
+    assert not shared.owner
+    shared.release()
+    assert not unlinked
+    with SharedArray.attach(handle, owner=True) as taken:
+        assert taken.owner
+        np.testing.assert_array_equal(taken.array, [1, 2])
+    assert unlinked == [handle.name]
@@ -0,0 +1,62 @@
+"""
+Tests of the memory and time estimates of the solvers and the choice among them.
+
+"""
+
+import pytest
+
+from src.fem.FEM import FEM
+from src.fem.SolverPlanner import SolverPlanner
+
+
+PARAMETERS = dict(width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3)
+
+
+def test_multilevel_solvers_are_chosen_for_nested_meshes():
+    estimate = SolverPlanner(8e9).plan(1024, 1024)
+    assert estimate.solver == "matrix-free"
+    assert estimate.memory < 4e9
+
+
+@pytest.mark.parametrize("counts", [(999, 999), (1001, 1001), (1024, 1023)])
+def test_meshes_that_cannot_be_coarsened_are_refused(counts):
+    estimates = {estimate.solver: estimate for estimate in SolverPlanner(None).estimate_all(*counts)}
+    # Without coarse levels the multigrid methods factorize the whole system
+    assert estimates["matrix-free"].memory > estimates["direct"].memory
+    assert estimates["multigrid"].memory > estimates["direct"].memory
+    with pytest.raises(MemoryError, match="8.0 GB"):
+        SolverPlanner(8e9).plan(*counts)
+
+
+def test_small_odd_mesh_prefers_general_solver():
+    assert SolverPlanner(None).plan(255, 255).solver not in ("multigrid", "matrix-free")
+    assert SolverPlanner(None).plan(256, 256).solver == "matrix-free"
+
+
+def test_estimates_grow_with_degrees_of_freedom_of_nodes():
+    for solver in SolverPlanner.SOLVERS:
+        acm = SolverPlanner.estimate(64, 64, solver)
+        bfs = SolverPlanner.estimate(64, 64, solver, dof_count=4)
+        assert bfs.system_size == 4 * 65 * 65
+        assert bfs.memory > acm.memory and bfs.time > acm.time
+
+
+def test_removed_nodes_reduce_estimate():
+    full = SolverPlanner.estimate(64, 64, "direct")
+    cut = SolverPlanner.estimate(64, 64, "direct", node_count=65 * 65 // 2)
+    assert cut.memory < full.memory
+
+
+def test_checked_solver_over_budget_raises_memory_error():
+    with pytest.raises(MemoryError, match="dense needs"):
+        SolverPlanner(1e9).check(128, 128, "dense")
+    assert SolverPlanner(1e9).check(128, 128, "direct").solver == "direct"
+
+
+def test_automatic_solver_of_finite_element_model():
+    assert FEM(**PARAMETERS, h_element_count=256, v_element_count=256, solver="auto").solver == "matrix-free"
+    with pytest.raises(MemoryError):
+        FEM(**PARAMETERS, h_element_count=999, v_element_count=999, solver="auto", memory_budget=int(8e9))
+    # The conforming element is only solved by the general solvers
+    fem = FEM(**PARAMETERS, h_element_count=64, v_element_count=64, solver="auto", element="bfs")
+    assert fem.solver in FEM.GENERAL_SOLVERS
@@ -0,0 +1,65 @@
+"""
+Tests of the thickness optimization and its sensitivities.
+
+"""
+
+import numpy as np
+import pytest
+
+from src.fem.ThicknessOptimizer import ThicknessOptimizer
+
+
+PARAMETERS = dict(
+    width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3,
+    h_element_count=6, v_element_count=4, solver="direct", support="clamped",
+)
+
+
+def test_adjoint_gradient_matches_finite_differences():
+    optimizer = ThicknessOptimizer(PARAMETERS, 1.0)
+    thicknesses = np.linspace(8, 12, optimizer.element_count)
+    _, gradient = optimizer.get_sensitivities(thicknesses)
+
+    differences = np.empty_like(gradient)
+    for element in range(optimizer.element_count):
+        step = np.zeros_like(thicknesses)
+        step[element] = 1e-4 * thicknesses[element]
+        forward, _ = optimizer.get_sensitivities(thicknesses + step)
+        backward, _ = optimizer.get_sensitivities(thicknesses - step)
+        differences[element] = (forward - backward) / (2 * step[element])
+    np.testing.assert_allclose(gradient, differences, rtol=0, atol=1e-6 * np.abs(differences).max())
+
+
+def test_uniform_thickness_reaches_deflection_limit():
+    optimizer = ThicknessOptimizer(PARAMETERS, 0.5)
+    thickness = optimizer.get_uniform_thickness()
+    deflection, _ = optimizer.get_sensitivities(np.full(optimizer.element_count, thickness))
+    np.testing.assert_allclose(deflection, 0.5, rtol=1e-8)
+
+
+def test_optimized_plate_is_lighter_within_limit():
+    optimizer = ThicknessOptimizer(PARAMETERS, 0.5)
+    uniform = optimizer.get_uniform_thickness()
+    thicknesses = optimizer.optimize()
+    deflection, _ = optimizer.get_sensitivities(thicknesses)
+    assert deflection <= 0.5 * (1 + 1e-6)
+    assert thicknesses.mean() < uniform
+
+
+def test_design_clipped_at_max_thickness_stays_within_limit():
+    uniform = ThicknessOptimizer(PARAMETERS, 0.5).get_uniform_thickness()
+    # The unconstrained optimum is about 1.5 times thicker than the uniform plate in places
+    for max_thickness in (1.05 * uniform, 1.2 * uniform):
+        optimizer = ThicknessOptimizer(PARAMETERS, 0.5, max_thickness=max_thickness)
+        thicknesses = optimizer.optimize()
+        deflection, _ = optimizer.get_sensitivities(thicknesses)
+        assert 0.5 * (1 - 1e-2) <= deflection <= 0.5 * (1 + 1e-6)
+        assert thicknesses.max() <= max_thickness
+        assert thicknesses.mean() < uniform
+
+
+def test_unreachable_limit_raises():
+    uniform = ThicknessOptimizer(PARAMETERS, 0.5).get_uniform_thickness()
+    optimizer = ThicknessOptimizer(PARAMETERS, 0.5, max_thickness=0.9 * uniform)
+    with pytest.raises(ValueError, match="cannot be met"):
+        optimizer.optimize()
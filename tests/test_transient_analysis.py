@@ -0,0 +1,83 @@
+"""
+Tests of the transient analysis by the HHT-alpha method.
+
+"""
+
+import numpy as np
+import pytest
+
+from src.fem.FEM import FEM
+from src.fem.TransientAnalysis import TransientAnalysis
+
+
+PARAMETERS = dict(
+    width=1000, height=800, thickness=10, pressure=0.01, young=200000, poisson=0.3,
+    h_element_count=8, v_element_count=8, support="simply-supported", solver="direct",
+)
+
+
+def create_fem():
+    fem = FEM(**PARAMETERS)
+    fem.create_mesh()
+    fem.calculate_modes(1)
+    fem.calculate()
+    return fem
+
+
+def test_suddenly_applied_load_oscillates_with_first_natural_period(tmp_path):
+    fem = create_fem()
+    period = 1 / fem.natural_frequencies[0]
+    static_deflection = fem.get_max_node_deformation()
+    analysis = TransientAnalysis(fem, period / 200)
+    load = TransientAnalysis.impulsive_load(fem, PARAMETERS["pressure"], 1e9)
+    analysis.run(load, 400, tmp_path / "deflections.npy")
+
+    deflections = analysis.max_deflections
+    # The first peak is at half of the period and is twice the static deflection
+    assert np.argmax(deflections[:200]) == pytest.approx(100, abs=2)
+    assert deflections[:201].max() == pytest.approx(2 * static_deflection, rel=0.05)
+    # The plate oscillates about the static solution
+    assert deflections.mean() == pytest.approx(static_deflection, rel=0.01)
+
+
+def test_negative_alpha_dissipates_free_vibration(tmp_path):
+    fem = create_fem()
+    period = 1 / fem.natural_frequencies[0]
+    load = TransientAnalysis.impulsive_load(fem, PARAMETERS["pressure"], period / 8)
+    amplitudes = {}
+    for alpha in (0.0, -0.1, -0.3):
+        analysis = TransientAnalysis(fem, period / 4, alpha=alpha)
+        analysis.run(load, 400, tmp_path / "deflections.npy")
+        deflections = analysis.max_deflections
+        amplitudes[alpha] = (deflections[5:45].max(), deflections[-40:].max())
+
+    # The average acceleration method conserves the energy of the free vibration
+    early, late = amplitudes[0.0]
+    assert late == pytest.approx(early, rel=0.02)
+    # Negative alpha damps it, the more the further from zero
+    assert amplitudes[-0.1][1] < 0.01 * amplitudes[-0.1][0]
+    assert amplitudes[-0.3][1] < amplitudes[-0.1][1]
+
+
+def test_snapshots_are_written_to_memory_mapped_file(tmp_path):
+    fem = create_fem()
+    analysis = TransientAnalysis(fem, 1e-3)
+    load = TransientAnalysis.impulsive_load(fem, PARAMETERS["pressure"], 1e9)
+    path = tmp_path / "deflections.npy"
+    snapshots = analysis.run(load, 10, path, snapshot_interval=3)
+
+    plot_shape = fem.get_nodes_deformation_for_plot().shape
+    saved = np.load(path, mmap_mode="r")
+    assert saved.shape == snapshots.shape == (4,) + plot_shape
+    assert saved.dtype == np.float64
+    np.testing.assert_array_equal(saved, snapshots)
+    assert not saved[0].any()
+    assert len(analysis.max_deflections) == 11
+    assert np.abs(saved[-1]).max() == analysis.max_deflections[9]
+
+
+@pytest.mark.parametrize("alpha", [0.1, -0.5])
+def test_alpha_outside_range_raises(alpha):
+    fem = create_fem()
+    with pytest.raises(ValueError, match="alpha"):
+        TransientAnalysis(fem, 1e-3, alpha=alpha)